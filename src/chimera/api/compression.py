@@ -0,0 +1,225 @@
+from typing import Any, Dict, Literal, Tuple
+
+import numpy as np
+
+from .dto import FitStepInput, FitStepOutput
+
+SPARSIFICATION_TYPE = Literal["none", "topk", "threshold"]
+QUANTIZATION_TYPE = Literal["none", "int8", "1bit"]
+
+
+class _GradientCompressor:
+    """
+    Helper class for compressing a worker's weights gradients before they are sent
+    to the Parameter Server Master.
+
+    The gradients may be sparsified, keeping only the largest values ("topk") or
+    the values above a magnitude ("threshold"), and their values may be quantized
+    into int8 codes or into sign bits, each with a per-tensor scale. With error
+    feedback, whatever the compression drops is kept as a residual and added to
+    the next gradients, so it's eventually sent.
+    """
+
+    def __init__(
+        self,
+        sparsification: SPARSIFICATION_TYPE = "none",
+        sparsification_ratio: float = 0.01,
+        sparsification_threshold: float = 0.0,
+        quantization: QUANTIZATION_TYPE = "none",
+        error_feedback: bool = True,
+    ) -> None:
+        """
+        Initializes the _GradientCompressor.
+
+        Args:
+            sparsification: How the gradients are sparsified: "none", "topk" or
+                "threshold" (default: "none").
+            sparsification_ratio: The fraction of the gradients kept by "topk"
+                sparsification (default: 0.01).
+            sparsification_threshold: The minimum magnitude of the gradients kept by
+                "threshold" sparsification (default: 0.0).
+            quantization: How the gradients values are quantized: "none", "int8" or
+                "1bit" (default: "none").
+            error_feedback: Whether to keep the compression error as a residual
+                added to the next gradients (default: True).
+
+        Raises:
+            ValueError: If `sparsification_ratio` isn't in (0, 1].
+        """
+        if not 0 < sparsification_ratio <= 1:
+            raise ValueError("Sparsification ratio must be in the (0, 1] interval.")
+
+        self._sparsification = sparsification
+        self._sparsification_ratio = sparsification_ratio
+        self._sparsification_threshold = sparsification_threshold
+        self._quantization = quantization
+        self._error_feedback = error_feedback
+        self._residual: np.ndarray | None = None
+
+    @staticmethod
+    def settings(fit_step_input: FitStepInput) -> Tuple[Any, ...]:
+        """Returns the compression settings sent by the master."""
+        return (
+            fit_step_input.sparsification,
+            fit_step_input.sparsification_ratio,
+            fit_step_input.sparsification_threshold,
+            fit_step_input.quantization,
+            fit_step_input.error_feedback,
+        )
+
+    @property
+    def residual(self) -> np.ndarray | None:
+        """The error feedback residual, not yet sent to the master."""
+        return self._residual
+
+    @residual.setter
+    def residual(self, residual: np.ndarray | None) -> None:
+        self._residual = residual
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the compressor changes the gradients at all."""
+        return self._sparsification != "none" or self._quantization != "none"
+
+    def run(self, gradient: np.ndarray) -> Dict[str, Any]:
+        """
+        Compresses a flattened gradient.
+
+        Args:
+            gradient: The flattened weights gradients.
+
+        Returns:
+            The weights gradients fields of a FitStepOutput.
+        """
+        gradient = gradient.astype(np.float64, copy=False)
+        if self._error_feedback:
+            if self._residual is None or self._residual.shape != gradient.shape:
+                self._residual = np.zeros_like(gradient)
+            gradient = gradient + self._residual
+
+        sparse = self._sparsification != "none"
+        indices = self._select(gradient) if sparse else None
+        values = gradient[indices] if indices is not None else gradient
+        fields, decoded = self._quantize(values)
+
+        if self._error_feedback:
+            assert self._residual is not None
+            self._residual[...] = gradient
+            if indices is not None:
+                self._residual[indices] -= decoded
+            else:
+                self._residual -= decoded
+
+        return {
+            **fields,
+            "weights_gradients_indices": (
+                indices.astype(np.int32)
+                if indices is not None
+                else np.empty(0, dtype=np.int32)
+            ),
+            "sparse": sparse,
+            "quantization": self._quantization,
+        }
+
+    def _select(self, gradient: np.ndarray) -> np.ndarray:
+        """Selects the indices of the gradients kept by the sparsification."""
+        magnitudes = np.abs(gradient)
+        if self._sparsification == "threshold":
+            return np.flatnonzero(magnitudes >= self._sparsification_threshold)
+
+        k = max(1, int(np.ceil(self._sparsification_ratio * gradient.size)))
+        if k >= gradient.size:
+            return np.arange(gradient.size)
+        return np.sort(np.argpartition(magnitudes, -k)[-k:])
+
+    def _quantize(self, values: np.ndarray) -> Tuple[Dict[str, Any], np.ndarray]:
+        """
+        Quantizes the gradients values.
+
+        Returns:
+            A tuple containing the values fields of a FitStepOutput and the values
+            the master will decode from them.
+        """
+        if self._quantization == "int8":
+            scale = float(np.max(np.abs(values), initial=0.0)) / 127
+            codes = (
+                np.round(values / scale).astype(np.int8)
+                if scale > 0
+                else np.zeros(values.size, dtype=np.int8)
+            )
+            return self._quantized_fields(codes, scale), codes * scale
+
+        if self._quantization == "1bit":
+            scale = float(np.mean(np.abs(values))) if values.size > 0 else 0.0
+            signs = values >= 0
+            return (
+                self._quantized_fields(np.packbits(signs), scale),
+                np.where(signs, scale, -scale),
+            )
+
+        values = values.astype(np.float32)
+        return {
+            "weights_gradients": values,
+            "weights_gradients_codes": np.empty(0, dtype=np.int8),
+            "weights_gradients_scale": 1.0,
+        }, values
+
+    @staticmethod
+    def _quantized_fields(codes: np.ndarray, scale: float) -> Dict[str, Any]:
+        """Builds the values fields of a FitStepOutput for quantized gradients."""
+        return {
+            "weights_gradients": np.empty(0, dtype=np.float32),
+            "weights_gradients_codes": codes,
+            "weights_gradients_scale": scale,
+        }
+
+
+def decompress_gradient(fit_step_output: FitStepOutput, size: int) -> np.ndarray:
+    """
+    Decodes the weights gradients of a worker's fit step into a dense array.
+
+    Args:
+        fit_step_output: The worker's fit step output, compressed or not.
+        size: The number of weights of the model.
+
+    Returns:
+        The flattened weights gradients.
+    """
+    indices = np.asarray(fit_step_output.weights_gradients_indices, dtype=np.intp)
+    n_values = indices.size if fit_step_output.sparse else size
+    scale = fit_step_output.weights_gradients_scale
+
+    if fit_step_output.quantization == "int8":
+        values = (
+            np.asarray(fit_step_output.weights_gradients_codes, dtype=np.float64)
+            * scale
+        )
+    elif fit_step_output.quantization == "1bit":
+        signs = np.unpackbits(
+            np.asarray(fit_step_output.weights_gradients_codes, dtype=np.uint8),
+            count=n_values,
+        )
+        values = np.where(signs == 1, scale, -scale)
+    else:
+        values = np.asarray(fit_step_output.weights_gradients, dtype=np.float64)
+
+    if not fit_step_output.sparse:
+        return values
+
+    gradient = np.zeros(size)
+    gradient[indices] = values
+    return gradient
+
+
+def compressed_nbytes(fit_step_output: FitStepOutput) -> int:
+    """
+    Returns the size in bytes of the weights gradients of a fit step output, as
+    they are laid out in the binary tensor format: float64 dense values, float32
+    sparse values, int32 indices and 1-byte codes.
+    """
+    values_itemsize = 4 if fit_step_output.sparse else 8
+    return (
+        values_itemsize * len(fit_step_output.weights_gradients)
+        + 4 * len(fit_step_output.weights_gradients_indices)
+        + len(fit_step_output.weights_gradients_codes)
+    )
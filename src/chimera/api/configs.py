@@ -1,13 +1,24 @@
+CHIMERA_TENSOR_CONTENT_TYPE = "application/x-chimera-tensors"
+
+CHIMERA_WORKER_HEALTH_PATH = "/v1/chimera/health"
+
 CHIMERA_MODEL_WORKER_FIT_PATH = "/v1/chimera/model/fit"
 CHIMERA_MODEL_WORKER_PREDICT_PATH = "/v1/chimera/model/predict"
+CHIMERA_MODEL_WORKER_CHECKPOINT_PATH = "/v1/chimera/model/checkpoint"
 
 CHIMERA_SGD_WORKER_FIT_STEP_PATH = "/v1/chimera/sgd/fit-step"
+CHIMERA_SGD_WORKER_CHECKPOINT_PATH = "/v1/chimera/sgd/checkpoint"
 CHIMERA_SGD_WORKER_FIT_REQUEST_DATA_SAMPLE_PATH = (
     "/v1/chimera/sgd/request-data-sample"
 )
 
 CHIMERA_AGGREGATION_MASTER_FIT_PATH = "/v1/chimera/aggregation/fit"
 CHIMERA_AGGREGATION_MASTER_PREDICT_PATH = "/v1/chimera/aggregation/predict"
+CHIMERA_AGGREGATION_MASTER_METRICS_PATH = "/v1/chimera/aggregation/metrics"
 
 CHIMERA_PARAMETER_SERVER_MASTER_FIT_PATH = "/v1/chimera/parameter-server/fit"
 CHIMERA_PARAMETER_SERVER_MASTER_PREDICT_PATH = "/v1/chimera/parameter-server/predict"
+CHIMERA_PARAMETER_SERVER_MASTER_METRICS_PATH = "/v1/chimera/parameter-server/metrics"
+CHIMERA_PARAMETER_SERVER_MASTER_CHECKPOINT_PATH = (
+    "/v1/chimera/parameter-server/checkpoint"
+)
@@ -1,6 +1,9 @@
-from shutil import ReadError
-from typing import List, Literal, Tuple
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Tuple
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, field_validator
 from pydantic_settings import NoDecode
@@ -8,25 +11,169 @@ from typing_extensions import Annotated
 
 serializable = str | int | float | bool
 
+_SAMPLE_CHUNK_SIZE = 100_000
+
+
+def _normalize_columns(columns: List[str]) -> List[str]:
+    """Normalizes column names to lowercase and removes whitespace."""
+    return [column.lower().strip() for column in columns]
+
+
+def _binary_paths(csv_path: str) -> Tuple[Path, Path]:
+    """Returns the paths of the `.npy` array and `.json` columns of a CSV file."""
+    path = Path(csv_path)
+    return path.with_suffix(".npy"), path.with_suffix(".json")
+
+
+def _has_binary(csv_path: str) -> bool:
+    """
+    Checks whether a CSV file has an up-to-date binary version, written by
+    `convert_fit_input`.
+    """
+    array_path, columns_path = _binary_paths(csv_path)
+    if not (array_path.exists() and columns_path.exists()):
+        return False
+    return (
+        not os.path.exists(csv_path)
+        or array_path.stat().st_mtime >= Path(csv_path).stat().st_mtime
+    )
+
+
+def _load_binary(csv_path: str) -> Tuple[np.ndarray, List[str]]:
+    """Memory-maps the binary version of a CSV file and reads its columns."""
+    array_path, columns_path = _binary_paths(csv_path)
+    with open(columns_path) as file:
+        columns = json.load(file)["columns"]
+    return np.load(array_path, mmap_mode="r"), columns
+
+
+def _save_binary(csv_path: str, array: np.ndarray, columns: List[str]) -> None:
+    """Writes the binary version of a CSV file, replacing any previous one."""
+    array_path, columns_path = _binary_paths(csv_path)
+    with open(f"{array_path}.tmp", "wb") as file:
+        np.save(file, np.ascontiguousarray(array), allow_pickle=False)
+    with open(f"{columns_path}.tmp", "w") as file:
+        json.dump({"columns": list(columns)}, file)
+    os.replace(f"{columns_path}.tmp", columns_path)
+    os.replace(f"{array_path}.tmp", array_path)
+
+
+def convert_fit_input(x_train_path: str, y_train_path: str) -> bool:
+    """
+    Converts training data from CSV files into a binary format: one `.npy` array
+    and one `.json` file with the columns names, next to each CSV file.
+
+    The features are stored as a float64 matrix and the labels as a numeric or
+    fixed-width string vector, so workers can memory-map them instead of parsing
+    the CSV files. Data already converted and not older than its CSV files isn't
+    converted again.
+
+    Args:
+        x_train_path: Path to the CSV file containing training features (X).
+        y_train_path: Path to the CSV file containing training labels (y).
+
+    Returns:
+        Whether the data is available in the binary format. Features with
+        non-numeric columns are left as CSV only.
+    """
+    if _has_binary(x_train_path) and _has_binary(y_train_path):
+        return True
+
+    X_train = pd.read_csv(x_train_path)
+    y_train = pd.read_csv(y_train_path)
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in X_train.dtypes):
+        return False
+
+    y = y_train.iloc[:, 0].to_numpy()
+    if not pd.api.types.is_numeric_dtype(y.dtype):
+        y = y.astype(str)
+
+    _save_binary(
+        x_train_path,
+        X_train.to_numpy(dtype=np.float64),
+        _normalize_columns(X_train.columns),
+    )
+    _save_binary(y_train_path, y, list(y_train.columns))
+    return True
+
+
+def iter_fit_input(
+    x_train_path: str, y_train_path: str, chunk_size: int
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Iterates over training data in chunks of rows, without loading it whole:
+    slices of its memory-mapped binary format when it was converted by
+    `convert_fit_input`, or chunks of the CSV files otherwise.
+
+    Args:
+        x_train_path: Path to the CSV file containing training features (X).
+        y_train_path: Path to the CSV file containing training labels (y).
+        chunk_size: The number of rows per chunk.
+
+    Yields:
+        Tuples containing a chunk of the features (X) and of the labels (y), read
+        into memory.
+    """
+    if _has_binary(x_train_path) and _has_binary(y_train_path):
+        X, X_columns = _load_binary(x_train_path)
+        y, y_columns = _load_binary(y_train_path)
+        for start in range(0, len(y), chunk_size):
+            end = start + chunk_size
+            yield (
+                pd.DataFrame(np.array(X[start:end]), columns=X_columns),
+                pd.DataFrame({y_columns[0]: np.array(y[start:end])}),
+            )
+        return
+
+    with (
+        pd.read_csv(x_train_path, chunksize=chunk_size) as X_chunks,
+        pd.read_csv(y_train_path, chunksize=chunk_size) as y_chunks,
+    ):
+        for X_chunk, y_chunk in zip(X_chunks, y_chunks):
+            X_chunk.columns = _normalize_columns(X_chunk.columns)
+            yield X_chunk.reset_index(drop=True), y_chunk.reset_index(drop=True)
+
+
+def load_fit_labels(y_train_path: str) -> np.ndarray:
+    """
+    Loads only the training labels (y), memory-mapped from their binary format
+    when it was converted by `convert_fit_input`.
+
+    Args:
+        y_train_path: Path to the CSV file containing training labels (y).
+
+    Returns:
+        The labels vector.
+    """
+    if _has_binary(y_train_path):
+        y, _ = _load_binary(y_train_path)
+        return y
+    return pd.read_csv(y_train_path).iloc[:, 0].to_numpy()
+
 
 def load_fit_input(
     x_train_path: str, y_train_path: str
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Loads training data from CSV files.
+    Loads training data from CSV files, or from their memory-mapped binary format
+    when it was converted by `convert_fit_input`.
 
     Args:
         x_train_path: Path to the CSV file containing training features (X).
         y_train_path: Path to the CSV file containing training labels (y).
     """
+    if _has_binary(x_train_path) and _has_binary(y_train_path):
+        X, X_columns = _load_binary(x_train_path)
+        y, y_columns = _load_binary(y_train_path)
+        return (
+            pd.DataFrame(X, columns=X_columns, copy=False),
+            pd.DataFrame({y_columns[0]: y}, copy=False),
+        )
+
     X_train = pd.read_csv(x_train_path)
     y_train = pd.read_csv(y_train_path)
 
-    def normalize_columns(columns: List[str]) -> List[str]:
-        """Normalizes column names to lowercase and removes whitespace."""
-        return [column.lower().strip() for column in columns]
-
-    X_train.columns = normalize_columns(X_train.columns)
+    X_train.columns = _normalize_columns(X_train.columns)
 
     return X_train, y_train
 
@@ -38,6 +185,10 @@ class FitOutput(BaseModel):
 
     fit: str = "ok"
     """A simple confirmation message indicating successful fit."""
+    n_samples: int | None = None
+    """Number of rows the worker's model was fitted on."""
+    score: float | None = None
+    """Score of the worker's model on its held out validation data, if any."""
 
 
 class FitStepInput(BaseModel):
@@ -49,6 +200,22 @@ class FitStepInput(BaseModel):
     """List of weights for the model."""
     bias: List[float]
     """List of bias terms for the model."""
+    raw_gradients: bool = False
+    """Whether to return raw loss gradients instead of `partial_fit` updates."""
+    sparsification: Literal["none", "topk", "threshold"] = "none"
+    """How the weights gradients are sparsified before being returned."""
+    sparsification_ratio: float = 0.01
+    """The fraction of the weights gradients kept by "topk" sparsification."""
+    sparsification_threshold: float = 0.0
+    """The minimum magnitude of the weights gradients kept by "threshold" sparsification."""
+    quantization: Literal["none", "int8", "1bit"] = "none"
+    """How the values of the weights gradients are quantized before being returned."""
+    error_feedback: bool = True
+    """Whether the compression error is kept by the worker and added to its next gradients."""
+    local_steps: int = 1
+    """Number of local `partial_fit` steps, over consecutive mini-batches, before returning the change of the parameters."""
+    elastic_alpha: float | None = None
+    """If set, the worker keeps its own parameters across fit steps (EASGD) and returns their elastic difference with the master's, scaled by this moving rate."""
 
 
 class FitStepOutput(BaseModel):
@@ -57,9 +224,23 @@ class FitStepOutput(BaseModel):
     """
 
     weights_gradients: List[float]
-    """List of gradients for the weights."""
+    """List of gradients for the weights. When compressed, only the kept values, unless quantized."""
     bias_gradient: List[float]
     """Gradient for the bias term."""
+    weights_gradients_indices: List[int] = []
+    """Indices of the kept weights gradients, when sparsified."""
+    weights_gradients_codes: List[int] = []
+    """Quantized weights gradients: int8 codes or packed sign bits."""
+    weights_gradients_scale: float = 1.0
+    """Scale of the quantized weights gradients."""
+    sparse: bool = False
+    """Whether the weights gradients are sparsified."""
+    quantization: Literal["none", "int8", "1bit"] = "none"
+    """How the weights gradients are quantized."""
+    n_samples: int | None = None
+    """Number of rows the gradients were computed over."""
+    loss_sum: float | None = None
+    """Sum of the loss over these rows, at the weights sent by the master."""
 
 
 class FitRequestDataSampleOutput(BaseModel):
@@ -108,7 +289,86 @@ class PredictOutput(BaseModel):
     """
 
     y_pred_rows: List[serializable]
-    """List of predicted values."""
+    """List of predicted values. For classifiers, the probability of the positive class if binary, or the predicted class otherwise."""
+    y_pred_probas: List[List[float]] | None = None
+    """Matrix of predicted probabilities of classifiers, one row per predicted row and one column per class."""
+    classes: List[serializable] | None = None
+    """Class labels of the columns of `y_pred_probas`."""
+    contributors: int | None = None
+    """Number of ensemble members whose predictions were aggregated, if any."""
+
+
+class HealthOutput(BaseModel):
+    """
+    Data transfer object (DTO) for the health check output of a worker.
+    """
+
+    status: Literal["ok"] = "ok"
+    """Status of the worker, reported once it's serving requests."""
+
+
+class CheckpointOutput(BaseModel):
+    """
+    Data transfer object (DTO) for the checkpoint operation output.
+    """
+
+    checkpoint: Literal["ok"] = "ok"
+    """A simple confirmation message indicating the state was saved."""
+    step: int
+    """Step of the training at which the state was saved."""
+
+
+class MetricsOutput(BaseModel):
+    """
+    Data transfer object (DTO) for the metrics operation output.
+    """
+
+    metrics: Dict[str, Any]
+    """Runtime metrics of the master node, grouped by subsystem."""
+
+
+def _sample_indices(
+    y: np.ndarray, model_type: Literal["regressor", "classifier"]
+) -> np.ndarray:
+    """
+    Selects the rows of a training data sample: the first two rows for regressors
+    and the first row of each class for classifiers, found in a single hashed pass
+    over the labels.
+    """
+    if model_type == "regressor":
+        return np.arange(min(2, len(y)))
+    return np.flatnonzero(~pd.Series(y, copy=False).duplicated().to_numpy())
+
+
+def sample_fit_input(
+    X_train: pd.DataFrame,
+    y_train: pd.DataFrame,
+    model_type: Literal["regressor", "classifier"],
+) -> FitRequestDataSampleOutput:
+    """
+    Takes a sample of in-memory training data, with at least one instance of each
+    unique class in y_train for classifiers, and converts it into a
+    FitRequestDataSampleOutput DTO.
+
+    Args:
+        X_train: The training features (X).
+        y_train: The training labels (y).
+        model_type: The type of model the sample is for ("regressor" or
+            "classifier").
+
+    Returns:
+        A FitRequestDataSampleOutput DTO containing a sample of the training data.
+    """
+    indices = _sample_indices(y_train.iloc[:, 0].to_numpy(), model_type)
+    X_train_sample = X_train.iloc[indices]
+    y_train_sample = y_train.iloc[indices]
+
+    return FitRequestDataSampleOutput(
+        X_train_sample_columns=list(X_train_sample.columns),
+        X_train_sample_rows=list(X_train_sample.values),
+        y_train_sample_columns=list(y_train_sample.columns),
+        y_train_sample_rows=list(y_train_sample.values),
+    )
 
 
 def load_fit_samples(
@@ -117,78 +377,40 @@ def load_fit_samples(
     model_type: Literal["regressor", "classifier"],
 ) -> FitRequestDataSampleOutput:
     """
-    Loads a sample of training data from CSV files and converts it into a
-    FitRequestDataSampleOutput DTO.  This function attempts to load progressively
-    smaller samples of the data until a successful load occurs, ensuring that
-    at least one instance of each unique class in y_train is included in the sample.
+    Loads a sample of training data, with at least one instance of each unique
+    class in y_train for classifiers, and converts it into a
+    FitRequestDataSampleOutput DTO.
+
+    The sample is taken from the memory-mapped binary format when it was converted
+    by `convert_fit_input`. Otherwise, only the labels are read whole, and the
+    sampled rows are picked from a single chunked pass over the features file.
 
     Args:
         x_train_path: Path to the CSV file containing training features (X).
         y_train_path: Path to the CSV file containing training labels (y).
+        model_type: The type of model the sample is for ("regressor" or
+            "classifier").
 
     Returns:
         A FitRequestDataSampleOutput DTO containing a sample of the training data.
-
-    Raises:
-        ReadError: If all attempts to load a sample of the specified size fail.  This indicates a problem with the input CSV files.
     """
-
-    rows_to_try = [2, 5, 10, 20, 50, 100, 200]
-
-    y_train_full = pd.read_csv(y_train_path)
-
-    if model_type == "regressor":
-        X_train_sample = pd.read_csv(x_train_path, nrows=2)
-        y_train_sample = pd.read_csv(y_train_path, nrows=2)
-
-        return FitRequestDataSampleOutput(
-            X_train_sample_columns=list(X_train_sample.columns),
-            X_train_sample_rows=list(X_train_sample.values),
-            y_train_sample_columns=list(y_train_sample.columns),
-            y_train_sample_rows=list(y_train_sample.values),
+    if _has_binary(x_train_path) and _has_binary(y_train_path):
+        return sample_fit_input(
+            *load_fit_input(x_train_path, y_train_path), model_type
         )
 
-    unique_classes = y_train_full.iloc[:, 0].unique()
-
-    for num_rows in rows_to_try:
-        try:
-            X_train_sample = pd.read_csv(x_train_path, nrows=num_rows)
-            y_train_sample = pd.read_csv(y_train_path, nrows=num_rows)
+    y_train = pd.read_csv(y_train_path)
+    indices = _sample_indices(y_train.iloc[:, 0].to_numpy(), model_type)
 
-            if all(
-                cls in y_train_sample.iloc[:, 0].values for cls in unique_classes
-            ):
+    X_train_chunks = []
+    with pd.read_csv(x_train_path, chunksize=_SAMPLE_CHUNK_SIZE) as X_chunks:
+        for X_chunk in X_chunks:
+            X_train_chunks.append(X_chunk.loc[X_chunk.index.intersection(indices)])
+            if len(indices) == 0 or X_chunk.index[-1] >= indices[-1]:
                 break
-            else:
-                continue
-
-        except Exception:
-            if num_rows == rows_to_try[-1]:
-                raise ReadError(
-                    f"Failed to load a sample with at least one instance of each class from {y_train_path} even with {num_rows} rows"
-                )
-            continue
-
-    if not all(cls in y_train_sample.iloc[:, 0].values for cls in unique_classes):
-        X_train_sample = pd.DataFrame(
-            columns=pd.read_csv(x_train_path, nrows=1).columns
-        )
-        y_train_sample = pd.DataFrame(
-            columns=pd.read_csv(y_train_path, nrows=1).columns
-        )
-        rows_to_add = []
-        for cls in unique_classes:
-            indices = y_train_full.index[y_train_full.iloc[:, 0] == cls].tolist()
-            if len(indices) > 0:
-                index = indices[0]
-                rows_to_add.append(index)
-        for index in rows_to_add:
-            X_train_sample = pd.concat(
-                [X_train_sample, pd.read_csv(x_train_path, skiprows=index, nrows=1)]
-            )
-            y_train_sample = pd.concat(
-                [y_train_sample, pd.read_csv(y_train_path, skiprows=index, nrows=1)]
-            )
+
+    X_train_sample = pd.concat(X_train_chunks)
+    y_train_sample = y_train.iloc[indices]
 
     return FitRequestDataSampleOutput(
         X_train_sample_columns=list(X_train_sample.columns),
@@ -1,3 +1,4 @@
+import httpx
 from requests import Response  # type: ignore
 
 from .response import get_error_response_message
@@ -13,13 +14,15 @@ class ResponseException(Exception):
     extracting and formatting the response message.
     """
 
-    def __init__(self, response: Response, message: str = "") -> None:
+    def __init__(
+        self, response: Response | httpx.Response, message: str = ""
+    ) -> None:
         """
         Initializes the ResponseException with a given HTTP response.
 
         Args:
-            response: The `requests.Response` object representing the HTTP response
-                      that caused the exception.
+            response: The `requests` or `httpx` response object representing the
+                      HTTP response that caused the exception.
         """
         self._response = response
         self._message = message
@@ -1,7 +1,12 @@
+import httpx
 from fastapi.responses import JSONResponse
+from fastapi.responses import Response as FastAPIResponse
 from pydantic import BaseModel
 from requests import Response  # type: ignore
 
+from .configs import CHIMERA_TENSOR_CONTENT_TYPE
+from .tensors import dump_model_json, encode_model
+
 
 def build_json_response(model: BaseModel) -> JSONResponse:
     """
@@ -16,6 +21,25 @@ def build_json_response(model: BaseModel) -> JSONResponse:
     return JSONResponse(model.model_dump(), 200)
 
 
+def build_tensor_response(model: BaseModel, binary: bool) -> FastAPIResponse:
+    """
+    Builds a response from a Pydantic model whose fields may hold NumPy arrays.
+
+    Args:
+        model: The Pydantic model to serialize.
+        binary: Whether to serialize the model in the binary tensor format.
+            Otherwise, the model is serialized into JSON.
+
+    Returns:
+        A FastAPI response with the serialized model data and a 200 status code.
+    """
+    if binary:
+        return FastAPIResponse(
+            encode_model(model), 200, media_type=CHIMERA_TENSOR_CONTENT_TYPE
+        )
+    return JSONResponse(dump_model_json(model), 200)
+
+
 def build_error_response(
     exception: Exception, status_code: int = 500
 ) -> JSONResponse:
@@ -41,14 +65,14 @@ def build_error_response(
     )
 
 
-def get_error_response_message(response: Response) -> str:
+def get_error_response_message(response: Response | httpx.Response) -> str:
     """
     Extracts the 'message' field from a JSON response.
 
     Assumes the response body is a JSON object with a 'message' key.
 
     Args:
-        response: The requests.Response object containing the JSON response.
+        response: The `requests` or `httpx` response containing the JSON response.
 
     Returns:
         The value of the 'message' field as a string.
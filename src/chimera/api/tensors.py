@@ -0,0 +1,186 @@
+import json
+import struct
+from typing import Any, Dict, Type, TypeVar
+
+import httpx
+import numpy as np
+from fastapi import Request
+from pydantic import BaseModel
+from requests import Response  # type: ignore
+
+from .configs import CHIMERA_TENSOR_CONTENT_TYPE
+
+_MAGIC = b"CHMR"
+_HEADER = struct.Struct("<4sI")
+_ALIGNMENT = 8
+_DTYPES = {"<f4", "<f8", "|i1", "|u1", "<i4", "<i8"}
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _align(size: int) -> int:
+    """Rounds a byte size up to the tensors buffers alignment."""
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def encode_model(model: BaseModel) -> bytes:
+    """
+    Encodes a DTO into the Chimera binary tensor format.
+
+    Fields holding NumPy arrays are written as raw little-endian buffers, while
+    the remaining fields go into a small JSON header. The layout is: the magic
+    bytes, the header length, the JSON header and the 8-byte aligned buffers.
+
+    Args:
+        model: The DTO to encode. Its tensor fields must hold NumPy arrays.
+
+    Returns:
+        The encoded bytes.
+
+    Raises:
+        ValueError: If a tensor has a dtype not supported by the format.
+    """
+    metadata: Dict[str, Any] = {}
+    tensors: Dict[str, Dict[str, Any]] = {}
+    buffers: list = []
+    offset = 0
+
+    for name, value in model:
+        if not isinstance(value, np.ndarray):
+            metadata[name] = value
+            continue
+
+        array = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+        if array.dtype.str not in _DTYPES:
+            raise ValueError(
+                f"Unsupported tensor dtype '{array.dtype}' at '{name}'."
+            )
+
+        tensors[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        padding = _align(array.nbytes) - array.nbytes
+        buffers.extend([array.data, b"\0" * padding])
+        offset += array.nbytes + padding
+
+    header = json.dumps({"metadata": metadata, "tensors": tensors}).encode()
+    padding = _align(_HEADER.size + len(header)) - _HEADER.size - len(header)
+    return b"".join(
+        [_HEADER.pack(_MAGIC, len(header)), header, b"\0" * padding, *buffers]
+    )
+
+
+def decode_model(model_class: Type[ModelT], data: bytes) -> ModelT:
+    """
+    Decodes bytes in the Chimera binary tensor format into a DTO.
+
+    Tensor fields are decoded zero-copy with `np.frombuffer`, so they are
+    read-only views over `data`. The remaining fields are validated as usual.
+
+    Args:
+        model_class: The DTO class to decode into.
+        data: The encoded bytes.
+
+    Returns:
+        The decoded DTO, with NumPy arrays in its tensor fields.
+
+    Raises:
+        ValueError: If `data` isn't in the Chimera binary tensor format.
+    """
+    magic, header_size = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("Invalid Chimera tensor payload.")
+
+    header = json.loads(data[_HEADER.size : _HEADER.size + header_size])
+    start = _align(_HEADER.size + header_size)
+
+    tensors = {
+        name: np.frombuffer(
+            data,
+            dtype=np.dtype(tensor["dtype"]),
+            count=int(np.prod(tensor["shape"])),
+            offset=start + tensor["offset"],
+        ).reshape(tensor["shape"])
+        for name, tensor in header["tensors"].items()
+    }
+
+    model = model_class.model_validate(
+        {**header["metadata"], **{name: [] for name in tensors}}
+    )
+    return model.model_copy(update=tensors)
+
+
+def dump_model_json(model: BaseModel) -> Dict[str, Any]:
+    """
+    Dumps a DTO into a JSON serializable dictionary, converting any NumPy array
+    field into a list.
+    """
+    return {
+        name: value.tolist() if isinstance(value, np.ndarray) else value
+        for name, value in model
+    }
+
+
+def build_tensor_request(model: BaseModel, binary: bool) -> Dict[str, Any]:
+    """
+    Builds the keyword arguments of a `requests` call sending a DTO.
+
+    Args:
+        model: The DTO to send.
+        binary: Whether to send the DTO in the binary tensor format and ask for a
+            binary response. Otherwise, JSON is used.
+
+    Returns:
+        The keyword arguments for `requests.post`.
+    """
+    if binary:
+        return {
+            "data": encode_model(model),
+            "headers": {
+                "Content-Type": CHIMERA_TENSOR_CONTENT_TYPE,
+                "Accept": f"{CHIMERA_TENSOR_CONTENT_TYPE}, application/json",
+            },
+        }
+    return {"json": dump_model_json(model)}
+
+
+def tensor_accept_headers(binary: bool) -> Dict[str, str]:
+    """
+    Builds the headers of a request with a JSON body that asks for a response in
+    the binary tensor format, if `binary`, falling back to JSON.
+    """
+    if binary:
+        return {"Accept": f"{CHIMERA_TENSOR_CONTENT_TYPE}, application/json"}
+    return {}
+
+
+def read_tensor_response(
+    response: Response | httpx.Response, model_class: Type[ModelT]
+) -> ModelT:
+    """
+    Reads a DTO from a worker response, in whichever format the worker answered.
+    """
+    if response.headers.get("content-type", "").startswith(
+        CHIMERA_TENSOR_CONTENT_TYPE
+    ):
+        return decode_model(model_class, response.content)
+    return model_class.model_validate(response.json())
+
+
+async def read_tensor_request(request: Request, model_class: Type[ModelT]) -> ModelT:
+    """
+    Reads a DTO from a request body, in whichever format the master sent it.
+    """
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith(
+        CHIMERA_TENSOR_CONTENT_TYPE
+    ):
+        return decode_model(model_class, body)
+    return model_class.model_validate_json(body)
+
+
+def accepts_tensors(request: Request) -> bool:
+    """Checks whether a request accepts a binary tensor response."""
+    return CHIMERA_TENSOR_CONTENT_TYPE in request.headers.get("accept", "")
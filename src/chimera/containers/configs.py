@@ -1,16 +1,20 @@
 import ast
 import ipaddress
-from typing import Any, List
+from typing import Any, List, Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, NoDecode
 from typing_extensions import Annotated
 
 CHIMERA_DOCKERFILE_NAME = "Dockerfile.worker"
+CHIMERA_BASE_DOCKERFILE_NAME = "Dockerfile.base"
+CHIMERA_BASE_IMAGE_NAME = "chimera-base"
 CHIMERA_WORKERS_FOLDER = "chimera_workers"
 CHIMERA_TRAIN_DATA_FOLDER = "chimera_train_data"
 CHIMERA_TRAIN_FEATURES_FILENAME = "X_train.csv"
 CHIMERA_TRAIN_LABELS_FILENAME = "y_train.csv"
+CHIMERA_CHECKPOINTS_FOLDER = "chimera_checkpoints"
+CHIMERA_CONTAINER_WORKDIR = "/app"
 
 
 class NetworkConfig(BaseSettings):
@@ -79,6 +83,30 @@ class WorkersConfig(BaseSettings):
     """Maximum number of retries for worker endpoints."""
     CHIMERA_WORKERS_ENDPOINTS_TIMEOUT: float = 100.0
     """Timeout for worker endpoints."""
+    CHIMERA_WORKERS_CONNECTION_POOL_SIZE: int = 10
+    """Maximum number of keep-alive connections the master keeps to each worker."""
+    CHIMERA_WORKERS_WIRE_FORMAT: Literal["json", "binary"] = "binary"
+    """Format of the tensors exchanged with SGD workers at each fit step and of classifiers' probabilities."""
+    CHIMERA_WORKERS_PROVISIONING_PARALLELISM: int = 4
+    """Maximum number of workers whose images are built and containers started at once."""
+    CHIMERA_WORKERS_READINESS_TIMEOUT: float = 300.0
+    """Time, in seconds, to wait for each worker's container to pass its readiness probe."""
+    CHIMERA_WORKERS_PROCESSES: int = 1
+    """Number of processes serving each model worker in its container."""
+    CHIMERA_WORKERS_CHECKPOINTS: bool = False
+    """Whether workers checkpoint their fitted state to a mounted volume and reload it at startup."""
+    CHIMERA_WORKERS_CHECKPOINT_INTERVAL: int = 100
+    """Number of fit steps between the periodic checkpoints of an SGD worker."""
+    CHIMERA_WORKERS_HEARTBEAT_INTERVAL: float = 2.0
+    """Interval, in seconds, between the heartbeats the Parameter Server Master sends to its workers."""
+    CHIMERA_WORKERS_HEARTBEAT_TIMEOUT: float = 1.0
+    """Timeout, in seconds, of a heartbeat."""
+    CHIMERA_WORKERS_FAILURE_THRESHOLD: int = 3
+    """Number of consecutive failed requests or heartbeats after which a worker is evicted."""
+    CHIMERA_WORKERS_EVICTION_BACKOFF: float = 1.0
+    """Initial time, in seconds, before an evicted worker is probed for re-admission."""
+    CHIMERA_WORKERS_MAX_EVICTION_BACKOFF: float = 60.0
+    """Maximum time, in seconds, between the re-admission probes of an evicted worker."""
 
     @field_validator(
         "CHIMERA_WORKERS_NODES_NAMES",
@@ -118,3 +146,48 @@ class WorkersConfig(BaseSettings):
         if len(v) != len(set(v)):
             raise ValueError("Node names must be unique.")
         return v
+
+    @field_validator("CHIMERA_WORKERS_PROVISIONING_PARALLELISM")
+    @classmethod
+    def validate_provisioning_parallelism(cls, v: int) -> int:
+        """Validates that the provisioning parallelism is at least 1."""
+        if v < 1:
+            raise ValueError("Provisioning parallelism must be at least 1.")
+        return v
+
+    @field_validator("CHIMERA_WORKERS_CHECKPOINT_INTERVAL")
+    @classmethod
+    def validate_checkpoint_interval(cls, v: int) -> int:
+        """Validates that checkpoints are at least 1 fit step apart."""
+        if v < 1:
+            raise ValueError("Checkpoint interval must be at least 1.")
+        return v
+
+    @field_validator(
+        "CHIMERA_WORKERS_HEARTBEAT_INTERVAL",
+        "CHIMERA_WORKERS_HEARTBEAT_TIMEOUT",
+        "CHIMERA_WORKERS_EVICTION_BACKOFF",
+        "CHIMERA_WORKERS_MAX_EVICTION_BACKOFF",
+    )
+    @classmethod
+    def validate_membership_times(cls, v: float) -> float:
+        """Validates that the heartbeats and eviction times are positive."""
+        if v <= 0:
+            raise ValueError("Heartbeats and eviction times must be positive.")
+        return v
+
+    @field_validator("CHIMERA_WORKERS_FAILURE_THRESHOLD")
+    @classmethod
+    def validate_failure_threshold(cls, v: int) -> int:
+        """Validates that workers are evicted after at least 1 failure."""
+        if v < 1:
+            raise ValueError("Failure threshold must be at least 1.")
+        return v
+
+    @field_validator("CHIMERA_WORKERS_PROCESSES")
+    @classmethod
+    def validate_processes(cls, v: int) -> int:
+        """Validates that each worker is served by at least 1 process."""
+        if v < 1:
+            raise ValueError("Workers processes must be at least 1.")
+        return v
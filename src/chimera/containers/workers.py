@@ -1,8 +1,20 @@
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, List
 
-from ..utils import status_logger
+import requests  # type: ignore
+
+from ..api.configs import CHIMERA_WORKER_HEALTH_PATH
+from ..api.dto import convert_fit_input
+from ..utils import status_logger, time_logger
 from .configs import (
+    CHIMERA_BASE_DOCKERFILE_NAME,
+    CHIMERA_BASE_IMAGE_NAME,
+    CHIMERA_CHECKPOINTS_FOLDER,
+    CHIMERA_CONTAINER_WORKDIR,
     CHIMERA_DOCKERFILE_NAME,
     CHIMERA_TRAIN_DATA_FOLDER,
     CHIMERA_TRAIN_FEATURES_FILENAME,
@@ -24,24 +36,71 @@ class WorkersServer:
         """
         self._network_config = NetworkConfig()
         self._workers_config = WorkersConfig()
+        self._hosts_args = self._build_hosts_args()
 
     def serve_all(self) -> None:
         """
-        Creates the Chimera network and starts all worker containers.
+        Creates the Chimera network and starts all worker containers, returning as
+        soon as every worker passes its readiness probe.
 
         This method performs the following actions:
         1. Creates the Docker network specified in NetworkConfig.
-        2. Iterates through the worker configurations in WorkersConfig.
-        3. Builds the Docker image for each worker.
-        4. Runs the Docker container for each worker.
-        5. Adds DNS entries to each worker's /etc/hosts file to allow inter-container communication.
+        2. Builds the base Docker image, with the dependencies shared by all workers.
+        3. Provisions the workers in parallel, at most
+           CHIMERA_WORKERS_PROVISIONING_PARALLELISM at a time. For each worker:
+            a. Converts its training data into the binary format.
+            b. Builds its Docker image on top of the base image.
+            c. Runs its Docker container, with a host entry for every worker to
+               allow inter-container communication.
+            d. Waits until it's ready to serve requests.
+
+        The duration of each phase is logged.
+
+        Raises:
+            TimeoutError: If a worker isn't ready within CHIMERA_WORKERS_READINESS_TIMEOUT.
+        """
+        with self._timed("workers provisioning"):
+            with self._timed("network creation"):
+                self._create_network()
+            with self._timed("base image build"):
+                self._build_base_image()
+
+            with ThreadPoolExecutor(
+                max_workers=self._workers_config.CHIMERA_WORKERS_PROVISIONING_PARALLELISM,
+                thread_name_prefix=self.__class__.__name__,
+            ) as executor:
+                list(
+                    executor.map(
+                        self._provision_worker,
+                        range(len(self._workers_config.CHIMERA_WORKERS_NODES_NAMES)),
+                    )
+                )
+
+    def _provision_worker(self, i: int) -> None:
+        """
+        Converts the training data, builds the image and runs the container of a
+        specific worker, then waits until it's ready.
+
+        Args:
+            i: The index of the worker in the WorkersConfig list.
         """
-        self._create_network()
+        node_name = self._workers_config.CHIMERA_WORKERS_NODES_NAMES[i]
+        with self._timed(f"'{node_name}' provisioning"):
+            with self._timed(f"'{node_name}' data conversion"):
+                self._convert_train_data(i)
+            with self._timed(f"'{node_name}' image build"):
+                self._build_docker_image(i)
+            with self._timed(f"'{node_name}' container start"):
+                self._run_container(i)
+            with self._timed(f"'{node_name}' readiness"):
+                self._wait_until_ready(i)
 
-        for i in range(len(self._workers_config.CHIMERA_WORKERS_NODES_NAMES)):
-            self._build_docker_image(i)
-            self._run_container(i)
-            self._add_dns_entries_to_container(i)
+    @contextmanager
+    def _timed(self, phase: str) -> Iterator[None]:
+        """Logs the duration of a provisioning phase."""
+        start = time.perf_counter()
+        yield
+        time_logger.info(f"{phase} time = {round(time.perf_counter() - start, 4)} s")
 
     def _create_network(self) -> None:
         """
@@ -82,9 +141,52 @@ class WorkersServer:
             f"Successfully created '{self._network_config.CHIMERA_NETWORK_NAME}' network."
         )
 
+    def _convert_train_data(self, i: int) -> None:
+        """
+        Converts the training data of a specific worker from CSV into the binary
+        format, so the worker memory-maps it instead of parsing the CSV files.
+
+        Args:
+            i: The index of the worker in the WorkersConfig list.
+        """
+        node_name = self._workers_config.CHIMERA_WORKERS_NODES_NAMES[i]
+        folder = f"{CHIMERA_TRAIN_DATA_FOLDER}/{node_name}"
+        if convert_fit_input(
+            f"{folder}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
+            f"{folder}/{CHIMERA_TRAIN_LABELS_FILENAME}",
+        ):
+            status_logger.info(
+                f"Training data of '{node_name}' is in binary format."
+            )
+        else:
+            status_logger.info(
+                f"Training data of '{node_name}' has non-numeric features. Keeping CSV format."
+            )
+
+    def _build_base_image(self) -> None:
+        """
+        Builds the base Docker image, with the system packages and Python
+        dependencies shared by all workers. Docker's build cache makes rebuilding
+        it cheap as long as the dependencies don't change.
+        """
+        cmd = [
+            "docker",
+            "build",
+            "-f",
+            str(Path(__file__).resolve().parent / CHIMERA_BASE_DOCKERFILE_NAME),
+            "-t",
+            CHIMERA_BASE_IMAGE_NAME,
+            ".",
+        ]
+        subprocess.run(cmd, check=True)
+        status_logger.info(
+            f"Successfully built '{CHIMERA_BASE_IMAGE_NAME}' docker image."
+        )
+
     def _build_docker_image(self, i: int) -> None:
         """
-        Builds the Docker image for a specific worker.
+        Builds the Docker image for a specific worker, layering its training data
+        and files on top of the base image.
 
         Args:
             i: The index of the worker in the WorkersConfig list.
@@ -95,6 +197,8 @@ class WorkersServer:
             "docker",
             "build",
             "--build-arg",
+            f"CHIMERA_BASE_IMAGE={CHIMERA_BASE_IMAGE_NAME}",
+            "--build-arg",
             f"CHIMERA_WORKERS_NODE_NAME={node_name}",
             "--build-arg",
             f"CHIMERA_WORKERS_FOLDER={CHIMERA_WORKERS_FOLDER}",
@@ -114,6 +218,12 @@ class WorkersServer:
             f"CHIMERA_WORKERS_PORT={self._workers_config.CHIMERA_WORKERS_PORT}",
             "--build-arg",
             f"CHIMERA_WORKERS_HOST={self._workers_config.CHIMERA_WORKERS_HOST}",
+            "--build-arg",
+            f"CHIMERA_WORKERS_PROCESSES={self._workers_config.CHIMERA_WORKERS_PROCESSES}",
+            "--build-arg",
+            f"CHIMERA_WORKERS_CHECKPOINTS={self._workers_config.CHIMERA_WORKERS_CHECKPOINTS}",
+            "--build-arg",
+            f"CHIMERA_WORKERS_CHECKPOINT_INTERVAL={self._workers_config.CHIMERA_WORKERS_CHECKPOINT_INTERVAL}",
             "-f",
             str(Path(__file__).resolve().parent / CHIMERA_DOCKERFILE_NAME),
             "-t",
@@ -125,7 +235,10 @@ class WorkersServer:
 
     def _run_container(self, i: int) -> None:
         """
-        Runs the Docker container for a specific worker.
+        Runs the Docker container for a specific worker. The names and IPs of all
+        the workers are added to its /etc/hosts file when it's created and, with
+        checkpoints enabled, its checkpoints folder is mounted from the host, so
+        they outlive the container.
 
         Args:
             i: The index of the worker in the WorkersConfig list.
@@ -151,38 +264,80 @@ class WorkersServer:
             container_ip,
             "--cpu-shares",
             str(cpu_shares),
-            "--add-host",
-            self._workers_config.CHIMERA_WORKERS_NODES_NAMES[i] + ":" + container_ip,
+            *self._hosts_args,
+            *self._checkpoints_volume_args(node_name),
             image_name,
         ]
         subprocess.run(cmd, check=True)
         status_logger.info(f"Successfully ran '{container_name}' container.")
 
-    def _add_dns_entries_to_container(self, i: int) -> None:
+    def _checkpoints_volume_args(self, node_name: str) -> List[str]:
         """
-        Adds DNS entries for all workers to a specific worker's /etc/hosts file.
+        Builds the `--volume` arguments mounting a worker's checkpoints folder,
+        `chimera_checkpoints/<node name>` on the host, if checkpoints are enabled.
 
         Args:
-            i: The index of the worker in the WorkersConfig list.
+            node_name: The name of the worker.
+
+        Returns:
+            The `docker run` arguments of the worker's checkpoints volume.
         """
-        container_name = self._workers_config.CHIMERA_WORKERS_NODES_NAMES[i]
-        for j in range(len(self._workers_config.CHIMERA_WORKERS_NODES_NAMES)):
-            if i == j:
-                continue
-            other_container_ip = (
-                f"{self._network_config.CHIMERA_NETWORK_PREFIX}.{j + 2}"
-            )
-            other_dns_name = self._workers_config.CHIMERA_WORKERS_NODES_NAMES[j]
-
-            cmd = [
-                "docker",
-                "exec",
-                container_name,
-                "sh",
-                "-c",
-                f"echo '{other_container_ip} {other_dns_name}' >> /etc/hosts",
-            ]
-            subprocess.run(cmd, check=True)
-            status_logger.info(
-                f"Added DNS entry '{other_dns_name}:{other_container_ip}' to container '{container_name}'."
+        if not self._workers_config.CHIMERA_WORKERS_CHECKPOINTS:
+            return []
+        host_folder = Path(CHIMERA_CHECKPOINTS_FOLDER, node_name).resolve()
+        host_folder.mkdir(parents=True, exist_ok=True)
+        return [
+            "--volume",
+            f"{host_folder}:{CHIMERA_CONTAINER_WORKDIR}/{CHIMERA_CHECKPOINTS_FOLDER}",
+        ]
+
+    def _build_hosts_args(self) -> List[str]:
+        """
+        Builds the `--add-host` arguments mapping every worker's name to its
+        container IP.
+
+        Returns:
+            The `docker run` arguments of the workers' host entries.
+        """
+        args = []
+        for j, node_name in enumerate(
+            self._workers_config.CHIMERA_WORKERS_NODES_NAMES
+        ):
+            args.extend(
+                [
+                    "--add-host",
+                    f"{node_name}:{self._network_config.CHIMERA_NETWORK_PREFIX}.{j + 2}",
+                ]
             )
+        return args
+
+    def _wait_until_ready(self, i: int) -> None:
+        """
+        Polls the health endpoint of a specific worker until it responds.
+
+        Args:
+            i: The index of the worker in the WorkersConfig list.
+
+        Raises:
+            TimeoutError: If the worker isn't ready within
+                CHIMERA_WORKERS_READINESS_TIMEOUT.
+        """
+        node_name = self._workers_config.CHIMERA_WORKERS_NODES_NAMES[i]
+        host_port = self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS[i]
+        url = f"http://localhost:{host_port}{CHIMERA_WORKER_HEALTH_PATH}"
+        deadline = (
+            time.monotonic() + self._workers_config.CHIMERA_WORKERS_READINESS_TIMEOUT
+        )
+
+        while time.monotonic() < deadline:
+            try:
+                if requests.get(url, timeout=1).ok:
+                    status_logger.info(f"Container '{node_name}' is ready.")
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+
+        raise TimeoutError(
+            f"Container '{node_name}' wasn't ready after {self._workers_config.CHIMERA_WORKERS_READINESS_TIMEOUT} s."
+        )
@@ -1,2 +1,6 @@
 from .masters.aggregation import AggregationMaster as AggregationMaster
+from .masters.aggregation import AsyncAggregationMaster as AsyncAggregationMaster
+from .masters.parameter_server import (
+    AsyncParameterServerMaster as AsyncParameterServerMaster,
+)
 from .masters.parameter_server import ParameterServerMaster as ParameterServerMaster
@@ -1,2 +1,6 @@
 from .aggregation import AggregationMaster as AggregationMaster
+from .aggregation import AsyncAggregationMaster as AsyncAggregationMaster
+from .parameter_server import (
+    AsyncParameterServerMaster as AsyncParameterServerMaster,
+)
 from .parameter_server import ParameterServerMaster as ParameterServerMaster
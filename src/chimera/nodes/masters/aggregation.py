@@ -1,16 +1,20 @@
+import asyncio
+import itertools
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, List
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Literal, Set, Tuple
 
 import numpy as np
 import requests  # type: ignore
 import uvicorn
 from fastapi import APIRouter, FastAPI
 from fastapi.responses import JSONResponse
-from requests.adapters import HTTPAdapter  # type: ignore
 
 from ...api.configs import (
     CHIMERA_AGGREGATION_MASTER_FIT_PATH,
+    CHIMERA_AGGREGATION_MASTER_METRICS_PATH,
     CHIMERA_AGGREGATION_MASTER_PREDICT_PATH,
     CHIMERA_MODEL_WORKER_FIT_PATH,
     CHIMERA_MODEL_WORKER_PREDICT_PATH,
@@ -22,42 +26,39 @@ from ...api.response import (
     build_json_response,
     get_error_response_message,  # type: ignore
 )
+from ...api.tensors import read_tensor_response, tensor_accept_headers
 from ...containers.configs import WorkersConfig
 from ...utils import status_logger, time_logger
+from .aggregators import AGGREGATORS_MAP, Aggregator
 from .base import Master
+from .batching import AsyncPredictBatcher, PredictBatcher
+from .cache import PredictionCache
+from .clients import AsyncWorkersClientPool, WorkersClientPool
+
+PREDICTION_TYPE = Literal["proba", "argmax"]
 
 
 class _FitFromWorkersHandler:
     """Handles fit requests from workers."""
 
-    def __init__(self, workers_config: WorkersConfig) -> None:
-        self._workers_config = workers_config
+    def __init__(self, workers_clients: WorkersClientPool) -> None:
+        self._workers_clients = workers_clients
 
-    def fetch(self, port: int, results: List) -> None:
+    def fetch(self, port: int, results: Dict[int, FitOutput]) -> None:
         """Fetches fit from a worker and stores the result."""
         try:
-            s = requests.Session()
-            prefix = f"http://localhost:{port}"
-            s.mount(
-                prefix,
-                HTTPAdapter(
-                    max_retries=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_MAX_RETRIES
-                ),
-            )
-            url = f"{prefix}{CHIMERA_MODEL_WORKER_FIT_PATH}"
+            client = self._workers_clients[port]
+            url = client.url(CHIMERA_MODEL_WORKER_FIT_PATH)
 
             start_worker = time.time()
-            response = s.post(
-                url=url,
-                timeout=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT,
-            )
+            response = client.post(CHIMERA_MODEL_WORKER_FIT_PATH)
             end_worker = time.time()
             time_logger.info(
                 f"{url} worker endpoint latency = {round(end_worker - start_worker, 4)} s"
             )
 
             if response.status_code == 200:
-                results.append("ok")
+                results[port] = FitOutput.model_validate(response.json())
             else:
                 status_logger.error(
                     f"Error at {self.__class__.__name__}: {get_error_response_message(response)}"
@@ -72,27 +73,119 @@ class _FitFromWorkersHandler:
 class _PredictFromWorkerHandler:
     """Handles prediction requests from workers."""
 
-    def __init__(self, workers_config: WorkersConfig) -> None:
+    def __init__(
+        self, workers_config: WorkersConfig, workers_clients: WorkersClientPool
+    ) -> None:
         self._workers_config = workers_config
-
-    def fetch(self, port: int, predict_input: PredictInput, results: list) -> None:
-        """Fetches prediction from a worker and stores the result."""
+        self._workers_clients = workers_clients
+
+    def fetch(
+        self,
+        port: int,
+        predict_input: PredictInput,
+        aggregation: "_Aggregation",
+        deadline: float | None = None,
+    ) -> None:
+        """
+        Fetches prediction from a worker and adds it to the aggregation. With a
+        deadline, the request's timeout is capped at the time left before it, so
+        a stuck worker doesn't hold an executor thread past the predict request,
+        and the request isn't sent at all if the deadline already passed.
+        """
         try:
-            s = requests.Session()
-            prefix = f"http://localhost:{port}"
-            s.mount(
-                prefix,
-                HTTPAdapter(
-                    max_retries=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_MAX_RETRIES
+            client = self._workers_clients[port]
+            url = client.url(CHIMERA_MODEL_WORKER_PREDICT_PATH)
+
+            timeout = self._workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.time())
+                if timeout <= 0:
+                    return
+
+            start_worker = time.time()
+            response = client.post(
+                CHIMERA_MODEL_WORKER_PREDICT_PATH,
+                json=predict_input.model_dump(),
+                headers=tensor_accept_headers(
+                    self._workers_config.CHIMERA_WORKERS_WIRE_FORMAT == "binary"
                 ),
+                timeout=timeout,
+            )
+            end_worker = time.time()
+            time_logger.info(
+                f"{url} worker endpoint latency = {round(end_worker - start_worker, 4)} s"
             )
-            url = f"{prefix}{CHIMERA_MODEL_WORKER_PREDICT_PATH}"
+
+            if response.status_code == 200:
+                aggregation.add(port, read_tensor_response(response, PredictOutput))
+            else:
+                status_logger.error(
+                    f"Error at {self.__class__.__name__}: {get_error_response_message(response)}"
+                )
+                raise ResponseException(response)
+
+        except Exception as e:
+            status_logger.error(
+                f"Error fetching prediction from worker at port {port}: {e}, at {self.__class__.__name__}"
+            )
+
+
+class _AsyncFitFromWorkersHandler:
+    """Handles fit requests from workers, asynchronously."""
+
+    def __init__(self, workers_clients: AsyncWorkersClientPool) -> None:
+        self._workers_clients = workers_clients
+
+    async def fetch(self, port: int, results: Dict[int, FitOutput]) -> None:
+        """Fetches fit from a worker and stores the result."""
+        try:
+            client = self._workers_clients[port]
+            url = client.url(CHIMERA_MODEL_WORKER_FIT_PATH)
 
             start_worker = time.time()
-            response = requests.post(
-                url=url,
+            response = await client.post(CHIMERA_MODEL_WORKER_FIT_PATH)
+            end_worker = time.time()
+            time_logger.info(
+                f"{url} worker endpoint latency = {round(end_worker - start_worker, 4)} s"
+            )
+
+            if response.status_code == 200:
+                results[port] = FitOutput.model_validate(response.json())
+            else:
+                status_logger.error(
+                    f"Error at {self.__class__.__name__}: {get_error_response_message(response)}"
+                )
+                raise ResponseException(response)
+        except Exception as e:
+            status_logger.error(
+                f"Error fetching fit from worker at port {port}: {e} at {self.__class__.__name__}"
+            )
+
+
+class _AsyncPredictFromWorkerHandler:
+    """Handles prediction requests from workers, asynchronously."""
+
+    def __init__(
+        self, workers_config: WorkersConfig, workers_clients: AsyncWorkersClientPool
+    ) -> None:
+        self._workers_config = workers_config
+        self._workers_clients = workers_clients
+
+    async def fetch(
+        self, port: int, predict_input: PredictInput, aggregation: "_Aggregation"
+    ) -> None:
+        """Fetches prediction from a worker and adds it to the aggregation."""
+        try:
+            client = self._workers_clients[port]
+            url = client.url(CHIMERA_MODEL_WORKER_PREDICT_PATH)
+
+            start_worker = time.time()
+            response = await client.post(
+                CHIMERA_MODEL_WORKER_PREDICT_PATH,
                 json=predict_input.model_dump(),
-                timeout=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT,
+                headers=tensor_accept_headers(
+                    self._workers_config.CHIMERA_WORKERS_WIRE_FORMAT == "binary"
+                ),
             )
             end_worker = time.time()
             time_logger.info(
@@ -100,7 +193,7 @@ class _PredictFromWorkerHandler:
             )
 
             if response.status_code == 200:
-                results.append(response.json()["y_pred_rows"])
+                aggregation.add(port, read_tensor_response(response, PredictOutput))
             else:
                 status_logger.error(
                     f"Error at {self.__class__.__name__}: {get_error_response_message(response)}"
@@ -113,42 +206,235 @@ class _PredictFromWorkerHandler:
             )
 
 
-class _MeanAggregator:
-    """Aggregates prediction results using mean."""
+class _Aggregation:
+    """
+    Predictions of the workers to a single predict request.
+
+    Each worker's predictions are written to its slice of a float64 matrix
+    allocated once per request, as soon as they arrive: (workers x rows), or
+    (workers x rows x classes) of probabilities for classifiers. The classes'
+    columns are aligned on the union of the workers' classes, so workers that
+    haven't seen every class still contribute correctly. The aggregator then
+    combines the slices of the workers that answered.
+    """
+
+    def __init__(
+        self,
+        aggregator: Aggregator,
+        ports: List[int],
+        n_rows: int,
+        prediction: PREDICTION_TYPE = "proba",
+    ) -> None:
+        """
+        Initializes the _Aggregation.
 
-    def run(self, y_pred_list: List[float]) -> List[Any]:
+        Args:
+            aggregator: The aggregator combining the predictions.
+            ports: The mapped ports of all the workers.
+            n_rows: The number of rows being predicted.
+            prediction: What classifiers predict: "proba", the probability of the
+                positive class for binary classifiers and the most probable class
+                otherwise, or "argmax", always the most probable class
+                (default: "proba").
+        """
+        self._aggregator = aggregator
+        self._slots = {port: k for k, port in enumerate(ports)}
+        self._n_rows = n_rows
+        self._prediction = prediction
+        self._predictions: np.ndarray | None = None
+        self._mask = np.zeros(len(ports), dtype=bool)
+        self._classes: List[Any] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """The number of workers' predictions added so far."""
+        return int(self._mask.sum())
+
+    def add(self, port: int, predict_output: PredictOutput) -> None:
         """
-        Aggregates prediction results using the mean.
+        Adds a worker's predictions to the matrix.
 
         Args:
-            responses: List of responses from prediction workers.
+            port: The mapped port of the worker.
+            predict_output: The worker's predictions: one value per row or, for
+                classifiers, one row of class probabilities per row.
+        """
+        slot = self._slots[port]
+        if predict_output.y_pred_probas is None:
+            y_pred = np.asarray(predict_output.y_pred_rows, dtype=np.float64)
+            with self._lock:
+                if self._predictions is None:
+                    self._predictions = np.zeros((len(self._mask), self._n_rows))
+                self._predictions[slot] = y_pred
+                self._mask[slot] = True
+            return
+
+        y_pred_probas = np.asarray(predict_output.y_pred_probas, dtype=np.float64)
+        with self._lock:
+            columns = self._align_classes(list(predict_output.classes or []))
+            assert self._predictions is not None
+            self._predictions[slot][:, columns] = y_pred_probas
+            self._mask[slot] = True
+
+    def _align_classes(self, classes: List[Any]) -> List[int]:
+        """
+        Allocates the probabilities matrix, or widens it to the union of the
+        classes, and returns the columns of the given classes.
+        """
+        if self._predictions is None or self._classes is None:
+            self._predictions = np.zeros(
+                (len(self._mask), self._n_rows, len(classes))
+            )
+            self._classes = classes
+        elif classes != self._classes:
+            union = sorted(set(self._classes).union(classes))
+            if union != self._classes:
+                positions = {label: k for k, label in enumerate(union)}
+                widened = np.zeros((len(self._mask), self._n_rows, len(union)))
+                widened[..., [positions[label] for label in self._classes]] = (
+                    self._predictions
+                )
+                self._predictions = widened
+                self._classes = union
 
-        Returns:
-            List of aggregated prediction results.
+        positions = {label: k for k, label in enumerate(self._classes)}
+        return [positions[label] for label in classes]
+
+    def matrix(self) -> Tuple[np.ndarray, np.ndarray, List[Any] | None]:
+        """
+        Returns the predictions matrix, the mask of the workers that answered and,
+        for classifiers, the classes.
+
+        Raises:
+            ValueError: If no predictions were added.
+        """
+        with self._lock:
+            if self._predictions is None:
+                raise ValueError("No predictions were added to the aggregation.")
+            return self._predictions, self._mask.copy(), self._classes
+
+    def result(self) -> PredictOutput:
+        """
+        Combines the added predictions with the aggregator.
+
+        For classifiers, the combined probability matrix is returned along with
+        the classes, and the predicted values follow the `prediction` setting.
 
         Raises:
-            ValueError: If no valid 'y_pred_rows' are found in responses.
-            Exception: If any error occurs during response processing.
+            ValueError: If no predictions were added.
         """
-        y_pred: np.ndarray = np.array(y_pred_list)
-        y_pred_mean = np.mean(y_pred, axis=0)
+        predictions, mask, classes = self.matrix()
+        combined = self._aggregator.run(predictions, mask, classes)
+        contributors = int(mask.sum())
+
+        if classes is None:
+            return PredictOutput(
+                y_pred_rows=combined.tolist(), contributors=contributors
+            )
+
+        if self._prediction == "proba" and len(classes) == 2:
+            y_pred_rows = combined[:, 1].tolist()
+        else:
+            y_pred_rows = [classes[k] for k in combined.argmax(axis=1)]
 
-        if isinstance(y_pred_mean, float):
-            return [y_pred_mean]
-        return list(y_pred_mean)
+        return PredictOutput(
+            y_pred_rows=y_pred_rows,
+            y_pred_probas=combined.tolist(),
+            classes=classes,
+            contributors=contributors,
+        )
 
 
 class AggregationMaster(Master):
     """Orchestrates the aggregation of predictions from workers."""
 
-    def __init__(self) -> None:
-        """Initializes the AggregationMaster."""
-        self._workers_config = WorkersConfig()
-        self._fit_from_workers_handler = _FitFromWorkersHandler(self._workers_config)
+    def __init__(
+        self,
+        quorum: int | None = None,
+        deadline: float | None = None,
+        hedge_delay: float | None = None,
+        aggregator: Literal[
+            "mean", "weighted_mean", "median", "trimmed_mean", "vote"
+        ]
+        | Aggregator = "mean",
+        prediction: PREDICTION_TYPE = "proba",
+        batch_window: float | None = None,
+        max_batch_size: int = 1024,
+        cache_size: int | None = None,
+        cache_ttl: float | None = None,
+    ) -> None:
+        """
+        Initializes the AggregationMaster.
+
+        By default, predict waits for every worker. With a `quorum` and/or a
+        `deadline`, it returns as soon as `quorum` workers have answered or the
+        deadline has passed, whichever comes first, aggregating only the
+        predictions received so far.
+
+        Args:
+            quorum: The number of workers' predictions after which predict
+                returns. If None, every worker is waited for (default: None).
+            deadline: The maximum number of seconds predict waits for workers,
+                after which it returns with the predictions received so far. If
+                None, there's no deadline (default: None).
+            hedge_delay: If set, predict is first sent only to `quorum` workers,
+                and hedged to the remaining idle workers if the quorum hasn't been
+                reached after `hedge_delay` seconds (default: None).
+            aggregator: The aggregator combining the workers' predictions: "mean",
+                "weighted_mean" (by the workers' number of training rows), "median",
+                "trimmed_mean", "vote" (classifiers only) or an Aggregator instance,
+                such as a StackingAggregator (default: "mean").
+            prediction: What is predicted for classifiers, whose class probabilities
+                are combined. "proba" predicts the combined probability of the
+                positive class for binary classifiers, and the most probable class
+                otherwise, while "argmax" always predicts the most probable class
+                (default: "proba").
+            batch_window: If set, concurrent predict requests are coalesced for up
+                to `batch_window` seconds, and sent to the workers as a single
+                request (default: None).
+            max_batch_size: The number of rows after which a batch of predict
+                requests is sent without waiting for the end of the window
+                (default: 1024).
+            cache_size: If set, the predictions of up to `cache_size` rows are
+                cached, and only the rows missing from the cache are sent to the
+                workers. The cache is cleared whenever the workers are fitted
+                (default: None).
+            cache_ttl: The number of seconds after which cached predictions
+                expire. If None, they don't (default: None).
+
+        Raises:
+            ValueError: If `quorum` isn't between 1 and the number of workers, if
+                `hedge_delay` is set without a `quorum`, or if the batching or
+                cache settings are invalid.
+        """
+        super().__init__()
+        n_workers = len(self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS)
+        if quorum is not None and not 1 <= quorum <= n_workers:
+            raise ValueError(f"Quorum must be between 1 and {n_workers}.")
+        if hedge_delay is not None and quorum is None:
+            raise ValueError("Hedged requests require a quorum.")
+
+        self._quorum = quorum or n_workers
+        self._deadline = deadline
+        self._hedge_delay = hedge_delay
+        self._rotation = itertools.count()
+        self._fit_from_workers_handler = _FitFromWorkersHandler(
+            self._workers_clients
+        )
         self._predict_from_workers_handler = _PredictFromWorkerHandler(
-            self._workers_config
+            self._workers_config, self._workers_clients
+        )
+        self._aggregator = (
+            aggregator
+            if isinstance(aggregator, Aggregator)
+            else AGGREGATORS_MAP[aggregator]()
         )
-        self._aggregator = _MeanAggregator()
+        self._prediction = prediction
+        if batch_window is not None:
+            self._batcher = self._build_batcher(batch_window, max_batch_size)
+        if cache_size is not None:
+            self._cache = PredictionCache(cache_size, cache_ttl, n_workers)
         self._port: int
 
     def serve(self, port: int = 8080) -> None:
@@ -159,9 +445,12 @@ class AggregationMaster(Master):
             port: Port number to listen on (default: 8080).
         """
         self._port = port
-        app = FastAPI()
+        app = FastAPI(lifespan=self._lifespan)
         app.include_router(self._predict_router())
         app.include_router(self._fit_router())
+        app.include_router(
+            self._metrics_router(CHIMERA_AGGREGATION_MASTER_METRICS_PATH)
+        )
         status_logger.info(f"Serving {self.__class__.__name__} at port {port}...")
         uvicorn.run(app, host=self._workers_config.CHIMERA_WORKERS_HOST, port=port)
 
@@ -174,19 +463,18 @@ class AggregationMaster(Master):
             """Handles fit requests by forwarding them to workers."""
             try:
                 start_master = time.time()
-                results: List = []
-
-                with ThreadPoolExecutor() as executor:
-                    futures = [
-                        executor.submit(
-                            self._fit_from_workers_handler.fetch,
-                            port,
-                            results,
-                        )
-                        for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
-                    ]
-                    for future in futures:
-                        future.result()
+                results: Dict[int, FitOutput] = {}
+
+                futures = [
+                    self._executor.submit(
+                        self._fit_from_workers_handler.fetch,
+                        port,
+                        results,
+                    )
+                    for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+                ]
+                for future in futures:
+                    future.result()
 
                 if len(results) == 0:
                     message = "All fit responses from workers failed."
@@ -195,6 +483,14 @@ class AggregationMaster(Master):
                     )
                     raise ResponseException(requests.Response(), message)
 
+                self._fit_aggregator(results)
+                validation_input = self._aggregator.validation_input()
+                if validation_input is not None:
+                    self._aggregator.fit_predictions(
+                        *self._fetch_all_predictions(validation_input).matrix()
+                    )
+
+                self._invalidate_cache()
                 response = build_json_response(FitOutput(fit="ok"))
                 end_master = time.time()
                 time_logger.info(
@@ -216,29 +512,297 @@ class AggregationMaster(Master):
             """Handles prediction requests by aggregating results from workers."""
             try:
                 start_master = time.time()
-                results: List[Any] = []
-                with ThreadPoolExecutor() as executor:
-                    futures = [
-                        executor.submit(
-                            self._predict_from_workers_handler.fetch,
-                            port,
-                            predict_input,
-                            results,
-                        )
+                response = build_json_response(self._run_predict(predict_input))
+                end_master = time.time()
+                time_logger.info(
+                    f"http://localhost:{self._port}{CHIMERA_AGGREGATION_MASTER_PREDICT_PATH} master endpoint latency = {round(end_master - start_master, 4)} s"
+                )
+                return response
+            except Exception as e:
+                status_logger.error(f"Error at {self.__class__.__name__}: {e}")
+                return build_error_response(e)
+
+        return router
+
+    def _build_batcher(
+        self, batch_window: float, max_batch_size: int
+    ) -> PredictBatcher | AsyncPredictBatcher:
+        """Creates the batcher coalescing the predict requests."""
+        return PredictBatcher(self._predict, batch_window, max_batch_size)
+
+    def _predict(self, predict_input: PredictInput) -> PredictOutput:
+        """
+        Fans a predict request out to the workers and aggregates their
+        predictions.
+
+        Raises:
+            ResponseException: If no worker answered.
+        """
+        start_master = time.time()
+        aggregation = self._start_aggregation(len(predict_input.X_pred_rows))
+        self._fetch_predictions(predict_input, aggregation, start_master)
+        return self._finish_aggregation(aggregation)
+
+    def _finish_aggregation(self, aggregation: _Aggregation) -> PredictOutput:
+        """
+        Aggregates the workers' predictions to a predict request.
+
+        Raises:
+            ResponseException: If no worker answered.
+        """
+        if aggregation.count == 0:
+            message = "All predict responses from workers failed."
+            status_logger.error(f"Error at {self.__class__.__name__}: {message}")
+            raise ResponseException(requests.Response(), message)
+        return aggregation.result()
+
+    def _start_aggregation(self, n_rows: int) -> _Aggregation:
+        """Starts the aggregation of the workers' predictions to a predict request."""
+        return _Aggregation(
+            self._aggregator,
+            list(self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS),
+            n_rows,
+            self._prediction,
+        )
+
+    def _fit_aggregator(self, results: Dict[int, FitOutput]) -> None:
+        """Updates the aggregator with the fit output of each worker."""
+        self._aggregator.fit(
+            [
+                results.get(port)
+                for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+            ]
+        )
+
+    def _fetch_all_predictions(self, predict_input: PredictInput) -> _Aggregation:
+        """Fetches the predictions of every worker, without quorum or deadline."""
+        aggregation = self._start_aggregation(len(predict_input.X_pred_rows))
+        wait(
+            [
+                self._executor.submit(
+                    self._predict_from_workers_handler.fetch,
+                    port,
+                    predict_input,
+                    aggregation,
+                )
+                for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+            ]
+        )
+        return aggregation
+
+    def _fetch_predictions(
+        self,
+        predict_input: PredictInput,
+        aggregation: _Aggregation,
+        start_master: float,
+    ) -> None:
+        """
+        Fans a predict request out to the workers, until the quorum is reached,
+        the deadline passes or every worker has answered.
+
+        With hedging, only `quorum` workers are asked first, rotating among the
+        workers across requests, and the remaining ones are only asked if the
+        quorum isn't reached after `hedge_delay` seconds. Requests still running
+        when predict returns are left to finish in the background, within the
+        deadline, and the ones not started yet are cancelled.
+
+        Args:
+            predict_input: The predict request.
+            aggregation: The aggregation to which the predictions are added.
+            start_master: The time at which the predict request arrived.
+        """
+        ports = list(self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS)
+        offset = next(self._rotation) % len(ports)
+        ports = ports[offset:] + ports[:offset]
+        deadline = None if self._deadline is None else start_master + self._deadline
+
+        def submit(port: int) -> Future:
+            return self._executor.submit(
+                self._predict_from_workers_handler.fetch,
+                port,
+                predict_input,
+                aggregation,
+                deadline,
+            )
+
+        if self._hedge_delay is None:
+            pending = {submit(port) for port in ports}
+        else:
+            pending = {submit(port) for port in ports[: self._quorum]}
+            hedge_at = start_master + self._hedge_delay
+            if deadline is not None:
+                hedge_at = min(hedge_at, deadline)
+            pending = self._wait_quorum(pending, aggregation, hedge_at)
+
+            if aggregation.count < self._quorum:
+                hedged = ports[self._quorum :]
+                status_logger.info(
+                    f"Hedging predict to {len(hedged)} workers at {self.__class__.__name__}"
+                )
+                pending |= {submit(port) for port in hedged}
+
+        pending = self._wait_quorum(pending, aggregation, deadline)
+        for future in pending:
+            future.cancel()
+
+    def _wait_quorum(
+        self,
+        pending: Set[Future],
+        aggregation: _Aggregation,
+        until: float | None,
+    ) -> Set[Future]:
+        """
+        Waits for the workers' requests until the quorum is reached, every request
+        is done or the given time passes.
+
+        Returns:
+            The requests that are still pending.
+        """
+        while pending and aggregation.count < self._quorum:
+            timeout = None if until is None else until - time.time()
+            if timeout is not None and timeout <= 0:
+                break
+            _, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        return pending
+
+
+class AsyncAggregationMaster(AggregationMaster):
+    """
+    Asynchronous version of the AggregationMaster.
+
+    Its fit and predict endpoints are `async` routes fanning out to the workers
+    with a shared `httpx` client and `asyncio`, so a request doesn't hold any
+    thread while it waits for the workers.
+    """
+
+    def __init__(
+        self,
+        quorum: int | None = None,
+        deadline: float | None = None,
+        hedge_delay: float | None = None,
+        aggregator: Literal[
+            "mean", "weighted_mean", "median", "trimmed_mean", "vote"
+        ]
+        | Aggregator = "mean",
+        prediction: PREDICTION_TYPE = "proba",
+        batch_window: float | None = None,
+        max_batch_size: int = 1024,
+        cache_size: int | None = None,
+        cache_ttl: float | None = None,
+    ) -> None:
+        """
+        Initializes the AsyncAggregationMaster.
+
+        Args:
+            quorum: The number of workers' predictions after which predict
+                returns. If None, every worker is waited for (default: None).
+            deadline: The maximum number of seconds predict waits for workers
+                (default: None).
+            hedge_delay: The number of seconds after which predict is hedged to
+                the idle workers, if the quorum hasn't been reached (default: None).
+            aggregator: The aggregator combining the workers' predictions
+                (default: "mean").
+            prediction: What is predicted for classifiers: "proba" or "argmax"
+                (default: "proba").
+            batch_window: The number of seconds concurrent predict requests are
+                coalesced for. If None, they aren't (default: None).
+            max_batch_size: The number of rows after which a batch of predict
+                requests is sent without waiting for the end of the window
+                (default: 1024).
+            cache_size: The number of rows whose predictions are cached. If None,
+                predictions aren't cached (default: None).
+            cache_ttl: The number of seconds after which cached predictions
+                expire (default: None).
+        """
+        super().__init__(
+            quorum,
+            deadline,
+            hedge_delay,
+            aggregator,
+            prediction,
+            batch_window,
+            max_batch_size,
+            cache_size,
+            cache_ttl,
+        )
+        self._async_workers_clients = AsyncWorkersClientPool(self._workers_config)
+        self._async_fit_from_workers_handler = _AsyncFitFromWorkersHandler(
+            self._async_workers_clients
+        )
+        self._async_predict_from_workers_handler = _AsyncPredictFromWorkerHandler(
+            self._workers_config, self._async_workers_clients
+        )
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Releases the master's worker connections at shutdown."""
+        async with super()._lifespan(app):
+            yield
+        await self._async_workers_clients.aclose()
+
+    def _metrics(self) -> Dict[str, Any]:
+        """Collects the runtime metrics of the master."""
+        metrics = super()._metrics()
+        metrics["connections"] = self._async_workers_clients.stats()
+        return metrics
+
+    def _fit_router(self) -> APIRouter:
+        """Creates the FastAPI router for the /fit endpoint."""
+        router = APIRouter()
+
+        @router.post(CHIMERA_AGGREGATION_MASTER_FIT_PATH)
+        async def fit() -> JSONResponse:
+            """Handles fit requests by forwarding them to workers."""
+            try:
+                start_master = time.time()
+                results: Dict[int, FitOutput] = {}
+
+                await asyncio.gather(
+                    *[
+                        self._async_fit_from_workers_handler.fetch(port, results)
                         for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
                     ]
-                    for future in futures:
-                        future.result()
+                )
 
                 if len(results) == 0:
-                    message = "All predict responses from workers failed."
+                    message = "All fit responses from workers failed."
                     status_logger.error(
                         f"Error at {self.__class__.__name__}: {message}"
                     )
                     raise ResponseException(requests.Response(), message)
 
+                self._fit_aggregator(results)
+                validation_input = self._aggregator.validation_input()
+                if validation_input is not None:
+                    aggregation = await self._afetch_all_predictions(
+                        validation_input
+                    )
+                    self._aggregator.fit_predictions(*aggregation.matrix())
+
+                self._invalidate_cache()
+                response = build_json_response(FitOutput(fit="ok"))
+                end_master = time.time()
+                time_logger.info(
+                    f"http://localhost:{self._port}{CHIMERA_AGGREGATION_MASTER_FIT_PATH} master endpoint latency = {round(end_master - start_master, 4)} s"
+                )
+                return response
+            except Exception as e:
+                status_logger.error(f"Error at {self.__class__.__name__}: {e}")
+                return build_error_response(e)
+
+        return router
+
+    def _predict_router(self) -> APIRouter:
+        """Creates the FastAPI router for the /predict endpoint."""
+        router = APIRouter()
+
+        @router.post(CHIMERA_AGGREGATION_MASTER_PREDICT_PATH)
+        async def predict(predict_input: PredictInput) -> JSONResponse:
+            """Handles prediction requests by aggregating results from workers."""
+            try:
+                start_master = time.time()
                 response = build_json_response(
-                    PredictOutput(y_pred_rows=self._aggregator.run(results))
+                    await self._arun_predict(predict_input)
                 )
                 end_master = time.time()
                 time_logger.info(
@@ -250,3 +814,122 @@ class AggregationMaster(Master):
                 return build_error_response(e)
 
         return router
+
+    def _build_batcher(
+        self, batch_window: float, max_batch_size: int
+    ) -> PredictBatcher | AsyncPredictBatcher:
+        """Creates the batcher coalescing the predict requests."""
+        return AsyncPredictBatcher(self._apredict, batch_window, max_batch_size)
+
+    async def _arun_predict(self, predict_input: PredictInput) -> PredictOutput:
+        """
+        Predicts a request through the prediction cache and the batcher, when
+        they're enabled, asynchronously.
+        """
+        if self._cache is not None:
+            return await self._cache.arun(predict_input, self._abatched_predict)
+        return await self._abatched_predict(predict_input)
+
+    async def _abatched_predict(self, predict_input: PredictInput) -> PredictOutput:
+        """Predicts a request through the batcher, when it's enabled."""
+        if isinstance(self._batcher, AsyncPredictBatcher):
+            return await self._batcher.run(predict_input)
+        return await self._apredict(predict_input)
+
+    async def _apredict(self, predict_input: PredictInput) -> PredictOutput:
+        """
+        Fans a predict request out to the workers and aggregates their
+        predictions, asynchronously.
+
+        Raises:
+            ResponseException: If no worker answered.
+        """
+        start_master = time.time()
+        aggregation = self._start_aggregation(len(predict_input.X_pred_rows))
+        await self._afetch_predictions(predict_input, aggregation, start_master)
+        return self._finish_aggregation(aggregation)
+
+    async def _afetch_all_predictions(
+        self, predict_input: PredictInput
+    ) -> _Aggregation:
+        """Fetches the predictions of every worker, without quorum or deadline."""
+        aggregation = self._start_aggregation(len(predict_input.X_pred_rows))
+        await asyncio.gather(
+            *[
+                self._async_predict_from_workers_handler.fetch(
+                    port, predict_input, aggregation
+                )
+                for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+            ]
+        )
+        return aggregation
+
+    async def _afetch_predictions(
+        self,
+        predict_input: PredictInput,
+        aggregation: _Aggregation,
+        start_master: float,
+    ) -> None:
+        """
+        Fans a predict request out to the workers, like `_fetch_predictions`, but
+        with `asyncio` tasks. Requests still running when predict returns are
+        cancelled.
+
+        Args:
+            predict_input: The predict request.
+            aggregation: The aggregation to which the predictions are added.
+            start_master: The time at which the predict request arrived.
+        """
+        ports = list(self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS)
+        offset = next(self._rotation) % len(ports)
+        ports = ports[offset:] + ports[:offset]
+        deadline = None if self._deadline is None else start_master + self._deadline
+
+        def submit(port: int) -> asyncio.Task:
+            return asyncio.create_task(
+                self._async_predict_from_workers_handler.fetch(
+                    port, predict_input, aggregation
+                )
+            )
+
+        if self._hedge_delay is None:
+            pending = {submit(port) for port in ports}
+        else:
+            pending = {submit(port) for port in ports[: self._quorum]}
+            hedge_at = start_master + self._hedge_delay
+            if deadline is not None:
+                hedge_at = min(hedge_at, deadline)
+            pending = await self._await_quorum(pending, aggregation, hedge_at)
+
+            if aggregation.count < self._quorum:
+                hedged = ports[self._quorum :]
+                status_logger.info(
+                    f"Hedging predict to {len(hedged)} workers at {self.__class__.__name__}"
+                )
+                pending |= {submit(port) for port in hedged}
+
+        pending = await self._await_quorum(pending, aggregation, deadline)
+        for task in pending:
+            task.cancel()
+
+    async def _await_quorum(
+        self,
+        pending: Set[asyncio.Task],
+        aggregation: _Aggregation,
+        until: float | None,
+    ) -> Set[asyncio.Task]:
+        """
+        Awaits the workers' requests until the quorum is reached, every request is
+        done or the given time passes.
+
+        Returns:
+            The requests that are still pending.
+        """
+        while pending and aggregation.count < self._quorum:
+            timeout = None if until is None else until - time.time()
+            if timeout is not None and timeout <= 0:
+                break
+            _, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        return pending
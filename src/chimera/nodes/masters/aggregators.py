@@ -0,0 +1,297 @@
+from abc import ABC, abstractmethod
+from typing import Any, List, Literal
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, clone
+
+from ...api.dto import FitOutput, PredictInput
+
+WEIGHTING_TYPE = Literal["n_samples", "score"]
+
+
+class Aggregator(ABC):
+    """
+    Abstract base class for the Aggregation Master's ensemble aggregators.
+
+    An aggregator combines the predictions of the workers that answered a predict
+    request. They are held in a matrix preallocated per request, with one slice
+    per worker: (workers x rows) for regressors and (workers x rows x classes)
+    of probabilities for classifiers, along with a mask of the workers that
+    answered.
+    """
+
+    def fit(self, fit_outputs: List[FitOutput | None]) -> None:
+        """
+        Updates the aggregator after the workers were fitted.
+
+        Args:
+            fit_outputs: The fit output of each worker, or None if its fit failed.
+        """
+
+    def validation_input(self) -> PredictInput | None:
+        """
+        Returns the data the workers must predict after being fitted, for
+        aggregators that learn from their predictions, or None.
+        """
+        return None
+
+    def fit_predictions(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> None:
+        """
+        Learns from the workers' predictions of the validation input.
+
+        Args:
+            predictions: The workers' predictions matrix.
+            mask: Which workers answered.
+            classes: The class labels of the probabilities, for classifiers.
+        """
+
+    @abstractmethod
+    def run(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> np.ndarray:
+        """
+        Combines the workers' predictions.
+
+        Args:
+            predictions: The workers' predictions matrix.
+            mask: Which workers answered.
+            classes: The class labels of the probabilities, for classifiers.
+
+        Returns:
+            One prediction per row or, for classifiers, one row of class
+            probabilities per row.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _answered(predictions: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Selects the predictions of the workers that answered, without copying if all did."""
+        return predictions if mask.all() else predictions[mask]
+
+    @staticmethod
+    def _normalize(combined: np.ndarray) -> np.ndarray:
+        """Rescales classifiers' combined probabilities so each row sums to 1."""
+        if combined.ndim == 1:
+            return combined
+        totals = combined.sum(axis=1, keepdims=True)
+        return np.divide(combined, totals, out=combined, where=totals > 0)
+
+
+class MeanAggregator(Aggregator):
+    """Averages the workers' predictions."""
+
+    def run(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> np.ndarray:
+        return self._answered(predictions, mask).mean(axis=0)
+
+
+class WeightedMeanAggregator(Aggregator):
+    """
+    Averages the workers' predictions, weighted by the size of their local
+    dataset or by their validation score, as reported by their fit.
+    """
+
+    def __init__(self, weighting: WEIGHTING_TYPE = "n_samples") -> None:
+        """
+        Initializes the WeightedMeanAggregator.
+
+        Args:
+            weighting: What weights the workers: "n_samples", the number of rows
+                they were fitted on, or "score", their score on their validation
+                data, if they hold some out (default: "n_samples").
+        """
+        self._weighting = weighting
+        self._weights: np.ndarray | None = None
+
+    def fit(self, fit_outputs: List[FitOutput | None]) -> None:
+        weights = [
+            getattr(fit_output, self._weighting) if fit_output is not None else None
+            for fit_output in fit_outputs
+        ]
+        self._weights = np.array(
+            [max(weight, 0.0) if weight is not None else 0.0 for weight in weights]
+        )
+
+    def run(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> np.ndarray:
+        answered = self._answered(predictions, mask)
+        if self._weights is None or self._weights[mask].sum() <= 0:
+            return answered.mean(axis=0)
+        weights = self._weights[mask]
+        return np.tensordot(weights / weights.sum(), answered, axes=1)
+
+
+class MedianAggregator(Aggregator):
+    """
+    Takes the median of the workers' predictions, so a single bad worker can't
+    skew them.
+    """
+
+    def run(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> np.ndarray:
+        return self._normalize(np.median(self._answered(predictions, mask), axis=0))
+
+
+class TrimmedMeanAggregator(Aggregator):
+    """
+    Averages the workers' predictions after discarding the highest and lowest
+    ones for each row, so a few bad workers can't skew them.
+    """
+
+    def __init__(self, proportion: float = 0.1) -> None:
+        """
+        Initializes the TrimmedMeanAggregator.
+
+        Args:
+            proportion: The fraction of the workers' predictions discarded at each
+                end, for each row (default: 0.1).
+
+        Raises:
+            ValueError: If `proportion` isn't in [0, 0.5).
+        """
+        if not 0 <= proportion < 0.5:
+            raise ValueError("Trimmed proportion must be in the [0, 0.5) interval.")
+        self._proportion = proportion
+
+    def run(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> np.ndarray:
+        answered = self._answered(predictions, mask)
+        n_trimmed = int(self._proportion * len(answered))
+        if n_trimmed == 0:
+            return answered.mean(axis=0)
+        kept = np.sort(answered, axis=0)[n_trimmed : len(answered) - n_trimmed]
+        return self._normalize(kept.mean(axis=0))
+
+
+class VoteAggregator(Aggregator):
+    """
+    Majority vote of classification workers: each worker votes for its most
+    probable class, and the fraction of votes of each class is returned.
+    """
+
+    def run(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> np.ndarray:
+        if classes is None:
+            raise ValueError("Majority vote requires classification workers.")
+        answered = self._answered(predictions, mask)
+        votes = answered.argmax(axis=2)
+        return (votes[..., np.newaxis] == np.arange(len(classes))).mean(axis=0)
+
+
+class StackingAggregator(Aggregator):
+    """
+    Stacks the workers with a meta-model, fitted in the master on the workers'
+    predictions of a validation dataset held by the master.
+
+    The meta-model's features are the predictions of each worker or, for
+    classifiers, the probabilities of each class by each worker, over the
+    classes seen when the meta-model was fitted. The predictions of the workers
+    that didn't answer are replaced by the mean of the others.
+    """
+
+    def __init__(
+        self, meta_model: BaseEstimator, X_val: pd.DataFrame, y_val: Any
+    ) -> None:
+        """
+        Initializes the StackingAggregator.
+
+        Args:
+            meta_model: The scikit-learn meta-model, a regressor for regression
+                workers or a classifier supporting `predict_proba` for
+                classification workers.
+            X_val: The validation features, not used to fit the workers.
+            y_val: The validation labels.
+        """
+        self._meta_model = meta_model
+        self._X_val = X_val
+        self._y_val = np.asarray(y_val).ravel()
+        self._fitted_meta_model: BaseEstimator | None = None
+        self._fitted_classes: List[Any] | None = None
+
+    def validation_input(self) -> PredictInput | None:
+        return PredictInput(
+            X_pred_columns=list(self._X_val.columns),
+            X_pred_rows=self._X_val.values.tolist(),
+        )
+
+    def fit_predictions(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> None:
+        meta_model = clone(self._meta_model)
+        meta_model.fit(self._features(predictions, mask), self._y_val)
+        self._fitted_meta_model = meta_model
+        self._fitted_classes = None if classes is None else list(classes)
+
+    def run(
+        self, predictions: np.ndarray, mask: np.ndarray, classes: List[Any] | None
+    ) -> np.ndarray:
+        if self._fitted_meta_model is None:
+            raise ValueError("The stacking meta-model wasn't fitted yet.")
+
+        if classes is not None and self._fitted_classes is not None:
+            predictions = self._reindex_classes(predictions, classes)
+        features = self._features(predictions, mask)
+        if classes is None:
+            return self._fitted_meta_model.predict(features)
+
+        meta_probas = self._fitted_meta_model.predict_proba(features)
+        positions = {label: k for k, label in enumerate(classes)}
+        combined = np.zeros((len(features), len(classes)), dtype=np.float64)
+        for k, label in enumerate(self._fitted_meta_model.classes_.tolist()):
+            if label in positions:
+                combined[:, positions[label]] = meta_probas[:, k]
+        return combined
+
+    def _reindex_classes(
+        self, predictions: np.ndarray, classes: List[Any]
+    ) -> np.ndarray:
+        """
+        Reorders the probabilities of a request by the classes seen when the
+        meta-model was fitted, so its features keep their width when a worker
+        holding a rare class doesn't answer. Classes missing from the request
+        get a probability of 0, and classes unseen at fit time are dropped.
+        """
+        assert self._fitted_classes is not None
+        if classes == self._fitted_classes:
+            return predictions
+
+        positions = {label: k for k, label in enumerate(classes)}
+        reindexed = np.zeros(
+            (*predictions.shape[:2], len(self._fitted_classes)), dtype=np.float64
+        )
+        for k, label in enumerate(self._fitted_classes):
+            if label in positions:
+                reindexed[..., k] = predictions[..., positions[label]]
+        return reindexed
+
+    @staticmethod
+    def _features(predictions: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """
+        Lays out the workers' predictions as the meta-model's features.
+
+        Raises:
+            ValueError: If no worker answered.
+        """
+        if not mask.any():
+            raise ValueError("No worker predictions to stack.")
+        if not mask.all():
+            predictions = predictions.copy()
+            predictions[~mask] = predictions[mask].mean(axis=0)
+        return np.moveaxis(predictions, 0, 1).reshape(predictions.shape[1], -1)
+
+
+AGGREGATORS_MAP = {
+    "mean": MeanAggregator,
+    "weighted_mean": WeightedMeanAggregator,
+    "median": MedianAggregator,
+    "trimmed_mean": TrimmedMeanAggregator,
+    "vote": VoteAggregator,
+}
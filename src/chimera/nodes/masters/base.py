@@ -1,4 +1,18 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+
+from ...api.dto import MetricsOutput, PredictInput, PredictOutput
+from ...api.response import build_error_response, build_json_response
+from ...containers.configs import WorkersConfig
+from ...utils import status_logger
+from .batching import AsyncPredictBatcher, PredictBatcher
+from .cache import PredictionCache
+from .clients import WorkersClientPool
 
 
 class Master(ABC):
@@ -10,6 +24,32 @@ class Master(ABC):
     must implement the `serve` method.
     """
 
+    def __init__(self, loops_per_worker: int = 0) -> None:
+        """
+        Initializes the Master with the WorkersConfig, the pool of long-lived
+        worker clients and the long-lived executor shared by all of its handlers.
+
+        The executor is sized to the workers connection pools, so concurrent
+        requests reuse its threads instead of spawning new ones.
+
+        Args:
+            loops_per_worker: The number of long-running loops per worker run on
+                the executor, such as the asynchronous fit loops, whose threads
+                are added to those of the requests (default: 0).
+        """
+        self._workers_config = WorkersConfig()
+        self._workers_clients = WorkersClientPool(self._workers_config)
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS)
+            * (
+                self._workers_config.CHIMERA_WORKERS_CONNECTION_POOL_SIZE
+                + loops_per_worker
+            ),
+            thread_name_prefix=self.__class__.__name__,
+        )
+        self._batcher: PredictBatcher | AsyncPredictBatcher | None = None
+        self._cache: PredictionCache | None = None
+
     @abstractmethod
     def serve(self, port: int) -> None:
         """
@@ -22,3 +62,69 @@ class Master(ABC):
             NotImplementedError: This method must be implemented by subclasses.
         """
         raise NotImplementedError
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Releases the master's worker connections and executor at shutdown."""
+        yield
+        self._workers_clients.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _predict(self, predict_input: PredictInput) -> PredictOutput:
+        """
+        Predicts a request.
+
+        Raises:
+            NotImplementedError: This method must be implemented by subclasses
+                serving predictions.
+        """
+        raise NotImplementedError
+
+    def _run_predict(self, predict_input: PredictInput) -> PredictOutput:
+        """
+        Predicts a request through the prediction cache and the batcher, when
+        they're enabled.
+        """
+        if self._cache is not None:
+            return self._cache.run(predict_input, self._batched_predict)
+        return self._batched_predict(predict_input)
+
+    def _batched_predict(self, predict_input: PredictInput) -> PredictOutput:
+        """Predicts a request through the batcher, when it's enabled."""
+        if isinstance(self._batcher, PredictBatcher):
+            return self._batcher.run(predict_input)
+        return self._predict(predict_input)
+
+    def _invalidate_cache(self) -> None:
+        """Discards the cached predictions, once the model was fitted again."""
+        if self._cache is not None:
+            self._cache.invalidate()
+
+    def _metrics(self) -> Dict[str, Any]:
+        """
+        Collects the runtime metrics of the master.
+
+        Returns:
+            A dictionary of metrics, grouped by subsystem.
+        """
+        metrics: Dict[str, Any] = {"connections": self._workers_clients.stats()}
+        if self._batcher is not None:
+            metrics["batching"] = self._batcher.stats()
+        if self._cache is not None:
+            metrics["cache"] = self._cache.stats()
+        return metrics
+
+    def _metrics_router(self, path: str) -> APIRouter:
+        """Creates the FastAPI router for the /metrics endpoint."""
+        router = APIRouter()
+
+        @router.get(path)
+        def metrics() -> JSONResponse:
+            """Returns the runtime metrics of the master."""
+            try:
+                return build_json_response(MetricsOutput(metrics=self._metrics()))
+            except Exception as e:
+                status_logger.error(f"Error at {self.__class__.__name__}: {e}")
+                return build_error_response(e)
+
+        return router
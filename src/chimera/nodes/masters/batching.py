@@ -0,0 +1,396 @@
+import asyncio
+import bisect
+import itertools
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from ...api.dto import PredictInput, PredictOutput
+
+_LATENCY_BUCKETS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+)
+_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+
+
+class _Histogram:
+    """
+    Fixed-buckets histogram of observed values, exported with cumulative counts,
+    where each bucket counts the observations lower than or equal to its bound.
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """
+        Initializes the _Histogram.
+
+        Args:
+            bounds: The increasing upper bounds of the buckets. Larger values are
+                counted in a last, unbounded, bucket.
+        """
+        self._bounds = list(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Counts a value in its bucket."""
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the number and sum of the observed values, and the cumulative
+        count of each bucket, keyed by its upper bound.
+        """
+        cumulative = list(itertools.accumulate(self._counts))
+        buckets = {
+            str(bound): count for bound, count in zip(self._bounds, cumulative)
+        }
+        buckets["+Inf"] = cumulative[-1]
+        return {"count": cumulative[-1], "sum": self._sum, "buckets": buckets}
+
+
+class _BatchingStats:
+    """
+    Throughput and latency statistics of a predict batcher, for tuning its
+    window and maximum batch size.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._requests = 0
+        self._rows = 0
+        self._batches = 0
+        self._latency = _Histogram(_LATENCY_BUCKETS)
+        self._wait = _Histogram(_LATENCY_BUCKETS)
+        self._batch_requests = _Histogram(_SIZE_BUCKETS)
+        self._batch_rows = _Histogram(_SIZE_BUCKETS)
+
+    def record_batch(self, n_requests: int, n_rows: int, wait: float) -> None:
+        """Records a flushed batch and how long it was kept open."""
+        with self._lock:
+            self._batches += 1
+            self._requests += n_requests
+            self._rows += n_rows
+            self._wait.observe(wait)
+            self._batch_requests.observe(n_requests)
+            self._batch_rows.observe(n_rows)
+
+    def record_latency(self, latency: float) -> None:
+        """Records the time a request took, from its arrival to its predictions."""
+        with self._lock:
+            self._latency.observe(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the statistics, with the throughput since the batcher started."""
+        with self._lock:
+            elapsed = max(time.time() - self._started, 1e-9)
+            return {
+                "requests": self._requests,
+                "rows": self._rows,
+                "batches": self._batches,
+                "requests_per_second": self._requests / elapsed,
+                "rows_per_second": self._rows / elapsed,
+                "latency_seconds": self._latency.snapshot(),
+                "window_wait_seconds": self._wait.snapshot(),
+                "batch_requests": self._batch_requests.snapshot(),
+                "batch_rows": self._batch_rows.snapshot(),
+            }
+
+
+class _Batch:
+    """Predict requests coalesced into a single prediction."""
+
+    def __init__(self, columns: List[str]) -> None:
+        self.columns = columns
+        self.inputs: List[PredictInput] = []
+        self.n_rows = 0
+        self.opened = time.perf_counter()
+        self.outputs: List[PredictOutput] = []
+        self.error: Exception | None = None
+
+
+class _PredictBatcherBase:
+    """
+    Common logic of the predict batchers.
+
+    Concurrent predict requests with the same columns join the same open batch.
+    The first request of a batch waits for the batching window, or until the
+    batch holds `max_batch_size` rows, then closes the batch, predicts all of its
+    rows at once and scatters the predictions back to each request.
+    """
+
+    def __init__(self, window: float, max_batch_size: int) -> None:
+        """
+        Initializes the batcher.
+
+        Args:
+            window: The maximum number of seconds a batch is kept open for other
+                requests to join it.
+            max_batch_size: The number of rows after which a batch is closed
+                without waiting for the end of the window.
+
+        Raises:
+            ValueError: If `window` is negative or `max_batch_size` isn't
+                positive.
+        """
+        if window < 0:
+            raise ValueError("Batching window can't be negative.")
+        if max_batch_size < 1:
+            raise ValueError("Maximum batch size must be at least 1.")
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._open: Dict[Tuple[str, ...], _Batch] = {}
+        self._lock = threading.Lock()
+        self._stats = _BatchingStats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the throughput and latency statistics of the batcher."""
+        return self._stats.snapshot()
+
+    def _join(self, predict_input: PredictInput) -> Tuple[_Batch, int, bool]:
+        """
+        Adds a request to the open batch of its columns, opening one if needed.
+
+        Returns:
+            The batch, the position of the request in it and whether the request
+            opened the batch, and must then flush it.
+        """
+        key = tuple(predict_input.X_pred_columns)
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if batch is None:
+                batch = self._open[key] = self._new_batch(
+                    list(predict_input.X_pred_columns)
+                )
+            index = len(batch.inputs)
+            batch.inputs.append(predict_input)
+            batch.n_rows += len(predict_input.X_pred_rows)
+            if batch.n_rows >= self._max_batch_size:
+                del self._open[key]
+                self._close(batch)
+        return batch, index, leader
+
+    def _detach(self, batch: _Batch) -> PredictInput:
+        """
+        Stops a batch from accepting requests and combines its requests.
+
+        Returns:
+            A single predict request with the rows of every request in the batch.
+        """
+        self._discard(batch)
+        self._stats.record_batch(
+            len(batch.inputs), batch.n_rows, time.perf_counter() - batch.opened
+        )
+        if len(batch.inputs) == 1:
+            return batch.inputs[0]
+        return PredictInput.model_construct(
+            X_pred_columns=batch.columns,
+            X_pred_rows=list(
+                itertools.chain.from_iterable(
+                    predict_input.X_pred_rows for predict_input in batch.inputs
+                )
+            ),
+        )
+
+    def _discard(self, batch: _Batch) -> None:
+        """Stops a batch from accepting requests, if it's still open."""
+        with self._lock:
+            key = tuple(batch.columns)
+            if self._open.get(key) is batch:
+                del self._open[key]
+
+    @staticmethod
+    def _scatter(batch: _Batch, predict_output: PredictOutput) -> None:
+        """Splits the predictions of a batch back into one output per request."""
+        if len(batch.inputs) == 1:
+            batch.outputs = [predict_output]
+            return
+
+        start = 0
+        for predict_input in batch.inputs:
+            end = start + len(predict_input.X_pred_rows)
+            batch.outputs.append(
+                predict_output.model_copy(
+                    update={
+                        "y_pred_rows": predict_output.y_pred_rows[start:end],
+                        "y_pred_probas": (
+                            None
+                            if predict_output.y_pred_probas is None
+                            else predict_output.y_pred_probas[start:end]
+                        ),
+                    }
+                )
+            )
+            start = end
+
+    def _result(self, batch: _Batch, index: int, start: float) -> PredictOutput:
+        """Returns a request's predictions, or raises the error of its batch."""
+        self._stats.record_latency(time.perf_counter() - start)
+        if batch.error is not None:
+            raise batch.error
+        return batch.outputs[index]
+
+    def _new_batch(self, columns: List[str]) -> _Batch:
+        raise NotImplementedError
+
+    def _close(self, batch: _Batch) -> None:
+        raise NotImplementedError
+
+
+class _ThreadBatch(_Batch):
+    """Batch of predict requests handled by threads."""
+
+    def __init__(self, columns: List[str]) -> None:
+        super().__init__(columns)
+        self.closed = threading.Event()
+        self.done = threading.Event()
+
+
+class PredictBatcher(_PredictBatcherBase):
+    """
+    Dynamic batching of the predict requests handled by a master's threads.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[PredictInput], PredictOutput],
+        window: float,
+        max_batch_size: int,
+    ) -> None:
+        """
+        Initializes the PredictBatcher.
+
+        Args:
+            predict: The function predicting a (combined) predict request.
+            window: The maximum number of seconds a batch is kept open for other
+                requests to join it.
+            max_batch_size: The number of rows after which a batch is closed
+                without waiting for the end of the window.
+        """
+        super().__init__(window, max_batch_size)
+        self._predict = predict
+
+    def run(self, predict_input: PredictInput) -> PredictOutput:
+        """
+        Predicts a request as part of a batch, blocking until its predictions
+        are ready.
+
+        Args:
+            predict_input: The predict request.
+
+        Returns:
+            The predictions of the request's rows.
+        """
+        start = time.perf_counter()
+        batch, index, leader = self._join(predict_input)
+        assert isinstance(batch, _ThreadBatch)
+        if leader:
+            batch.closed.wait(self._window)
+            try:
+                self._scatter(batch, self._predict(self._detach(batch)))
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+        return self._result(batch, index, start)
+
+    def _new_batch(self, columns: List[str]) -> _Batch:
+        return _ThreadBatch(columns)
+
+    def _close(self, batch: _Batch) -> None:
+        assert isinstance(batch, _ThreadBatch)
+        batch.closed.set()
+
+
+class _AsyncBatch(_Batch):
+    """Batch of predict requests handled by coroutines."""
+
+    def __init__(self, columns: List[str]) -> None:
+        super().__init__(columns)
+        self.closed = asyncio.Event()
+        self.done = asyncio.Event()
+
+
+class AsyncPredictBatcher(_PredictBatcherBase):
+    """
+    Dynamic batching of the predict requests handled by a master's event loop.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[PredictInput], Awaitable[PredictOutput]],
+        window: float,
+        max_batch_size: int,
+    ) -> None:
+        """
+        Initializes the AsyncPredictBatcher.
+
+        Args:
+            predict: The coroutine function predicting a (combined) predict
+                request.
+            window: The maximum number of seconds a batch is kept open for other
+                requests to join it.
+            max_batch_size: The number of rows after which a batch is closed
+                without waiting for the end of the window.
+        """
+        super().__init__(window, max_batch_size)
+        self._predict = predict
+
+    async def run(self, predict_input: PredictInput) -> PredictOutput:
+        """
+        Predicts a request as part of a batch, awaiting its predictions.
+
+        Args:
+            predict_input: The predict request.
+
+        Returns:
+            The predictions of the request's rows.
+
+        If the leading request is cancelled, such as when its client disconnects,
+        the other requests of its batch fail instead of waiting forever.
+        """
+        start = time.perf_counter()
+        batch, index, leader = self._join(predict_input)
+        assert isinstance(batch, _AsyncBatch)
+        if leader:
+            try:
+                try:
+                    await asyncio.wait_for(batch.closed.wait(), self._window)
+                except asyncio.TimeoutError:
+                    pass
+                self._scatter(batch, await self._predict(self._detach(batch)))
+            except asyncio.CancelledError:
+                batch.error = RuntimeError(
+                    "The batch's leading predict request was cancelled."
+                )
+                raise
+            except Exception as e:
+                batch.error = e
+            finally:
+                self._discard(batch)
+                batch.done.set()
+        else:
+            await batch.done.wait()
+        return self._result(batch, index, start)
+
+    def _new_batch(self, columns: List[str]) -> _Batch:
+        return _AsyncBatch(columns)
+
+    def _close(self, batch: _Batch) -> None:
+        assert isinstance(batch, _AsyncBatch)
+        batch.closed.set()
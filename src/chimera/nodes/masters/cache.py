@@ -0,0 +1,295 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Tuple,
+)
+
+from ...api.dto import PredictInput, PredictOutput, _normalize_columns
+
+
+class _CachedRow(NamedTuple):
+    """Prediction of a single row, as cached."""
+
+    y_pred_row: Any
+    y_pred_proba: List[float] | None
+    classes: Tuple[Any, ...] | None
+    contributors: int | None
+    expires: float
+
+
+class _Lookup(NamedTuple):
+    """Cached predictions of a predict request's rows, and its cache misses."""
+
+    keys: List[Hashable]
+    hits: List[_CachedRow | None]
+    misses: List[int]
+    generation: int
+
+
+class PredictionCache:
+    """
+    Cache of a master's predictions, row by row.
+
+    Each row is keyed by the request's normalized columns and the row's values,
+    ordered by column, so the same features hit the cache whatever the order of
+    the columns. Only the rows missing from the cache are predicted, and the
+    cache is bounded in size, evicting the least recently used rows, and
+    optionally in time. It's cleared whenever the model is fitted again.
+    """
+
+    def __init__(
+        self, max_size: int, ttl: float | None = None, n_workers: int | None = None
+    ) -> None:
+        """
+        Initializes the PredictionCache.
+
+        Args:
+            max_size: The maximum number of rows kept in the cache.
+            ttl: The number of seconds after which a cached row expires. If None,
+                rows only leave the cache when evicted or invalidated
+                (default: None).
+            n_workers: The number of workers whose predictions are combined. If
+                set, degraded predictions, to which fewer workers contributed,
+                such as with a partial quorum, aren't cached (default: None).
+
+        Raises:
+            ValueError: If `max_size` isn't positive or `ttl` isn't positive.
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Cache TTL must be positive.")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._n_workers = n_workers
+        self._rows: OrderedDict[Hashable, _CachedRow] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def run(
+        self,
+        predict_input: PredictInput,
+        predict: Callable[[PredictInput], PredictOutput],
+    ) -> PredictOutput:
+        """
+        Predicts a request, only predicting the rows missing from the cache.
+
+        Args:
+            predict_input: The predict request.
+            predict: The function predicting the rows missing from the cache.
+
+        Returns:
+            The predictions of the request's rows.
+        """
+        lookup = self._lookup(predict_input)
+        if not lookup.keys:
+            return predict(predict_input)
+        if lookup.misses:
+            missing = self._select(predict_input, lookup.misses)
+            merged = self._merge(lookup, predict(missing))
+        else:
+            merged = self._merge(lookup, None)
+        if merged is None:
+            merged = predict(predict_input)
+            self._store(self._all_missed(lookup), merged)
+        return merged
+
+    async def arun(
+        self,
+        predict_input: PredictInput,
+        predict: Callable[[PredictInput], Awaitable[PredictOutput]],
+    ) -> PredictOutput:
+        """
+        Predicts a request, only predicting the rows missing from the cache, with
+        a coroutine function.
+
+        Args:
+            predict_input: The predict request.
+            predict: The coroutine function predicting the rows missing from the
+                cache.
+
+        Returns:
+            The predictions of the request's rows.
+        """
+        lookup = self._lookup(predict_input)
+        if not lookup.keys:
+            return await predict(predict_input)
+        if lookup.misses:
+            missing = self._select(predict_input, lookup.misses)
+            merged = self._merge(lookup, await predict(missing))
+        else:
+            merged = self._merge(lookup, None)
+        if merged is None:
+            merged = await predict(predict_input)
+            self._store(self._all_missed(lookup), merged)
+        return merged
+
+    def invalidate(self) -> None:
+        """Discards every cached row, after the model was fitted again."""
+        with self._lock:
+            self._rows.clear()
+            self._generation += 1
+            self._invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the size and the hit and miss statistics of the cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._rows),
+                "max_size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "miss_ratio": self._misses / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def _lookup(self, predict_input: PredictInput) -> _Lookup:
+        """Looks up the cached predictions of a request's rows."""
+        columns = _normalize_columns(predict_input.X_pred_columns)
+        order = sorted(range(len(columns)), key=columns.__getitem__)
+        header = tuple(columns[k] for k in order)
+        keys: List[Hashable] = [
+            (header, tuple(row[k] for k in order))
+            for row in predict_input.X_pred_rows
+        ]
+
+        now = time.monotonic()
+        hits: List[_CachedRow | None] = []
+        misses: List[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._rows.get(key)
+                if cached is not None and cached.expires <= now:
+                    del self._rows[key]
+                    self._expirations += 1
+                    cached = None
+                if cached is None:
+                    misses.append(i)
+                else:
+                    self._rows.move_to_end(key)
+                hits.append(cached)
+            self._hits += len(keys) - len(misses)
+            self._misses += len(misses)
+            return _Lookup(keys, hits, misses, self._generation)
+
+    @staticmethod
+    def _all_missed(lookup: _Lookup) -> _Lookup:
+        """Returns a lookup where every row of the request is a cache miss."""
+        n_rows = len(lookup.keys)
+        return _Lookup(
+            lookup.keys, [None] * n_rows, list(range(n_rows)), lookup.generation
+        )
+
+    @staticmethod
+    def _select(predict_input: PredictInput, rows: List[int]) -> PredictInput:
+        """Returns the predict request of some of a request's rows."""
+        if len(rows) == len(predict_input.X_pred_rows):
+            return predict_input
+        return PredictInput.model_construct(
+            X_pred_columns=predict_input.X_pred_columns,
+            X_pred_rows=[predict_input.X_pred_rows[i] for i in rows],
+        )
+
+    def _merge(
+        self, lookup: _Lookup, predict_output: PredictOutput | None
+    ) -> PredictOutput | None:
+        """
+        Merges the cached predictions with the predictions of the cache misses,
+        caching the latter.
+
+        Returns:
+            The predictions of the request's rows, or None if the cached rows
+            hold other classes than the predicted ones, such as when some workers
+            didn't answer.
+        """
+        if predict_output is not None:
+            self._store(lookup, predict_output)
+            classes = (
+                None
+                if predict_output.classes is None
+                else tuple(predict_output.classes)
+            )
+        else:
+            first = lookup.hits[0] if lookup.hits else None
+            classes = None if first is None else first.classes
+
+        cached = [hit for hit in lookup.hits if hit is not None]
+        if any(hit.classes != classes for hit in cached):
+            return None
+        if not cached and predict_output is not None:
+            return predict_output
+
+        y_pred_rows: List[Any] = [None] * len(lookup.keys)
+        y_pred_probas: List[Any] = [None] * len(lookup.keys)
+        contributors = [hit.contributors for hit in cached]
+        for i, hit in enumerate(lookup.hits):
+            if hit is not None:
+                y_pred_rows[i] = hit.y_pred_row
+                y_pred_probas[i] = hit.y_pred_proba
+        if predict_output is not None:
+            contributors.append(predict_output.contributors)
+            for k, i in enumerate(lookup.misses):
+                y_pred_rows[i] = predict_output.y_pred_rows[k]
+                if predict_output.y_pred_probas is not None:
+                    y_pred_probas[i] = predict_output.y_pred_probas[k]
+
+        known = [count for count in contributors if count is not None]
+        return PredictOutput.model_construct(
+            y_pred_rows=y_pred_rows,
+            y_pred_probas=None if classes is None else y_pred_probas,
+            classes=None if classes is None else list(classes),
+            contributors=min(known) if known else None,
+        )
+
+    def _store(self, lookup: _Lookup, predict_output: PredictOutput) -> None:
+        """
+        Caches the predictions of a request's cache misses, unless the cache was
+        invalidated since they were looked up, or they are degraded predictions
+        of only some of the workers.
+        """
+        if (
+            self._n_workers is not None
+            and predict_output.contributors is not None
+            and predict_output.contributors < self._n_workers
+        ):
+            return
+        classes = (
+            None if predict_output.classes is None else tuple(predict_output.classes)
+        )
+        expires = float("inf") if self._ttl is None else time.monotonic() + self._ttl
+        with self._lock:
+            if lookup.generation != self._generation:
+                return
+            for k, i in enumerate(lookup.misses):
+                self._rows[lookup.keys[i]] = _CachedRow(
+                    predict_output.y_pred_rows[k],
+                    (
+                        None
+                        if predict_output.y_pred_probas is None
+                        else predict_output.y_pred_probas[k]
+                    ),
+                    classes,
+                    predict_output.contributors,
+                    expires,
+                )
+                self._rows.move_to_end(lookup.keys[i])
+            while len(self._rows) > self._max_size:
+                self._rows.popitem(last=False)
+                self._evictions += 1
@@ -0,0 +1,227 @@
+from typing import Any, Dict
+
+import httpx
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+
+from ...containers.configs import WorkersConfig
+
+
+class WorkerClient:
+    """
+    Long-lived HTTP client for a single Chimera worker.
+
+    Keeps a keep-alive connection pool to the worker's mapped port, so consecutive
+    requests reuse already opened TCP connections instead of paying for a new
+    handshake on every call.
+    """
+
+    def __init__(self, port: int, workers_config: WorkersConfig) -> None:
+        """
+        Initializes the WorkerClient.
+
+        Args:
+            port: The host port mapped to the worker's container.
+            workers_config: The workers configuration, used for pool size, retries
+                and timeouts.
+        """
+        self.port = port
+        self.prefix = f"http://localhost:{port}"
+        self._workers_config = workers_config
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=workers_config.CHIMERA_WORKERS_CONNECTION_POOL_SIZE,
+            max_retries=workers_config.CHIMERA_WORKERS_ENDPOINTS_MAX_RETRIES,
+        )
+        self._session = requests.Session()
+        self._session.mount(self.prefix, self._adapter)
+
+    def url(self, path: str) -> str:
+        """Returns the full URL of a worker endpoint."""
+        return f"{self.prefix}{path}"
+
+    def get(self, path: str, **kwargs: Any) -> requests.Response:
+        """Sends a GET request to a worker endpoint through the pooled session."""
+        kwargs.setdefault(
+            "timeout", self._workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT
+        )
+        return self._session.get(self.url(path), **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        """Sends a POST request to a worker endpoint through the pooled session."""
+        kwargs.setdefault(
+            "timeout", self._workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT
+        )
+        return self._session.post(self.url(path), **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the connection reuse statistics of the worker's pool.
+
+        Returns:
+            A dictionary with the number of requests sent, connections opened and
+            requests that reused an already opened connection.
+        """
+        pools = self._adapter.poolmanager.pools
+        num_requests, num_connections = 0, 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                num_requests += pool.num_requests
+                num_connections += pool.num_connections
+        return {
+            "requests": num_requests,
+            "connections": num_connections,
+            "reused": max(num_requests - num_connections, 0),
+        }
+
+    def close(self) -> None:
+        """Closes all the pooled connections."""
+        self._session.close()
+
+
+class WorkersClientPool:
+    """
+    Holds one long-lived WorkerClient per worker mapped port.
+
+    It's owned by a master node and shared by all of its handlers for the whole
+    life of the master.
+    """
+
+    def __init__(self, workers_config: WorkersConfig) -> None:
+        """
+        Initializes the WorkersClientPool.
+
+        Args:
+            workers_config: The workers configuration.
+        """
+        self._clients = {
+            port: WorkerClient(port, workers_config)
+            for port in workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+        }
+
+    def __getitem__(self, port: int) -> WorkerClient:
+        """Returns the client of the worker mapped to the given port."""
+        return self._clients[port]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns the connection reuse statistics of every worker, by port."""
+        return {str(port): client.stats() for port, client in self._clients.items()}
+
+    def close(self) -> None:
+        """Closes the connections of every worker client."""
+        for client in self._clients.values():
+            client.close()
+
+
+class AsyncWorkerClient:
+    """
+    Long-lived asynchronous HTTP client for a single Chimera worker.
+
+    The asyncio counterpart of `WorkerClient`: it keeps a keep-alive connection
+    pool to the worker's mapped port, used by the asynchronous masters without
+    any thread per request.
+    """
+
+    def __init__(self, port: int, workers_config: WorkersConfig) -> None:
+        """
+        Initializes the AsyncWorkerClient.
+
+        Args:
+            port: The host port mapped to the worker's container.
+            workers_config: The workers configuration, used for pool size, retries
+                and timeouts.
+        """
+        self.port = port
+        self.prefix = f"http://localhost:{port}"
+        pool_size = workers_config.CHIMERA_WORKERS_CONNECTION_POOL_SIZE
+        self._client = httpx.AsyncClient(
+            base_url=self.prefix,
+            timeout=workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                retries=workers_config.CHIMERA_WORKERS_ENDPOINTS_MAX_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size
+                ),
+            ),
+        )
+        self._num_requests = 0
+        self._num_connections = 0
+
+    def url(self, path: str) -> str:
+        """Returns the full URL of a worker endpoint."""
+        return f"{self.prefix}{path}"
+
+    async def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        """Sends a GET request to a worker endpoint through the pooled client."""
+        self._num_requests += 1
+        return await self._client.get(
+            path, extensions={"trace": self._trace}, **kwargs
+        )
+
+    async def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        """
+        Sends a POST request to a worker endpoint through the pooled client.
+
+        Raw bytes may be passed as `data`, like with `requests`.
+        """
+        if isinstance(kwargs.get("data"), bytes):
+            kwargs["content"] = kwargs.pop("data")
+        self._num_requests += 1
+        return await self._client.post(
+            path, extensions={"trace": self._trace}, **kwargs
+        )
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """Counts the connections opened by the client."""
+        if event_name == "connection.connect_tcp.complete":
+            self._num_connections += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the connection reuse statistics of the worker's pool.
+
+        Returns:
+            A dictionary with the number of requests sent, connections opened and
+            requests that reused an already opened connection.
+        """
+        return {
+            "requests": self._num_requests,
+            "connections": self._num_connections,
+            "reused": max(self._num_requests - self._num_connections, 0),
+        }
+
+    async def aclose(self) -> None:
+        """Closes all the pooled connections."""
+        await self._client.aclose()
+
+
+class AsyncWorkersClientPool:
+    """
+    Holds one long-lived AsyncWorkerClient per worker mapped port.
+    """
+
+    def __init__(self, workers_config: WorkersConfig) -> None:
+        """
+        Initializes the AsyncWorkersClientPool.
+
+        Args:
+            workers_config: The workers configuration.
+        """
+        self._clients = {
+            port: AsyncWorkerClient(port, workers_config)
+            for port in workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+        }
+
+    def __getitem__(self, port: int) -> AsyncWorkerClient:
+        """Returns the client of the worker mapped to the given port."""
+        return self._clients[port]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns the connection reuse statistics of every worker, by port."""
+        return {str(port): client.stats() for port, client in self._clients.items()}
+
+    async def aclose(self) -> None:
+        """Closes the connections of every worker client."""
+        for client in self._clients.values():
+            await client.aclose()
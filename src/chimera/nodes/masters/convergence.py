@@ -0,0 +1,225 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Literal, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+NORM_TYPE = Literal["inf", "l2"]
+
+
+class FitProgress(NamedTuple):
+    """Progress of a fit, passed to the convergence criteria at each iteration."""
+
+    iteration: int
+    """Number of iterations (or, in the asynchronous modes, of applied updates)."""
+    weights_gradients: np.ndarray
+    """Flattened weights gradients of the iteration."""
+    bias_gradient: np.ndarray
+    """Bias gradient of the iteration."""
+    loss: float | None
+    """Global training loss of the iteration, if the workers' loss supports it."""
+    elapsed: float
+    """Time, in seconds, since the fit started."""
+    model: Any
+    """The master's model, with its current parameters."""
+
+
+class ConvergenceCriterion(ABC):
+    """
+    Abstract base class for the Parameter Server Master's convergence criteria.
+
+    A criterion is evaluated at each iteration of the fit, or at each applied
+    update in the asynchronous modes, and the fit stops as soon as any of the
+    master's criteria is met. Criteria only keep a few scalars between
+    iterations, and evaluate the gradients with NumPy reductions.
+    """
+
+    def reset(self) -> None:
+        """Resets the criterion's state, before a new fit."""
+
+    @abstractmethod
+    def run(self, progress: FitProgress) -> bool:
+        """
+        Evaluates the criterion.
+
+        Args:
+            progress: The progress of the fit at the current iteration.
+
+        Returns:
+            Whether the fit can stop.
+        """
+        raise NotImplementedError
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns the values tracked by the criterion, logged at each iteration."""
+        return {}
+
+
+class GradientNorm(ConvergenceCriterion):
+    """
+    Stops once the norm of the gradients is within a threshold. With the "inf"
+    norm, every gradient must be within the threshold.
+    """
+
+    def __init__(self, epsilon: float = 10e-12, norm: NORM_TYPE = "inf") -> None:
+        """
+        Initializes the GradientNorm criterion.
+
+        Args:
+            epsilon: The gradient norm threshold (default: 10e-12).
+            norm: The norm of the gradients: "inf" (largest absolute value) or
+                "l2" (default: "inf").
+        """
+        self._epsilon = epsilon
+        self._norm = norm
+        self._last: float | None = None
+
+    def reset(self) -> None:
+        self._last = None
+
+    def run(self, progress: FitProgress) -> bool:
+        weights, bias = progress.weights_gradients, progress.bias_gradient
+        if self._norm == "l2":
+            self._last = float(np.sqrt(weights @ weights + bias @ bias))
+        else:
+            # Max and min reductions avoid the temporary array of np.abs
+            self._last = float(
+                max(weights.max(), -weights.min(), bias.max(), -bias.min())
+            )
+        return self._last <= self._epsilon
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"gradient_norm": self._last}
+
+
+class LossImprovement(ConvergenceCriterion):
+    """
+    Stops once the global training loss hasn't improved on its best value by a
+    relative `tol` for `n_iter_no_change` consecutive iterations, like
+    scikit-learn's SGD stopping rule.
+    """
+
+    def __init__(self, tol: float = 1e-3, n_iter_no_change: int = 5) -> None:
+        """
+        Initializes the LossImprovement criterion.
+
+        Args:
+            tol: The minimum relative improvement of the loss (default: 1e-3).
+            n_iter_no_change: The number of iterations without improvement before
+                stopping (default: 5).
+        """
+        self._tol = tol
+        self._n_iter_no_change = n_iter_no_change
+        self._best = np.inf
+        self._no_change = 0
+
+    def reset(self) -> None:
+        self._best = np.inf
+        self._no_change = 0
+
+    def run(self, progress: FitProgress) -> bool:
+        if progress.loss is None:
+            return False
+        if progress.loss < self._best - self._tol * abs(self._best):
+            self._no_change = 0
+        else:
+            self._no_change += 1
+        self._best = min(self._best, progress.loss)
+        return self._no_change >= self._n_iter_no_change
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "best_loss": None if np.isinf(self._best) else self._best,
+            "loss_no_change": self._no_change,
+        }
+
+
+class ValidationPatience(ConvergenceCriterion):
+    """
+    Stops once the score of the master's model over a validation set hasn't
+    improved on its best value by `min_delta` for `patience` consecutive
+    evaluations. The score is the model's `score`: R² for regressors and
+    accuracy for classifiers.
+    """
+
+    def __init__(
+        self,
+        X_val: Any,
+        y_val: Any,
+        patience: int = 5,
+        min_delta: float = 0.0,
+        every: int = 1,
+    ) -> None:
+        """
+        Initializes the ValidationPatience criterion.
+
+        Args:
+            X_val: The validation features, with the columns of the training data.
+            y_val: The validation targets.
+            patience: The number of evaluations without improvement before
+                stopping (default: 5).
+            min_delta: The minimum improvement of the score (default: 0.0).
+            every: The number of iterations between evaluations (default: 1).
+        """
+        self._X_val = X_val
+        self._y_val = np.asarray(y_val).ravel()
+        self._patience = patience
+        self._min_delta = min_delta
+        self._every = every
+        self._best = -np.inf
+        self._last: float | None = None
+        self._no_change = 0
+
+    def reset(self) -> None:
+        self._best = -np.inf
+        self._last = None
+        self._no_change = 0
+
+    def run(self, progress: FitProgress) -> bool:
+        if progress.iteration % self._every != 0:
+            return False
+        self._last = float(
+            progress.model.score(self._features(progress.model), self._y_val)
+        )
+        if self._last > self._best + self._min_delta:
+            self._best = self._last
+            self._no_change = 0
+        else:
+            self._no_change += 1
+        return self._no_change >= self._patience
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "validation_score": self._last,
+            "validation_no_change": self._no_change,
+        }
+
+    def _features(self, model: Any) -> pd.DataFrame:
+        """
+        Returns the validation features as a DataFrame with the model's feature
+        names, which are normalized when the master samples the training data.
+        """
+        if not isinstance(self._X_val, pd.DataFrame) or list(
+            self._X_val.columns
+        ) != list(getattr(model, "feature_names_in_", self._X_val.columns)):
+            self._X_val = pd.DataFrame(
+                np.asarray(self._X_val),
+                columns=getattr(model, "feature_names_in_", None),
+            )
+        return self._X_val
+
+
+class WallClockBudget(ConvergenceCriterion):
+    """Stops once the fit has run for a given time."""
+
+    def __init__(self, seconds: float) -> None:
+        """
+        Initializes the WallClockBudget criterion.
+
+        Args:
+            seconds: The time budget of the fit, in seconds.
+        """
+        self._seconds = seconds
+
+    def run(self, progress: FitProgress) -> bool:
+        return progress.elapsed >= self._seconds
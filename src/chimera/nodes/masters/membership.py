@@ -0,0 +1,226 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+from ...containers.configs import WorkersConfig
+from ...utils import status_logger
+
+
+class _CircuitBreaker:
+    """
+    Helper class tracking the health of a single worker.
+
+    The breaker is closed while the worker is a member. It opens, evicting the
+    worker, after `failure_threshold` consecutive failed requests or
+    `failure_threshold` consecutive failed heartbeats, and the worker is probed
+    again once its backoff has elapsed. Both are counted separately: a healthy
+    heartbeat only resets the heartbeat failures, so a worker that answers
+    heartbeats but keeps failing its requests is still evicted. The backoff
+    doubles at every eviction or failed probe, up to `max_backoff`, and is only
+    reset by a successful request, so such a worker is probed less and less
+    often.
+    """
+
+    def __init__(
+        self, failure_threshold: int, backoff: float, max_backoff: float
+    ) -> None:
+        """
+        Initializes the _CircuitBreaker.
+
+        Args:
+            failure_threshold: The number of consecutive failed requests, or
+                failed heartbeats, after which the worker is evicted.
+            backoff: The initial time, in seconds, before an evicted worker is
+                probed.
+            max_backoff: The maximum time, in seconds, between probes.
+        """
+        self._failure_threshold = failure_threshold
+        self._initial_backoff = backoff
+        self._max_backoff = max_backoff
+        self.backoff = backoff
+        self.closed = True
+        self.failures = 0
+        self.heartbeat_failures = 0
+        self.evictions = 0
+        self.readmissions = 0
+        self.retry_at = 0.0
+
+    def record_success(self) -> None:
+        """Records a successful request, resetting the failures and the backoff."""
+        self.failures = 0
+        self.backoff = self._initial_backoff
+
+    def record_failure(self, now: float) -> bool:
+        """
+        Records a failed request.
+
+        Returns:
+            Whether the worker was evicted by this failure.
+        """
+        self.failures += 1
+        return self._trip(self.failures, now)
+
+    def record_heartbeat_success(self) -> None:
+        """Records a healthy heartbeat, resetting the heartbeat failures."""
+        self.heartbeat_failures = 0
+
+    def record_heartbeat_failure(self, now: float) -> bool:
+        """
+        Records a failed heartbeat.
+
+        Returns:
+            Whether the worker was evicted by this failure.
+        """
+        self.heartbeat_failures += 1
+        return self._trip(self.heartbeat_failures, now)
+
+    def readmit(self) -> None:
+        """Closes the breaker, making the worker a member again."""
+        self.closed = True
+        self.failures = 0
+        self.heartbeat_failures = 0
+        self.readmissions += 1
+
+    def _trip(self, failures: int, now: float) -> bool:
+        """
+        Opens the breaker once `failures` reaches the threshold, or schedules the
+        next probe if it's already open.
+
+        Returns:
+            Whether the worker was evicted.
+        """
+        if not self.closed:
+            self._open(now)
+            return False
+        if failures < self._failure_threshold:
+            return False
+        self.closed = False
+        self.evictions += 1
+        self._open(now)
+        return True
+
+    def _open(self, now: float) -> None:
+        """Schedules the next probe, and doubles the backoff for the one after."""
+        self.retry_at = now + self.backoff
+        self.backoff = min(2 * self.backoff, self._max_backoff)
+
+
+class WorkersMembership:
+    """
+    Tracks which workers are members of the fit, from the results of the
+    requests sent to them and from periodic heartbeats.
+
+    Each worker has its own circuit breaker: a worker failing
+    CHIMERA_WORKERS_FAILURE_THRESHOLD consecutive requests, or as many
+    consecutive heartbeats, is evicted, so the master stops sending it requests and waiting on their
+    timeouts. Evicted workers are probed through their health endpoint with an
+    exponential backoff, and re-admitted as soon as a probe succeeds.
+    """
+
+    def __init__(self, workers_config: WorkersConfig) -> None:
+        """
+        Initializes the WorkersMembership, with every worker as a member.
+
+        Args:
+            workers_config: The workers configuration.
+        """
+        self._breakers = {
+            port: _CircuitBreaker(
+                workers_config.CHIMERA_WORKERS_FAILURE_THRESHOLD,
+                workers_config.CHIMERA_WORKERS_EVICTION_BACKOFF,
+                workers_config.CHIMERA_WORKERS_MAX_EVICTION_BACKOFF,
+            )
+            for port in workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+        }
+        self._lock = threading.Lock()
+
+    def members(self) -> List[int]:
+        """Returns the mapped ports of the current members."""
+        with self._lock:
+            return [
+                port for port, breaker in self._breakers.items() if breaker.closed
+            ]
+
+    def is_member(self, port: int) -> bool:
+        """Returns whether the worker mapped to the given port is a member."""
+        with self._lock:
+            return self._breakers[port].closed
+
+    def due_heartbeats(self) -> List[int]:
+        """
+        Returns the mapped ports of the workers to send a heartbeat to: every
+        member, and the evicted workers whose backoff has elapsed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                port
+                for port, breaker in self._breakers.items()
+                if breaker.closed or breaker.retry_at <= now
+            ]
+
+    def record_success(self, port: int) -> None:
+        """Records a successful request to a worker."""
+        with self._lock:
+            self._breakers[port].record_success()
+
+    def record_failure(self, port: int) -> None:
+        """Records a failed request to a worker, evicting it past the threshold."""
+        self._record_failure(port, heartbeat=False)
+
+    def record_heartbeat(self, port: int, healthy: bool) -> None:
+        """
+        Records the result of a heartbeat. A healthy heartbeat resets the
+        heartbeat failures of a member, but not its failed requests, and
+        re-admits an evicted worker. A failed one evicts the worker past the
+        threshold.
+        """
+        if not healthy:
+            self._record_failure(port, heartbeat=True)
+            return
+        with self._lock:
+            breaker = self._breakers[port]
+            if breaker.closed:
+                breaker.record_heartbeat_success()
+                return
+            breaker.readmit()
+        status_logger.info(
+            f"Re-admitted worker at port {port} at {self.__class__.__name__}"
+        )
+
+    def _record_failure(self, port: int, heartbeat: bool) -> None:
+        """Records a failed request or heartbeat, logging an eviction."""
+        with self._lock:
+            breaker = self._breakers[port]
+            now = time.monotonic()
+            evicted = (
+                breaker.record_heartbeat_failure(now)
+                if heartbeat
+                else breaker.record_failure(now)
+            )
+            backoff = breaker.retry_at - time.monotonic()
+        if evicted:
+            status_logger.error(
+                f"Evicted worker at port {port}, probing it again in {round(backoff, 2)} s, at {self.__class__.__name__}"
+            )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the membership of every worker, by port.
+
+        Returns:
+            A dictionary with whether each worker is a member, its consecutive
+            failed requests and heartbeats, its evictions and re-admissions, and its current backoff.
+        """
+        with self._lock:
+            return {
+                str(port): {
+                    "member": breaker.closed,
+                    "failures": breaker.failures,
+                    "heartbeat_failures": breaker.heartbeat_failures,
+                    "evictions": breaker.evictions,
+                    "readmissions": breaker.readmissions,
+                    "backoff": breaker.backoff,
+                }
+                for port, breaker in self._breakers.items()
+            }
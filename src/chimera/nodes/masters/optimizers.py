@@ -0,0 +1,318 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Literal, Tuple
+
+import numpy as np
+
+SCHEDULE_TYPE = Literal["constant", "invscaling", "exponential"]
+
+
+class Optimizer(ABC):
+    """
+    Abstract base class for the Parameter Server Master's optimizers.
+
+    An optimizer turns the workers' aggregated gradients into the update that is
+    subtracted from the model's parameters. Its state is kept in NumPy arrays
+    allocated once per fit and updated in place at every step.
+    """
+
+    _STATE_ARRAYS: Tuple[str, ...] = ()
+    """Names of the attributes holding the optimizer's state arrays."""
+
+    def __init__(
+        self,
+        learning_rate: float = 0.01,
+        schedule: SCHEDULE_TYPE = "constant",
+        power_t: float = 0.25,
+        decay: float = 0.99,
+    ) -> None:
+        """
+        Initializes the Optimizer.
+
+        Args:
+            learning_rate: The initial learning rate (default: 0.01).
+            schedule: The learning rate schedule: "constant", "invscaling"
+                (learning_rate / t ** power_t) or "exponential"
+                (learning_rate * decay ** t) (default: "constant").
+            power_t: The exponent of the "invscaling" schedule (default: 0.25).
+            decay: The decay rate of the "exponential" schedule (default: 0.99).
+        """
+        self._learning_rate = learning_rate
+        self._schedule = schedule
+        self._power_t = power_t
+        self._decay = decay
+        self._t = 0
+        self._update: np.ndarray | None = None
+
+    def reset(self) -> None:
+        """Resets the optimizer's state, before a new fit."""
+        self._t = 0
+        self._update = None
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the optimizer's state, to checkpoint it.
+
+        Returns:
+            The step count and the state arrays, keyed by name.
+        """
+        state = {"t": np.array(self._t)}
+        if self._update is not None:
+            state["update"] = self._update
+            for name in self._STATE_ARRAYS:
+                state[name.lstrip("_")] = getattr(self, name)
+        return state
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        """
+        Restores the optimizer's state from a checkpoint.
+
+        Args:
+            state: The state returned by `state`.
+        """
+        self._t = int(state["t"])
+        if "update" not in state:
+            self._update = None
+            return
+        self._update = np.array(state["update"], dtype=np.float64)
+        for name in self._STATE_ARRAYS:
+            setattr(self, name, np.array(state[name.lstrip("_")], dtype=np.float64))
+
+    def run(self, gradient: np.ndarray) -> np.ndarray:
+        """
+        Computes the update for a step.
+
+        Args:
+            gradient: The flattened gradient of all the model's parameters.
+
+        Returns:
+            The update to subtract from the flattened parameters. The returned array
+            is reused by the next step.
+        """
+        if self._update is None or self._update.shape != gradient.shape:
+            self._update = np.zeros_like(gradient, dtype=np.float64)
+            self._allocate(gradient.shape)
+
+        self._t += 1
+        self._compute(gradient, self._current_learning_rate())
+        return self._update
+
+    def _current_learning_rate(self) -> float:
+        """Computes the learning rate of the current step, following the schedule."""
+        if self._schedule == "invscaling":
+            return self._learning_rate / self._t**self._power_t
+        if self._schedule == "exponential":
+            return self._learning_rate * self._decay ** (self._t - 1)
+        return self._learning_rate
+
+    @abstractmethod
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        """Allocates the optimizer's state arrays."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _compute(self, gradient: np.ndarray, learning_rate: float) -> None:
+        """Computes the update of a step into `self._update`."""
+        raise NotImplementedError
+
+
+class SGD(Optimizer):
+    """
+    Stochastic Gradient Descent, with optional momentum and Nesterov momentum.
+    """
+
+    _STATE_ARRAYS = ("_velocity",)
+
+    def __init__(
+        self,
+        learning_rate: float = 0.01,
+        momentum: float = 0.0,
+        nesterov: bool = False,
+        schedule: SCHEDULE_TYPE = "constant",
+        power_t: float = 0.25,
+        decay: float = 0.99,
+    ) -> None:
+        """
+        Initializes the SGD optimizer.
+
+        Args:
+            learning_rate: The initial learning rate (default: 0.01).
+            momentum: The momentum factor. 0 disables momentum (default: 0.0).
+            nesterov: Whether to use Nesterov momentum (default: False).
+            schedule: The learning rate schedule (default: "constant").
+            power_t: The exponent of the "invscaling" schedule (default: 0.25).
+            decay: The decay rate of the "exponential" schedule (default: 0.99).
+        """
+        super().__init__(learning_rate, schedule, power_t, decay)
+        self._momentum = momentum
+        self._nesterov = nesterov
+        self._velocity: np.ndarray
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self._velocity = np.zeros(shape)
+
+    def _compute(self, gradient: np.ndarray, learning_rate: float) -> None:
+        assert self._update is not None
+        if self._momentum == 0.0:
+            np.multiply(gradient, learning_rate, out=self._update)
+            return
+
+        self._velocity *= self._momentum
+        self._velocity += gradient
+        if self._nesterov:
+            np.multiply(self._velocity, self._momentum, out=self._update)
+            self._update += gradient
+        else:
+            self._update[...] = self._velocity
+        self._update *= learning_rate
+
+
+class AdaGrad(Optimizer):
+    """
+    AdaGrad: scales each parameter's learning rate by the inverse square root of
+    the sum of its past squared gradients.
+    """
+
+    _STATE_ARRAYS = ("_squares_sum",)
+
+    def __init__(
+        self,
+        learning_rate: float = 0.01,
+        eps: float = 1e-8,
+        schedule: SCHEDULE_TYPE = "constant",
+        power_t: float = 0.25,
+        decay: float = 0.99,
+    ) -> None:
+        """
+        Initializes the AdaGrad optimizer.
+
+        Args:
+            learning_rate: The initial learning rate (default: 0.01).
+            eps: A term added to the denominator for stability (default: 1e-8).
+            schedule: The learning rate schedule (default: "constant").
+            power_t: The exponent of the "invscaling" schedule (default: 0.25).
+            decay: The decay rate of the "exponential" schedule (default: 0.99).
+        """
+        super().__init__(learning_rate, schedule, power_t, decay)
+        self._eps = eps
+        self._squares_sum: np.ndarray
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self._squares_sum = np.zeros(shape)
+
+    def _compute(self, gradient: np.ndarray, learning_rate: float) -> None:
+        assert self._update is not None
+        self._squares_sum += gradient**2
+        np.sqrt(self._squares_sum, out=self._update)
+        self._update += self._eps
+        np.divide(gradient, self._update, out=self._update)
+        self._update *= learning_rate
+
+
+class RMSProp(Optimizer):
+    """
+    RMSProp: scales each parameter's learning rate by the inverse square root of
+    a moving average of its squared gradients.
+    """
+
+    _STATE_ARRAYS = ("_squares_mean",)
+
+    def __init__(
+        self,
+        learning_rate: float = 0.01,
+        rho: float = 0.9,
+        eps: float = 1e-8,
+        schedule: SCHEDULE_TYPE = "constant",
+        power_t: float = 0.25,
+        decay: float = 0.99,
+    ) -> None:
+        """
+        Initializes the RMSProp optimizer.
+
+        Args:
+            learning_rate: The initial learning rate (default: 0.01).
+            rho: The decay of the squared gradients moving average (default: 0.9).
+            eps: A term added to the denominator for stability (default: 1e-8).
+            schedule: The learning rate schedule (default: "constant").
+            power_t: The exponent of the "invscaling" schedule (default: 0.25).
+            decay: The decay rate of the "exponential" schedule (default: 0.99).
+        """
+        super().__init__(learning_rate, schedule, power_t, decay)
+        self._rho = rho
+        self._eps = eps
+        self._squares_mean: np.ndarray
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self._squares_mean = np.zeros(shape)
+
+    def _compute(self, gradient: np.ndarray, learning_rate: float) -> None:
+        assert self._update is not None
+        self._squares_mean *= self._rho
+        self._squares_mean += (1 - self._rho) * gradient**2
+        np.sqrt(self._squares_mean, out=self._update)
+        self._update += self._eps
+        np.divide(gradient, self._update, out=self._update)
+        self._update *= learning_rate
+
+
+class Adam(Optimizer):
+    """
+    Adam: uses bias-corrected moving averages of the gradients and of their squares.
+    """
+
+    _STATE_ARRAYS = ("_first_moment", "_second_moment")
+
+    def __init__(
+        self,
+        learning_rate: float = 0.01,
+        beta1: float = 0.9,
+        beta2: float = 0.999,
+        eps: float = 1e-8,
+        schedule: SCHEDULE_TYPE = "constant",
+        power_t: float = 0.25,
+        decay: float = 0.99,
+    ) -> None:
+        """
+        Initializes the Adam optimizer.
+
+        Args:
+            learning_rate: The initial learning rate (default: 0.01).
+            beta1: The decay of the gradients moving average (default: 0.9).
+            beta2: The decay of the squared gradients moving average
+                (default: 0.999).
+            eps: A term added to the denominator for stability (default: 1e-8).
+            schedule: The learning rate schedule (default: "constant").
+            power_t: The exponent of the "invscaling" schedule (default: 0.25).
+            decay: The decay rate of the "exponential" schedule (default: 0.99).
+        """
+        super().__init__(learning_rate, schedule, power_t, decay)
+        self._beta1 = beta1
+        self._beta2 = beta2
+        self._eps = eps
+        self._first_moment: np.ndarray
+        self._second_moment: np.ndarray
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self._first_moment = np.zeros(shape)
+        self._second_moment = np.zeros(shape)
+
+    def _compute(self, gradient: np.ndarray, learning_rate: float) -> None:
+        assert self._update is not None
+        self._first_moment *= self._beta1
+        self._first_moment += (1 - self._beta1) * gradient
+        self._second_moment *= self._beta2
+        self._second_moment += (1 - self._beta2) * gradient**2
+
+        step_size = learning_rate / (1 - self._beta1**self._t)
+        np.divide(self._second_moment, 1 - self._beta2**self._t, out=self._update)
+        np.sqrt(self._update, out=self._update)
+        self._update += self._eps
+        np.divide(self._first_moment, self._update, out=self._update)
+        self._update *= step_size
+
+
+OPTIMIZERS_MAP = {
+    "sgd": SGD,
+    "adagrad": AdaGrad,
+    "rmsprop": RMSProp,
+    "adam": Adam,
+}
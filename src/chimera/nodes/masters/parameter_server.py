@@ -1,129 +1,252 @@
+import asyncio
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from copy import deepcopy
-from typing import Any, List, Literal, Tuple
+from copy import copy
+from concurrent.futures import wait
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Literal, Tuple
 
 import numpy as np
 import pandas as pd
 import requests  # type: ignore
 import uvicorn
 from fastapi import APIRouter, FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from requests.adapters import HTTPAdapter  # type: ignore
 
+from ...api.compression import (
+    QUANTIZATION_TYPE,
+    SPARSIFICATION_TYPE,
+    compressed_nbytes,
+    decompress_gradient,
+)
 from ...api.configs import (
+    CHIMERA_PARAMETER_SERVER_MASTER_CHECKPOINT_PATH,
     CHIMERA_PARAMETER_SERVER_MASTER_FIT_PATH,
+    CHIMERA_PARAMETER_SERVER_MASTER_METRICS_PATH,
     CHIMERA_PARAMETER_SERVER_MASTER_PREDICT_PATH,
     CHIMERA_SGD_WORKER_FIT_REQUEST_DATA_SAMPLE_PATH,
     CHIMERA_SGD_WORKER_FIT_STEP_PATH,
+    CHIMERA_WORKER_HEALTH_PATH,
+)
+from ...api.dto import (
+    CheckpointOutput,
+    FitOutput,
+    FitStepInput,
+    FitStepOutput,
+    PredictInput,
+    PredictOutput,
 )
-from ...api.dto import FitOutput, FitStepInput, PredictInput, PredictOutput
 from ...api.exception import ResponseException
 from ...api.response import (
     build_error_response,
     build_json_response,
     get_error_response_message,  # type: ignore
 )
+from ...api.tensors import build_tensor_request, read_tensor_response
 from ...containers.configs import WorkersConfig
-from ...utils import status_logger, time_logger
+from ...utils import Checkpointer, status_logger, time_logger
 from ..workers.sgd import MODEL_TYPE, MODELS_MAP
 from .base import Master
+from .batching import PredictBatcher
+from .cache import PredictionCache
+from .clients import AsyncWorkersClientPool, WorkersClientPool
+from .convergence import ConvergenceCriterion, FitProgress, GradientNorm
+from .membership import WorkersMembership
+from .optimizers import OPTIMIZERS_MAP, Optimizer
+
+
+GRADIENTS_TYPE = Tuple[np.ndarray, np.ndarray, int | None, float | None]
 
 
 class _FitStepFromWorkersHandler:
     """Handles fit requests from workers."""
 
-    def __init__(self, workers_config: WorkersConfig) -> None:
+    def __init__(
+        self,
+        workers_config: WorkersConfig,
+        workers_clients: WorkersClientPool,
+        membership: WorkersMembership,
+    ) -> None:
         self._workers_config = workers_config
+        self._workers_clients = workers_clients
+        self._membership = membership
 
     def fetch(
-        self,
-        port: int,
-        weights: np.ndarray,
-        bias: np.ndarray,
-        weights_gradients: List[List[float]],
-        bias_gradients: List[float],
-    ) -> None:
-        """Fetches a single fit step from a worker."""
+        self, port: int, fit_step_input: FitStepInput
+    ) -> GRADIENTS_TYPE | None:
+        """
+        Fetches a single fit step from a worker, recording its result in the
+        workers membership.
+
+        Returns:
+            The weights gradients, the bias gradient, the number of rows they were
+            computed over and the sum of the loss over these rows, or None if the
+            worker failed.
+        """
         try:
-            s = requests.Session()
-            prefix = f"http://localhost:{port}"
-            s.mount(
-                prefix,
-                HTTPAdapter(
-                    max_retries=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_MAX_RETRIES
+            client = self._workers_clients[port]
+            url = client.url(CHIMERA_SGD_WORKER_FIT_STEP_PATH)
+
+            start_worker = time.time()
+            response = client.post(
+                CHIMERA_SGD_WORKER_FIT_STEP_PATH,
+                **build_tensor_request(
+                    fit_step_input,
+                    self._workers_config.CHIMERA_WORKERS_WIRE_FORMAT == "binary",
                 ),
             )
-            url = f"{prefix}{CHIMERA_SGD_WORKER_FIT_STEP_PATH}"
+            end_worker = time.time()
+            time_logger.info(
+                f"{url} worker endpoint latency = {round(end_worker - start_worker, 4)} s"
+            )
+
+            gradients = self._read_response(url, response, fit_step_input)
+            self._membership.record_success(port)
+            return gradients
+        except Exception as e:
+            status_logger.error(
+                f"Error fetching fit from worker at port {port}: {e}, at {self.__class__.__name__}"
+            )
+            self._membership.record_failure(port)
+            return None
+
+    def _read_response(
+        self, url: str, response: Any, fit_step_input: FitStepInput
+    ) -> GRADIENTS_TYPE:
+        """
+        Reads a worker's fit step response, either from `requests` or `httpx`,
+        and decompresses its gradients.
+
+        Raises:
+            ResponseException: If the worker answered with an error.
+        """
+        if response.status_code != 200:
+            status_logger.error(
+                f"Error at {self.__class__.__name__}: {get_error_response_message(response)}"
+            )
+            raise ResponseException(response)
+
+        fit_step_output = read_tensor_response(response, FitStepOutput)
+        size = len(fit_step_input.weights)
+
+        ratio = 8 * size / max(compressed_nbytes(fit_step_output), 1)
+        bytes_on_wire = int(response.request.headers.get("Content-Length", 0)) + len(
+            response.content
+        )
+        time_logger.info(
+            f"{url} worker gradients compression ratio = {round(ratio, 4)}"
+        )
+        time_logger.info(f"{url} worker bytes on wire = {bytes_on_wire} B")
+
+        return (
+            decompress_gradient(fit_step_output, size),
+            np.asarray(fit_step_output.bias_gradient),
+            fit_step_output.n_samples,
+            fit_step_output.loss_sum,
+        )
+
+
+class _AsyncFitStepFromWorkersHandler(_FitStepFromWorkersHandler):
+    """Handles fit requests from workers, asynchronously."""
+
+    def __init__(
+        self,
+        workers_config: WorkersConfig,
+        workers_clients: WorkersClientPool,
+        membership: WorkersMembership,
+        async_workers_clients: AsyncWorkersClientPool,
+    ) -> None:
+        super().__init__(workers_config, workers_clients, membership)
+        self._async_workers_clients = async_workers_clients
+
+    async def afetch(
+        self, port: int, fit_step_input: FitStepInput
+    ) -> GRADIENTS_TYPE | None:
+        """Fetches a single fit step from a worker, like `fetch`."""
+        try:
+            client = self._async_workers_clients[port]
+            url = client.url(CHIMERA_SGD_WORKER_FIT_STEP_PATH)
 
             start_worker = time.time()
-            response = s.post(
-                url=url,
-                timeout=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT,
-                json=FitStepInput(
-                    weights=list(deepcopy(weights)),
-                    bias=list(deepcopy(bias)),
-                ).model_dump(),
+            response = await client.post(
+                CHIMERA_SGD_WORKER_FIT_STEP_PATH,
+                **build_tensor_request(
+                    fit_step_input,
+                    self._workers_config.CHIMERA_WORKERS_WIRE_FORMAT == "binary",
+                ),
             )
             end_worker = time.time()
             time_logger.info(
                 f"{url} worker endpoint latency = {round(end_worker - start_worker, 4)} s"
             )
 
-            response_json = response.json()
-
-            if response.status_code == 200:
-                weights_gradients.append(response_json["weights_gradients"])
-                bias_gradients.append(response_json["bias_gradient"])
-            else:
-                status_logger.error(
-                    f"Error at {self.__class__.__name__}: {get_error_response_message(response)}"
-                )
-                raise ResponseException(response)
+            gradients = self._read_response(url, response, fit_step_input)
+            self._membership.record_success(port)
+            return gradients
         except Exception as e:
             status_logger.error(
                 f"Error fetching fit from worker at port {port}: {e}, at {self.__class__.__name__}"
             )
+            self._membership.record_failure(port)
+            return None
 
 
 class _DataSampleFromWorkersHandler:
     """Handles data sample requests from workers."""
 
-    def __init__(self, workers_config: WorkersConfig) -> None:
+    def __init__(
+        self,
+        workers_config: WorkersConfig,
+        workers_clients: WorkersClientPool,
+        membership: WorkersMembership,
+    ) -> None:
         self._workers_config = workers_config
+        self._workers_clients = workers_clients
+        self._membership = membership
 
     def fetch(self) -> Tuple:
-        """Requests a data sample from a worker."""
-        for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS:
-            s = requests.Session()
-            prefix = f"http://localhost:{port}"
-            s.mount(
-                prefix,
-                HTTPAdapter(
-                    max_retries=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_MAX_RETRIES
-                ),
-            )
-            url = f"{prefix}{CHIMERA_SGD_WORKER_FIT_REQUEST_DATA_SAMPLE_PATH}"
+        """
+        Requests a data sample from the first member worker that answers with
+        one, moving on to the next member if a worker's request fails or its
+        response isn't valid JSON.
+        """
+        response: requests.Response | None = None
+        for port in self._membership.members():
+            client = self._workers_clients[port]
+            url = client.url(CHIMERA_SGD_WORKER_FIT_REQUEST_DATA_SAMPLE_PATH)
 
             start_worker = time.time()
-            response = s.get(
-                url=url,
-                timeout=self._workers_config.CHIMERA_WORKERS_ENDPOINTS_TIMEOUT,
-            )
-            end_worker = time.time()
+            try:
+                worker_response = client.get(
+                    CHIMERA_SGD_WORKER_FIT_REQUEST_DATA_SAMPLE_PATH
+                )
+                end_worker = time.time()
+                response_json = worker_response.json()
+            except Exception as e:
+                status_logger.error(
+                    f"Error fetching data sample from worker at port {port}: {e}, at {self.__class__.__name__}"
+                )
+                self._membership.record_failure(port)
+                continue
+            response = worker_response
             time_logger.info(
                 f"{url} worker endpoint latency = {round(end_worker - start_worker, 4)} s"
             )
 
-            response_json = response.json()
-
             if response.status_code == 200:
+                self._membership.record_success(port)
                 return (
                     response_json["X_train_sample_columns"],
                     response_json["X_train_sample_rows"],
                     response_json["y_train_sample_columns"],
                     response_json["y_train_sample_rows"],
                 )
+
+        if response is None:
+            message = "No worker answered the data sample request."
+            status_logger.error(f"Error at {self.__class__.__name__}: {message}")
+            raise ResponseException(requests.Response(), message)
         status_logger.error(
             f"Error at {self.__class__.__name__}: {get_error_response_message(response)}"
         )
@@ -143,6 +266,26 @@ class ParameterServerMaster(Master):
         model_type: Literal["regressor", "classifier"],
         epsilon: float = 10e-12,
         *args: Any,
+        raw_gradients: bool = False,
+        optimizer: Literal["sgd", "adagrad", "rmsprop", "adam"] | Optimizer = "sgd",
+        sparsification: SPARSIFICATION_TYPE = "none",
+        sparsification_ratio: float = 0.01,
+        sparsification_threshold: float = 0.0,
+        quantization: QUANTIZATION_TYPE = "none",
+        error_feedback: bool = True,
+        update_mode: Literal["sync", "async", "ssp"] = "sync",
+        staleness_bound: int | None = None,
+        staleness_decay: bool = False,
+        batch_window: float | None = None,
+        max_batch_size: int = 1024,
+        cache_size: int | None = None,
+        cache_ttl: float | None = None,
+        checkpoint_folder: str | None = None,
+        checkpoint_every: int = 100,
+        convergence: ConvergenceCriterion | List[ConvergenceCriterion] | None = None,
+        local_steps: int = 1,
+        adaptive_local_steps: bool = False,
+        elastic_alpha: float | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -150,21 +293,155 @@ class ParameterServerMaster(Master):
 
         Args:
             model: The type of model to use ("regressor" or "classifier").
-            epsilon: The convergence threshold for the training process.
+            epsilon: The gradients threshold of the default convergence criterion,
+                `GradientNorm(epsilon)`.
             *args: Additional positional arguments passed to the model constructor.
+            raw_gradients: Whether workers compute raw loss gradients with their
+                NumPy gradient engine. Otherwise, workers return the updates made by
+                their models' `partial_fit` (default: False).
+            optimizer: The optimizer applying the workers' gradients: "sgd",
+                "adagrad", "rmsprop", "adam" or an `Optimizer` instance. Named
+                optimizers use `eta0` as their learning rate. When `eta0` isn't
+                given, it defaults to 0.01, except for "sgd" over `partial_fit`
+                updates, which applies them as they are (default: "sgd").
+            sparsification: How workers sparsify their weights gradients before
+                sending them: "none", "topk" (keeps the `sparsification_ratio`
+                largest) or "threshold" (keeps those with a magnitude of at least
+                `sparsification_threshold`) (default: "none").
+            sparsification_ratio: The fraction of the weights gradients kept by
+                "topk" sparsification (default: 0.01).
+            sparsification_threshold: The minimum magnitude of the weights
+                gradients kept by "threshold" sparsification (default: 0.0).
+            quantization: How workers quantize their weights gradients before
+                sending them: "none", "int8" or "1bit", with a per-tensor scale
+                (default: "none").
+            error_feedback: Whether workers keep the compression error and add it
+                to their next gradients (default: True).
+            update_mode: How workers' gradients are applied. "sync" waits for every
+                worker and applies the mean of their gradients at each iteration.
+                "async" applies each worker's gradients as soon as they arrive
+                (Hogwild-style). "ssp" works like "async", but rejects gradients
+                that are more than `staleness_bound` updates old (default: "sync").
+            staleness_bound: The maximum number of updates a gradient may lag
+                behind the current weights in "ssp" mode. As each worker's weights
+                lag about one update per other worker, a bound below the number
+                of workers rejects most gradients. If None, the number of workers,
+                and at least 4 (default: None).
+            staleness_decay: Whether to down-weight stale gradients by
+                1 / (1 + staleness) in the asynchronous modes (default: False).
+            batch_window: If set, concurrent predict requests are coalesced for up
+                to `batch_window` seconds, and predicted by a single call to the
+                model (default: None).
+            max_batch_size: The number of rows after which a batch of predict
+                requests is predicted without waiting for the end of the window
+                (default: 1024).
+            cache_size: If set, the predictions of up to `cache_size` rows are
+                cached, and only the rows missing from the cache are predicted.
+                The cache is cleared whenever the model is fitted (default: None).
+            cache_ttl: The number of seconds after which cached predictions
+                expire. If None, they don't (default: None).
+            checkpoint_folder: If set, the model and the optimizer's state are
+                checkpointed to this folder, typically a mounted volume. The latest
+                checkpoint is loaded at startup, and a fit interrupted by a crash
+                resumes from its iteration (default: None).
+            checkpoint_every: The number of iterations (or, in the asynchronous
+                modes, of applied updates) between checkpoints (default: 100).
+            convergence: The convergence criteria of the fit, from
+                `chimera.nodes.masters.convergence`. The fit stops as soon as any
+                of them is met, or after `max_iter` iterations. In the asynchronous
+                modes, they're evaluated once every as many applied updates as
+                there are workers. If None, the fit stops once every gradient is
+                within `epsilon` (default: None).
+            local_steps: The number of local `partial_fit` steps each worker runs
+                before returning the change of its parameters, which the master
+                averages (local SGD). Each iteration is then a communication round
+                of `local_steps` steps (default: 1).
+            adaptive_local_steps: Whether the number of local steps decreases with
+                the training loss, as `local_steps * sqrt(loss / initial loss)`, so
+                workers communicate more often as the fit converges (default:
+                False).
+            elastic_alpha: If set, workers keep their own parameters across
+                iterations and return their elastic difference with the master's,
+                scaled by this moving rate, in (0, 1] (EASGD) (default: None).
             **kwargs: Additional keyword arguments passed to the model constructor.
+
+        Raises:
+            ValueError: If the local steps or the elastic averaging settings are
+                invalid, or requested along with raw gradients.
         """
-        kwargs.pop("eta0", None)
-        self._workers_config = WorkersConfig()
+        if local_steps < 1:
+            raise ValueError("Local steps must be at least 1.")
+        if elastic_alpha is not None and not 0 < elastic_alpha <= 1:
+            raise ValueError("Elastic moving rate must be in the (0, 1] interval.")
+        if raw_gradients and (local_steps > 1 or elastic_alpha is not None):
+            raise ValueError(
+                "Local steps and elastic averaging use partial_fit updates: set raw_gradients=False."
+            )
+
+        super().__init__(loops_per_worker=int(update_mode != "sync"))
+        eta0: float | None = kwargs.pop("eta0", None)
+        self._membership = WorkersMembership(self._workers_config)
+        self._heartbeat_stop = threading.Event()
         self._fit_step_from_workers_handler = _FitStepFromWorkersHandler(
-            self._workers_config
+            self._workers_config, self._workers_clients, self._membership
         )
         self._data_sample_from_workers_handler = _DataSampleFromWorkersHandler(
-            self._workers_config
+            self._workers_config, self._workers_clients, self._membership
         )
         self._model_type = model_type
         self._model: MODEL_TYPE = MODELS_MAP[model_type](*args, **kwargs, eta0=1e-20)
-        self._epsilon = epsilon
+        if convergence is None:
+            convergence = GradientNorm(epsilon)
+        self._criteria = (
+            convergence if isinstance(convergence, list) else [convergence]
+        )
+        self._fit_start = 0.0
+        self._fit_metrics: Dict[str, Any] = {}
+        self._convergence_lock = threading.Lock()
+        self._raw_gradients = raw_gradients
+        if isinstance(optimizer, Optimizer):
+            self._optimizer = optimizer
+        else:
+            if eta0 is None:
+                eta0 = 1.0 if optimizer == "sgd" and not raw_gradients else 0.01
+            self._optimizer = OPTIMIZERS_MAP[optimizer](learning_rate=eta0)
+        self._sparsification = sparsification
+        self._sparsification_ratio = sparsification_ratio
+        self._sparsification_threshold = sparsification_threshold
+        self._quantization = quantization
+        self._error_feedback = error_feedback
+        self._local_steps = local_steps
+        self._adaptive_local_steps = adaptive_local_steps
+        self._current_local_steps = local_steps
+        self._initial_loss: float | None = None
+        self._elastic_alpha = elastic_alpha
+        self._update_mode = update_mode
+        n_workers = len(self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS)
+        if staleness_bound is None:
+            staleness_bound = max(4, n_workers)
+        elif update_mode == "ssp" and staleness_bound < n_workers:
+            status_logger.warning(
+                f"Staleness bound {staleness_bound} is below the number of workers, {n_workers}, so most of their gradients will be rejected, at {self.__class__.__name__}"
+            )
+        self._staleness_bound = staleness_bound
+        self._staleness_decay = staleness_decay
+        self._lock = threading.Lock()
+        self._version = 0
+        self._converged = False
+        self._start_iter = 0
+        self._iteration: int | None = None
+        self._training_loss: float | None = None
+        self._checkpoint_every = checkpoint_every
+        self._checkpointer: Checkpointer | None = None
+        if checkpoint_folder is not None:
+            self._checkpointer = Checkpointer(checkpoint_folder)
+            self._restore_checkpoint()
+        if batch_window is not None:
+            self._batcher = PredictBatcher(
+                self._predict, batch_window, max_batch_size
+            )
+        if cache_size is not None:
+            self._cache = PredictionCache(cache_size, cache_ttl)
         self._port: int
 
     def serve(self, port: int = 8080) -> None:
@@ -175,12 +452,68 @@ class ParameterServerMaster(Master):
             port: The port number to listen on.  Defaults to 8080.
         """
         self._port = port
-        app = FastAPI()
+        app = FastAPI(lifespan=self._lifespan)
         app.include_router(self._predict_router())
         app.include_router(self._fit_router())
+        app.include_router(self._checkpoint_router())
+        app.include_router(
+            self._metrics_router(CHIMERA_PARAMETER_SERVER_MASTER_METRICS_PATH)
+        )
         status_logger.info(f"Serving {self.__class__.__name__} at port {port}...")
         uvicorn.run(app, host=self._workers_config.CHIMERA_WORKERS_HOST, port=port)
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """
+        Sends heartbeats to the workers from a background thread, while the master
+        is serving.
+        """
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            name=f"{self.__class__.__name__}-heartbeat",
+            daemon=True,
+        )
+        heartbeat.start()
+        async with super()._lifespan(app):
+            yield
+            self._heartbeat_stop.set()
+            await asyncio.to_thread(heartbeat.join)
+
+    def _heartbeat_loop(self) -> None:
+        """
+        Sends a heartbeat to every member, and to every evicted worker whose
+        backoff has elapsed, each CHIMERA_WORKERS_HEARTBEAT_INTERVAL seconds.
+        """
+        interval = self._workers_config.CHIMERA_WORKERS_HEARTBEAT_INTERVAL
+        while not self._heartbeat_stop.wait(interval):
+            ports = self._membership.due_heartbeats()
+            for port, healthy in zip(
+                ports, self._executor.map(self._heartbeat, ports)
+            ):
+                self._membership.record_heartbeat(port, healthy)
+
+    def _heartbeat(self, port: int) -> bool:
+        """Checks whether a worker answers its health endpoint in time."""
+        try:
+            response = self._workers_clients[port].get(
+                CHIMERA_WORKER_HEALTH_PATH,
+                timeout=self._workers_config.CHIMERA_WORKERS_HEARTBEAT_TIMEOUT,
+            )
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    def _metrics(self) -> Dict[str, Any]:
+        """Collects the runtime metrics of the master."""
+        metrics = super()._metrics()
+        metrics["membership"] = self._membership.stats()
+        metrics["training"] = {
+            "iteration": self._iteration,
+            "local_steps": self._current_local_steps,
+            **self._fit_metrics,
+        }
+        return metrics
+
     def _predict_router(self) -> APIRouter:
         """Creates the FastAPI router for the /predict endpoint."""
         router = APIRouter()
@@ -190,18 +523,7 @@ class ParameterServerMaster(Master):
             """Handles prediction requests."""
             try:
                 start_master = time.time()
-
-                # SGD Classifier doesn't have a predict_proba method
-                prediction = self._model.predict(
-                    pd.DataFrame(
-                        predict_input.X_pred_rows,
-                        columns=predict_input.X_pred_columns,
-                    )
-                )
-
-                response = build_json_response(
-                    PredictOutput(y_pred_rows=list(prediction))
-                )
+                response = build_json_response(self._run_predict(predict_input))
                 end_master = time.time()
                 time_logger.info(
                     f"http://localhost:{self._port}{CHIMERA_PARAMETER_SERVER_MASTER_PREDICT_PATH} master endpoint latency = {round(end_master - start_master, 4)} s"
@@ -214,6 +536,17 @@ class ParameterServerMaster(Master):
 
         return router
 
+    def _predict(self, predict_input: PredictInput) -> PredictOutput:
+        """Predicts a request with the master's model."""
+        # SGD Classifier doesn't have a predict_proba method
+        prediction = self._model.predict(
+            pd.DataFrame(
+                predict_input.X_pred_rows,
+                columns=predict_input.X_pred_columns,
+            )
+        )
+        return PredictOutput(y_pred_rows=list(prediction))
+
     def _fit_router(self) -> APIRouter:
         """Creates the FastAPI router for the /fit endpoint."""
         router = APIRouter()
@@ -221,82 +554,658 @@ class ParameterServerMaster(Master):
         @router.post(CHIMERA_PARAMETER_SERVER_MASTER_FIT_PATH)
         def fit() -> JSONResponse:
             """Handles the complete fit process."""
+            try:
+                start_master = time.time()
+                max_iter = self._start_fit()
+                if self._update_mode == "sync":
+                    self._fit_sync(max_iter)
+                else:
+                    self._fit_async(max_iter)
+                self._complete_fit()
 
-            def _fit_step() -> Tuple[np.ndarray, np.ndarray]:
-                """Performs a single step of the iterative fitting process."""
-                weights_gradients: List[List[float]] = []
-                bias_gradients: List[float] = []
-
-                with ThreadPoolExecutor() as executor:
-                    futures = [
-                        executor.submit(
-                            self._fit_step_from_workers_handler.fetch,
-                            port,
-                            self._model.coef_.flatten(),
-                            self._model.intercept_,
-                            weights_gradients,
-                            bias_gradients,
-                        )
-                        for port in self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
-                    ]
-                    for future in futures:
-                        future.result()
-
-                if len(weights_gradients) == 0:
-                    message = "All fit iterations responses from workers failed."
-                    status_logger.error(
-                        f"Error at {self.__class__.__name__}: {message}"
-                    )
-                    raise ResponseException(requests.Response(), message)
-
-                return np.mean(np.array(weights_gradients), axis=0), np.mean(
-                    np.array(bias_gradients), axis=0
+                status_logger.info(
+                    f"Workers connections at {self.__class__.__name__}: {self._workers_clients.stats()}"
+                )
+                self._invalidate_cache()
+                response = build_json_response(FitOutput(fit="ok"))
+                end_master = time.time()
+                time_logger.info(
+                    f"http://localhost:{self._port}{CHIMERA_PARAMETER_SERVER_MASTER_FIT_PATH} master endpoint latency = {round(end_master - start_master, 4)} s"
                 )
+                return response
+            except Exception as e:
+                status_logger.error(f"Error at {self.__class__.__name__}: {e}")
+                return build_error_response(e)
+
+        return router
+
+    def _checkpoint_router(self) -> APIRouter:
+        """Creates the FastAPI router for the /checkpoint endpoint."""
+        router = APIRouter()
 
+        @router.post(CHIMERA_PARAMETER_SERVER_MASTER_CHECKPOINT_PATH)
+        async def checkpoint() -> JSONResponse:
+            """Saves a checkpoint of the model and of the optimizer."""
             try:
-                start_master = time.time()
-                (
-                    X_train_sample_columns,
-                    X_train_sample_rows,
-                    _,
-                    y_train_sample_rows,
-                ) = self._data_sample_from_workers_handler.fetch()
-
-                max_iter = self._model.get_params()["max_iter"]
-                y_train_samples = np.array(y_train_sample_rows).ravel()
-
-                kwargs = {}
-                if self._model_type == "classifier":
-                    kwargs = {"classes": np.unique(y_train_samples)}
-
-                self._model.partial_fit(
-                    pd.DataFrame(
-                        X_train_sample_rows, columns=X_train_sample_columns
-                    ),
-                    y_train_samples,
-                    **kwargs,
+                step = await self._acheckpoint()
+                return build_json_response(CheckpointOutput(step=step))
+            except Exception as e:
+                status_logger.error(f"Error at {self.__class__.__name__}: {e}")
+                return build_error_response(e)
+
+        return router
+
+    async def _acheckpoint(self) -> int:
+        """
+        Saves a checkpoint on demand, holding the lock so it doesn't interleave
+        with the updates of a running fit.
+        """
+
+        def save() -> int:
+            with self._lock:
+                return self._save_checkpoint()
+
+        return await run_in_threadpool(save)
+
+    def _save_checkpoint(self) -> int:
+        """
+        Saves the model, the optimizer's state and the current iteration as the
+        next checkpoint.
+
+        Returns:
+            The step of the checkpoint, counting the master's checkpoints.
+
+        Raises:
+            ValueError: If the master has no checkpoint folder.
+        """
+        if self._checkpointer is None:
+            raise ValueError("Checkpoints are disabled: set a checkpoint_folder.")
+
+        step = (self._checkpointer.latest_step() or 0) + 1
+        self._checkpointer.save(
+            step,
+            arrays={
+                f"optimizer_{name}": array
+                for name, array in self._optimizer.state().items()
+            },
+            model=self._model,
+            metadata={
+                "iteration": self._iteration or 0,
+                "completed": self._iteration is None,
+                "update_mode": self._update_mode,
+            },
+        )
+        status_logger.info(f"Saved checkpoint {step} at {self.__class__.__name__}")
+        return step
+
+    def _restore_checkpoint(self) -> int:
+        """
+        Restores the model and the optimizer's state of the latest checkpoint, if
+        any.
+
+        Returns:
+            The iteration an interrupted fit resumes from, or 0 if the latest fit
+            was completed or used another update mode.
+        """
+        assert self._checkpointer is not None
+        checkpoint = self._checkpointer.load()
+        if checkpoint is None:
+            return 0
+
+        if checkpoint.model is not None:
+            self._model = checkpoint.model
+        self._optimizer.load_state(
+            {
+                name.removeprefix("optimizer_"): array
+                for name, array in checkpoint.arrays.items()
+                if name.startswith("optimizer_")
+            }
+        )
+        status_logger.info(
+            f"Restored checkpoint {checkpoint.step} at {self.__class__.__name__}"
+        )
+        if (
+            checkpoint.metadata["completed"]
+            or checkpoint.metadata["update_mode"] != self._update_mode
+        ):
+            return 0
+        return checkpoint.metadata["iteration"]
+
+    def _checkpoint_iteration(self, iteration: int) -> None:
+        """
+        Records the fit's current iteration, checkpointing every
+        `checkpoint_every` iterations.
+        """
+        self._iteration = iteration
+        if (
+            self._checkpointer is not None
+            and iteration % self._checkpoint_every == 0
+        ):
+            self._save_checkpoint()
+
+    def _complete_fit(self) -> None:
+        """Marks the fit as completed, checkpointing its final parameters."""
+        self._iteration = None
+        if self._checkpointer is not None:
+            self._save_checkpoint()
+
+    def _start_fit(self) -> int:
+        """
+        Initializes the model's parameters with a partial fit over a data sample
+        from the workers, and resets the optimizer. If the latest checkpoint is
+        of an interrupted fit, its parameters and optimizer's state are restored
+        instead, and the fit resumes from its iteration.
+
+        Returns:
+            The maximum number of iterations of the fit.
+        """
+        for criterion in self._criteria:
+            criterion.reset()
+        self._fit_start = time.time()
+        self._fit_metrics = {}
+        self._current_local_steps = self._local_steps
+        self._initial_loss = None
+
+        self._start_iter = 0
+        if self._checkpointer is not None:
+            self._start_iter = self._restore_checkpoint()
+        self._iteration = self._start_iter
+        if self._start_iter > 0:
+            status_logger.info(
+                f"Resuming fit from iteration {self._start_iter} at {self.__class__.__name__}"
+            )
+            return self._model.get_params()["max_iter"]
+
+        (
+            X_train_sample_columns,
+            X_train_sample_rows,
+            _,
+            y_train_sample_rows,
+        ) = self._data_sample_from_workers_handler.fetch()
+
+        y_train_samples = np.array(y_train_sample_rows).ravel()
+
+        kwargs = {}
+        if self._model_type == "classifier":
+            kwargs = {"classes": np.unique(y_train_samples)}
+
+        self._model.partial_fit(
+            pd.DataFrame(X_train_sample_rows, columns=X_train_sample_columns),
+            y_train_samples,
+            **kwargs,
+        )
+        self._optimizer.reset()
+        return self._model.get_params()["max_iter"]
+
+    def _fit_step(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Performs a single step of the iterative fitting process over the member
+        workers. The requests of workers evicted while in flight, such as a hung
+        container missing its heartbeats, aren't waited for.
+        """
+        fit_step_input = self._build_fit_step_input()
+        futures = {
+            self._executor.submit(
+                self._fit_step_from_workers_handler.fetch, port, fit_step_input
+            ): port
+            for port in self._membership.members()
+        }
+
+        pending = set(futures)
+        while pending:
+            _, pending = wait(
+                pending,
+                timeout=self._workers_config.CHIMERA_WORKERS_HEARTBEAT_INTERVAL,
+            )
+            pending = {
+                future
+                for future in pending
+                if self._membership.is_member(futures[future])
+            }
+
+        return self._mean_gradients(
+            [future.result() for future in futures if future.done()]
+        )
+
+    def _mean_gradients(
+        self, results: List[GRADIENTS_TYPE | None]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Averages the workers' gradients, weighted by the number of rows each
+        worker computed them over, with a single matrix-vector product per
+        parameter. The global training loss, the mean of the loss over all these
+        rows, is kept in `self._training_loss`.
+
+        Raises:
+            ResponseException: If no worker returned gradients.
+        """
+        gradients = [result for result in results if result is not None]
+        if len(gradients) == 0:
+            message = "All fit iterations responses from workers failed."
+            status_logger.error(f"Error at {self.__class__.__name__}: {message}")
+            raise ResponseException(requests.Response(), message)
+
+        n_samples = [n for _, _, n, _ in gradients if n is not None]
+        loss_sums = [loss for _, _, _, loss in gradients if loss is not None]
+        if len(n_samples) < len(gradients):
+            weights = np.full(len(gradients), 1 / len(gradients))
+        else:
+            weights = np.array(n_samples, dtype=np.float64)
+            weights /= weights.sum()
+
+        self._training_loss = None
+        if len(n_samples) == len(loss_sums) == len(gradients):
+            self._training_loss = sum(loss_sums) / sum(n_samples)
+
+        return (
+            weights @ np.stack([w for w, _, _, _ in gradients]),
+            weights @ np.stack([b for _, b, _, _ in gradients]),
+        )
+
+    def _build_fit_step_input(self) -> FitStepInput:
+        """Builds the input of a worker's fit step from the current parameters."""
+        if self._adaptive_local_steps:
+            self._adapt_local_steps()
+        return FitStepInput.model_construct(
+            weights=self._model.coef_.flatten(),
+            bias=self._model.intercept_.copy(),
+            raw_gradients=self._raw_gradients,
+            sparsification=self._sparsification,
+            sparsification_ratio=self._sparsification_ratio,
+            sparsification_threshold=self._sparsification_threshold,
+            quantization=self._quantization,
+            error_feedback=self._error_feedback,
+            local_steps=self._current_local_steps,
+            elastic_alpha=self._elastic_alpha,
+        )
+
+    def _adapt_local_steps(self) -> None:
+        """
+        Scales the number of local steps by the square root of the ratio between
+        the latest training loss and the first one, between 1 and `local_steps`
+        (AdaComm). Larger steps save round trips while the loss is high, and
+        smaller ones reduce the workers' divergence near the minimum.
+        """
+        if self._training_loss is None:
+            return
+        if self._initial_loss is None:
+            self._initial_loss = self._training_loss
+        if self._initial_loss <= 0:
+            return
+
+        local_steps = int(
+            np.clip(
+                np.ceil(
+                    np.sqrt(self._training_loss / self._initial_loss)
+                    * self._local_steps
+                ),
+                1,
+                self._local_steps,
+            )
+        )
+        if local_steps != self._current_local_steps:
+            status_logger.info(
+                f"Adapted local steps from {self._current_local_steps} to {local_steps} at {self.__class__.__name__}"
+            )
+            self._current_local_steps = local_steps
+
+    def _apply_gradients(
+        self,
+        weights_gradients: np.ndarray,
+        bias_gradient: np.ndarray,
+        scale: float = 1.0,
+    ) -> None:
+        """
+        Updates the model's parameters with the workers' gradients, through the
+        master's optimizer.
+
+        Args:
+            weights_gradients: The flattened weights gradients.
+            bias_gradient: The bias gradient.
+            scale: A factor applied to the gradients before the optimizer step
+                (default: 1.0).
+        """
+        n_weights = self._model.coef_.size
+        update = self._optimizer.run(
+            scale
+            * np.concatenate([np.ravel(weights_gradients), np.ravel(bias_gradient)])
+        )
+        self._model.coef_ = self._model.coef_ - update[:n_weights].reshape(
+            self._model.coef_.shape
+        )
+        self._model.intercept_ = self._model.intercept_ - update[n_weights:]
+
+    def _fit_progress(
+        self,
+        iteration: int,
+        weights_gradients: np.ndarray,
+        bias_gradient: np.ndarray,
+    ) -> FitProgress:
+        """
+        Takes a snapshot of the fit's progress for the convergence criteria. The
+        model is a shallow copy, as updates replace its parameters instead of
+        modifying them in place, so the criteria can evaluate it without the lock.
+        """
+        return FitProgress(
+            iteration,
+            weights_gradients,
+            bias_gradient,
+            self._training_loss,
+            time.time() - self._fit_start,
+            copy(self._model),
+        )
+
+    def _has_converged(self, progress: FitProgress) -> bool:
+        """
+        Evaluates every convergence criterion and logs the fit's metrics for the
+        iteration. Evaluations are serialized by their own lock, so the criteria
+        keep a consistent state without holding back the updates.
+
+        Returns:
+            Whether any criterion is met.
+        """
+        with self._convergence_lock:
+            met = [
+                criterion.__class__.__name__
+                for criterion in self._criteria
+                if criterion.run(progress)
+            ]
+
+            self._fit_metrics = {
+                "loss": progress.loss,
+                "elapsed": round(progress.elapsed, 4),
+            }
+            for criterion in self._criteria:
+                self._fit_metrics.update(criterion.metrics())
+        status_logger.info(
+            f"Fit metrics at iteration {progress.iteration} at {self.__class__.__name__}: {self._fit_metrics}"
+        )
+        if met:
+            status_logger.info(
+                f"Fit converged at iteration {progress.iteration} by {', '.join(met)} at {self.__class__.__name__}"
+            )
+        return len(met) > 0
+
+    def _fit_sync(self, max_iter: int) -> None:
+        """
+        Runs bulk-synchronous SGD: each iteration waits for the gradients of every
+        worker and applies their mean.
+
+        Args:
+            max_iter: The maximum number of iterations.
+        """
+        mean_weights_gradients, mean_bias_gradient = self._fit_step()
+        current_iter = self._start_iter
+
+        while current_iter < max_iter and not self._has_converged(
+            self._fit_progress(
+                current_iter, mean_weights_gradients, mean_bias_gradient
+            )
+        ):
+            status_logger.info(
+                f"Computing SGD iteration {current_iter + 1} at {self.__class__.__name__}"
+            )
+            current_iter = self._apply_iteration(
+                current_iter, mean_weights_gradients, mean_bias_gradient
+            )
+            mean_weights_gradients, mean_bias_gradient = self._fit_step()
+
+    def _apply_iteration(
+        self,
+        iteration: int,
+        weights_gradients: np.ndarray,
+        bias_gradient: np.ndarray,
+    ) -> int:
+        """
+        Applies the mean gradients of a synchronous iteration holding the lock,
+        checkpointing every `checkpoint_every` iterations.
+
+        Returns:
+            The next iteration.
+        """
+        with self._lock:
+            self._apply_gradients(weights_gradients, bias_gradient)
+            self._checkpoint_iteration(iteration + 1)
+        return iteration + 1
+
+    def _fit_async(self, max_iter: int) -> None:
+        """
+        Runs asynchronous SGD: each worker loops independently and its gradients
+        are applied as soon as they arrive, without waiting for the other workers.
+
+        In "ssp" mode, gradients computed over weights more than `staleness_bound`
+        updates old are rejected. The total number of applied updates is bounded
+        by `max_iter` times the number of workers, so the amount of work matches
+        the synchronous mode.
+
+        Args:
+            max_iter: The maximum number of iterations per worker.
+
+        Raises:
+            ResponseException: If no worker gradient could be applied.
+        """
+        ports = self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+        self._version = self._start_iter
+        self._converged = False
+
+        futures = [
+            self._executor.submit(
+                self._async_worker_loop, port, max_iter * len(ports)
+            )
+            for port in ports
+        ]
+        for future in futures:
+            future.result()
+
+        if self._version == self._start_iter:
+            message = "All fit iterations responses from workers failed."
+            status_logger.error(f"Error at {self.__class__.__name__}: {message}")
+            raise ResponseException(requests.Response(), message)
+
+    def _async_worker_loop(self, port: int, max_updates: int) -> None:
+        """
+        Repeatedly sends the latest weights to a worker and applies its gradients,
+        logging the worker's staleness and throughput.
+
+        Args:
+            port: The worker's mapped port.
+            max_updates: The total number of updates after which the fit stops.
+        """
+        url = self._workers_clients[port].url(CHIMERA_SGD_WORKER_FIT_STEP_PATH)
+        start_worker = time.time()
+        applied, rejected = 0, 0
+
+        while True:
+            next_fit_step = self._next_worker_fit_step(max_updates)
+            if next_fit_step is None:
+                break
+            version, fit_step_input = next_fit_step
+
+            if not self._membership.is_member(port):
+                if self._stop_evicted_loop(port):
+                    break
+                time.sleep(self._workers_config.CHIMERA_WORKERS_HEARTBEAT_INTERVAL)
+                continue
+
+            gradients = self._fit_step_from_workers_handler.fetch(
+                port, fit_step_input
+            )
+            if gradients is None:
+                continue
+
+            if self._run_worker_update(port, url, version, gradients):
+                applied += 1
+            else:
+                rejected += 1
+
+        self._log_worker_loop(
+            port, url, time.time() - start_worker, applied, rejected
+        )
+
+    def _next_worker_fit_step(
+        self, max_updates: int
+    ) -> Tuple[int, FitStepInput] | None:
+        """
+        Returns the current version of the weights and the input of a worker's
+        fit step over them, holding the lock, or None once the fit is over.
+        """
+        with self._lock:
+            if self._converged or self._version >= max_updates:
+                return None
+            return self._version, self._build_fit_step_input()
+
+    def _run_worker_update(
+        self, port: int, url: str, version: int, gradients: GRADIENTS_TYPE
+    ) -> bool:
+        """
+        Applies a worker's gradients in the asynchronous modes, holding the lock.
+        Once every as many applied updates as there are workers, the convergence
+        criteria are evaluated after releasing it, over a snapshot of the fit's
+        progress, so the other workers' updates don't wait for them.
+
+        Returns:
+            Whether the gradients were applied.
+        """
+        n_workers = len(self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS)
+        with self._lock:
+            if not self._apply_worker_update(port, url, version, gradients):
+                return False
+            progress = None
+            if self._version % n_workers == 0:
+                progress = self._fit_progress(
+                    self._version, gradients[0], gradients[1]
                 )
 
-                mean_weights_gradients, mean_bias_gradient = _fit_step()
-                current_iter = 0
-
-                while current_iter < max_iter and any(
-                    [
-                        np.abs(gradient) > self._epsilon
-                        for gradient in list(mean_weights_gradients)
-                        + list(mean_bias_gradient)
-                    ]
-                ):
-                    status_logger.info(
-                        f"Computing SGD iteration {current_iter + 1} at {self.__class__.__name__}"
-                    )
-                    self._model.coef_ = self._model.coef_ - mean_weights_gradients
-                    self._model.intercept_ = (
-                        self._model.intercept_ - mean_bias_gradient
-                    )
-                    current_iter += 1
-                    mean_weights_gradients, mean_bias_gradient = _fit_step()
+        if progress is not None and self._has_converged(progress):
+            self._converged = True
+        return True
+
+    def _stop_evicted_loop(self, port: int) -> bool:
+        """
+        Checks whether the asynchronous loop of an evicted worker must stop,
+        because no member is left to continue the fit. Otherwise, the loop waits
+        for the worker to be re-admitted.
+        """
+        if self._membership.members():
+            return False
+        status_logger.error(
+            f"Stopping asynchronous fit loop of worker at port {port}, as every worker was evicted, at {self.__class__.__name__}"
+        )
+        return True
+
+    def _apply_worker_update(
+        self,
+        port: int,
+        url: str,
+        version: int,
+        gradients: GRADIENTS_TYPE,
+    ) -> bool:
+        """
+        Applies a worker's gradients in the asynchronous modes, unless they are too
+        stale. It must be called holding the lock. The training loss is the mean
+        loss over the worker's batch.
+
+        Args:
+            port: The worker's mapped port.
+            url: The worker's fit step URL, for logging.
+            version: The version of the weights the gradients were computed over.
+            gradients: The worker's gradients, as returned by its handler.
+
+        Returns:
+            Whether the gradients were applied.
+        """
+        weights_gradients, bias_gradient, n_samples, loss_sum = gradients
+        self._training_loss = None
+        if n_samples and loss_sum is not None:
+            self._training_loss = loss_sum / n_samples
+
+        staleness = self._version - version
+        time_logger.info(f"{url} worker staleness = {staleness}")
+
+        if self._update_mode == "ssp" and staleness > self._staleness_bound:
+            return False
+
+        scale = 1 / (1 + staleness) if self._staleness_decay else 1.0
+        status_logger.info(
+            f"Applying SGD update {self._version + 1} from worker at port {port} at {self.__class__.__name__}"
+        )
+        self._apply_gradients(weights_gradients, bias_gradient, scale)
+        self._version += 1
+        self._checkpoint_iteration(self._version)
+        return True
+
+    def _log_worker_loop(
+        self, port: int, url: str, elapsed: float, applied: int, rejected: int
+    ) -> None:
+        """Logs the throughput and the updates of an asynchronous worker loop."""
+        time_logger.info(
+            f"{url} worker throughput = {round(applied / max(elapsed, 1e-12), 4)} updates/s"
+        )
+        status_logger.info(
+            f"Worker at port {port} applied {applied} and had {rejected} stale updates rejected at {self.__class__.__name__}"
+        )
+
+
+class AsyncParameterServerMaster(ParameterServerMaster):
+    """
+    Asynchronous version of the ParameterServerMaster.
+
+    Its fit endpoint is an `async` route running the fit steps with a shared
+    `httpx` client and `asyncio`, so the fit doesn't hold any thread while it
+    waits for the workers. Predictions are computed locally, as in the
+    ParameterServerMaster.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initializes the AsyncParameterServerMaster.
+
+        Args:
+            *args: Positional arguments passed to the ParameterServerMaster.
+            **kwargs: Keyword arguments passed to the ParameterServerMaster.
+        """
+        super().__init__(*args, **kwargs)
+        self._async_workers_clients = AsyncWorkersClientPool(self._workers_config)
+        self._async_fit_step_from_workers_handler = _AsyncFitStepFromWorkersHandler(
+            self._workers_config,
+            self._workers_clients,
+            self._membership,
+            self._async_workers_clients,
+        )
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Releases the master's worker connections at shutdown."""
+        async with super()._lifespan(app):
+            yield
+        await self._async_workers_clients.aclose()
+
+    def _metrics(self) -> Dict[str, Any]:
+        """Collects the runtime metrics of the master."""
+        metrics = super()._metrics()
+        metrics["connections"] = self._async_workers_clients.stats()
+        return metrics
 
+    def _fit_router(self) -> APIRouter:
+        """Creates the FastAPI router for the /fit endpoint."""
+        router = APIRouter()
+
+        @router.post(CHIMERA_PARAMETER_SERVER_MASTER_FIT_PATH)
+        async def fit() -> JSONResponse:
+            """Handles the complete fit process."""
+            try:
+                start_master = time.time()
+                max_iter = await run_in_threadpool(self._start_fit)
+                if self._update_mode == "sync":
+                    await self._afit_sync(max_iter)
+                else:
+                    await self._afit_async(max_iter)
+                await run_in_threadpool(self._complete_fit)
+
+                status_logger.info(
+                    f"Workers connections at {self.__class__.__name__}: {self._async_workers_clients.stats()}"
+                )
+                self._invalidate_cache()
                 response = build_json_response(FitOutput(fit="ok"))
                 end_master = time.time()
                 time_logger.info(
@@ -308,3 +1217,133 @@ class ParameterServerMaster(Master):
                 return build_error_response(e)
 
         return router
+
+    async def _afit_step(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Performs a single step of the iterative fitting process, like `_fit_step`.
+        The requests of workers evicted while in flight are cancelled.
+        """
+        fit_step_input = self._build_fit_step_input()
+        tasks = {
+            asyncio.ensure_future(
+                self._async_fit_step_from_workers_handler.afetch(
+                    port, fit_step_input
+                )
+            ): port
+            for port in self._membership.members()
+        }
+
+        pending = set(tasks)
+        while pending:
+            _, pending = await asyncio.wait(
+                pending,
+                timeout=self._workers_config.CHIMERA_WORKERS_HEARTBEAT_INTERVAL,
+            )
+            for task in pending:
+                if not self._membership.is_member(tasks[task]):
+                    task.cancel()
+            pending = {task for task in pending if not task.cancelled()}
+
+        return self._mean_gradients(
+            [task.result() for task in tasks if task.done() and not task.cancelled()]
+        )
+
+    async def _afit_sync(self, max_iter: int) -> None:
+        """
+        Runs bulk-synchronous SGD, like `_fit_sync`, with `asyncio`. The
+        convergence criteria, the updates and the checkpoints run in the thread
+        pool, so they don't block the event loop.
+
+        Args:
+            max_iter: The maximum number of iterations.
+        """
+        mean_weights_gradients, mean_bias_gradient = await self._afit_step()
+        current_iter = self._start_iter
+
+        while current_iter < max_iter and not await run_in_threadpool(
+            self._has_converged,
+            self._fit_progress(
+                current_iter, mean_weights_gradients, mean_bias_gradient
+            ),
+        ):
+            status_logger.info(
+                f"Computing SGD iteration {current_iter + 1} at {self.__class__.__name__}"
+            )
+            current_iter = await run_in_threadpool(
+                self._apply_iteration,
+                current_iter,
+                mean_weights_gradients,
+                mean_bias_gradient,
+            )
+            mean_weights_gradients, mean_bias_gradient = await self._afit_step()
+
+    async def _afit_async(self, max_iter: int) -> None:
+        """
+        Runs asynchronous SGD, like `_fit_async`, with one `asyncio` task per
+        worker instead of one thread per worker.
+
+        Args:
+            max_iter: The maximum number of iterations per worker.
+
+        Raises:
+            ResponseException: If no worker gradient could be applied.
+        """
+        ports = self._workers_config.CHIMERA_WORKERS_MAPPED_PORTS
+        self._version = self._start_iter
+        self._converged = False
+
+        await asyncio.gather(
+            *[self._aworker_loop(port, max_iter * len(ports)) for port in ports]
+        )
+
+        if self._version == self._start_iter:
+            message = "All fit iterations responses from workers failed."
+            status_logger.error(f"Error at {self.__class__.__name__}: {message}")
+            raise ResponseException(requests.Response(), message)
+
+    async def _aworker_loop(self, port: int, max_updates: int) -> None:
+        """
+        Repeatedly sends the latest weights to a worker and applies its gradients,
+        like `_async_worker_loop`. The updates hold the lock in the thread pool,
+        so they neither block the event loop nor interleave with a checkpoint.
+
+        Args:
+            port: The worker's mapped port.
+            max_updates: The total number of updates after which the fit stops.
+        """
+        url = self._async_workers_clients[port].url(CHIMERA_SGD_WORKER_FIT_STEP_PATH)
+        start_worker = time.time()
+        applied, rejected = 0, 0
+
+        while True:
+            next_fit_step = await run_in_threadpool(
+                self._next_worker_fit_step, max_updates
+            )
+            if next_fit_step is None:
+                break
+            version, fit_step_input = next_fit_step
+
+            if not self._membership.is_member(port):
+                if self._stop_evicted_loop(port):
+                    break
+                await asyncio.sleep(
+                    self._workers_config.CHIMERA_WORKERS_HEARTBEAT_INTERVAL
+                )
+                continue
+
+            gradients = await self._async_fit_step_from_workers_handler.afetch(
+                port, fit_step_input
+            )
+            if gradients is None:
+                continue
+
+            if await run_in_threadpool(
+                self._run_worker_update, port, url, version, gradients
+            ):
+                applied += 1
+            else:
+                rejected += 1
+
+        self._log_worker_loop(
+            port, url, time.time() - start_worker, applied, rejected
+        )
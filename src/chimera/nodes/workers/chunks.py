@@ -0,0 +1,87 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Tuple
+
+import pandas as pd
+
+from ...api.dto import iter_fit_input
+
+
+class _ChunkReader:
+    """
+    Helper class for reading a worker's local dataset in fixed-size chunks, for
+    datasets that don't fit in memory.
+
+    The next chunk is read on a background thread while the current one is being
+    used, so at most two chunks are held in memory at a time.
+    """
+
+    def __init__(
+        self, x_train_path: str, y_train_path: str, chunk_size: int
+    ) -> None:
+        """
+        Initializes the _ChunkReader.
+
+        Args:
+            x_train_path: Path to the CSV file containing training features (X).
+            y_train_path: Path to the CSV file containing training labels (y).
+            chunk_size: The number of rows per chunk.
+
+        Raises:
+            ValueError: If `chunk_size` isn't positive.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be a positive integer.")
+
+        self._x_train_path = x_train_path
+        self._y_train_path = y_train_path
+        self._chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=self.__class__.__name__
+        )
+        self._lock = threading.Lock()
+        self._chunks = self._new_epoch()
+        self._next: Future | None = None
+
+    def __iter__(self) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Iterates over a single epoch of the dataset, prefetching the next chunk.
+
+        Yields:
+            Tuples containing a chunk of the features (X) and of the labels (y).
+        """
+        chunks = self._new_epoch()
+        next_chunk = self._executor.submit(next, chunks, None)
+        while True:
+            chunk = next_chunk.result()
+            if chunk is None:
+                return
+            next_chunk = self._executor.submit(next, chunks, None)
+            yield chunk
+
+    def run(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Reads the next chunk, cycling over the dataset epoch after epoch, and
+        prefetches the following one.
+
+        Returns:
+            A tuple containing a chunk of the features (X) and of the labels (y).
+        """
+        with self._lock:
+            chunk = self._next.result() if self._next is not None else self._read()
+            self._next = self._executor.submit(self._read)
+            return chunk
+
+    def _read(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Reads the next chunk, starting a new epoch when the dataset is exhausted."""
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._chunks = self._new_epoch()
+            chunk = next(self._chunks)
+        return chunk
+
+    def _new_epoch(self) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """Starts a new pass over the dataset."""
+        return iter_fit_input(
+            self._x_train_path, self._y_train_path, self._chunk_size
+        )
@@ -0,0 +1,177 @@
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+REGRESSION_LOSSES = {"squared_error"}
+CLASSIFICATION_LOSSES = {"hinge", "log_loss", "modified_huber"}
+
+
+class _GradientEngine:
+    """
+    Helper class for computing raw mini-batch gradients of the losses supported by
+    `SGDRegressor` and `SGDClassifier`, with vectorized NumPy matrix products.
+
+    Unlike the `partial_fit` path, the gradients don't have any learning rate
+    applied, so the master can run its own optimizer over them. Multiclass
+    classifiers are handled one-vs-rest, like scikit-learn does.
+    """
+
+    def __init__(
+        self,
+        loss: str,
+        penalty: str | None = "l2",
+        alpha: float = 0.0001,
+        l1_ratio: float = 0.15,
+        classes: np.ndarray | None = None,
+    ) -> None:
+        """
+        Initializes the _GradientEngine.
+
+        Args:
+            loss: The loss function: "squared_error" for regressors, and "hinge",
+                "log_loss" or "modified_huber" for classifiers.
+            penalty: The regularization term: "l2", "l1", "elasticnet" or None
+                (default: "l2").
+            alpha: The regularization strength (default: 0.0001).
+            l1_ratio: The elastic net mixing parameter (default: 0.15).
+            classes: The classes of a classifier, in the order of the rows of its
+                coefficients. None for regressors (default: None).
+
+        Raises:
+            ValueError: If the loss isn't supported.
+        """
+        supported = REGRESSION_LOSSES if classes is None else CLASSIFICATION_LOSSES
+        if loss not in supported:
+            raise ValueError(
+                f"Loss '{loss}' isn't supported by the NumPy gradient engine."
+            )
+
+        self._loss = loss
+        self._penalty = penalty
+        self._alpha = alpha
+        self._l1_ratio = l1_ratio
+        self._classes = classes
+
+    @classmethod
+    def from_params(
+        cls, params: Dict[str, Any], classes: np.ndarray | None = None
+    ) -> "_GradientEngine":
+        """
+        Creates a _GradientEngine from the parameters of a scikit-learn SGD model.
+
+        Args:
+            params: The model's parameters, as returned by `get_params`.
+            classes: The model's classes, for classifiers.
+        """
+        return cls(
+            params["loss"],
+            params["penalty"],
+            params["alpha"],
+            params["l1_ratio"],
+            classes,
+        )
+
+    def run(
+        self, X: np.ndarray, y: np.ndarray, coef: np.ndarray, intercept: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Computes the mean gradients of the loss over a batch.
+
+        Args:
+            X: The batch's feature data, as a float32 or float64 array.
+            y: The batch's target data, as a 1-D array.
+            coef: The model's coefficients, shaped like the model's `coef_`.
+            intercept: The model's intercept, shaped like the model's `intercept_`.
+
+        Returns:
+            A tuple containing the coefficients gradients (shaped like `coef`), the
+            intercept gradients (shaped like `intercept`) and the sum of the loss
+            over the batch.
+        """
+        W = np.atleast_2d(coef).astype(X.dtype, copy=False)
+        n_samples = X.shape[0]
+
+        P, Y = self._predictions(X, y, W, intercept)
+        dloss, loss = self._loss_gradient(P, Y)
+
+        coef_gradient = dloss.T @ X / n_samples + self._penalty_gradient(W)
+        intercept_gradient = dloss.mean(axis=0)
+
+        return (
+            coef_gradient.reshape(np.shape(coef)),
+            intercept_gradient.reshape(np.shape(intercept)),
+            float(loss.sum()),
+        )
+
+    def loss_sum(
+        self, X: np.ndarray, y: np.ndarray, coef: np.ndarray, intercept: np.ndarray
+    ) -> float:
+        """
+        Computes the sum of the loss over a batch, without its gradients.
+
+        Args:
+            X: The batch's feature data, as a float32 or float64 array.
+            y: The batch's target data, as a 1-D array.
+            coef: The model's coefficients, shaped like the model's `coef_`.
+            intercept: The model's intercept, shaped like the model's `intercept_`.
+
+        Returns:
+            The sum of the loss over the batch.
+        """
+        P, Y = self._predictions(X, y, np.atleast_2d(coef), intercept)
+        _, loss = self._loss_gradient(P, Y)
+        return float(loss.sum())
+
+    def _predictions(
+        self, X: np.ndarray, y: np.ndarray, W: np.ndarray, intercept: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the (rows x outputs) matrices of the model's decision values and
+        of the encoded targets.
+        """
+        W = W.astype(X.dtype, copy=False)
+        P = X @ W.T + np.asarray(intercept, dtype=X.dtype)
+        Y = self._encode_targets(y, P.shape[1]).astype(X.dtype, copy=False)
+        return P, Y
+
+    def _encode_targets(self, y: np.ndarray, n_outputs: int) -> np.ndarray:
+        """
+        Encodes the targets as a (rows x outputs) matrix: the raw values for
+        regressors and one-vs-rest +1/-1 labels for classifiers.
+        """
+        if self._classes is None:
+            return y.reshape(-1, 1)
+        if n_outputs == 1:
+            return np.where(y == self._classes[1], 1.0, -1.0).reshape(-1, 1)
+        return np.where(y.reshape(-1, 1) == self._classes.reshape(1, -1), 1.0, -1.0)
+
+    def _loss_gradient(
+        self, P: np.ndarray, Y: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Computes the loss and its derivative with respect to the predictions."""
+        if self._loss == "squared_error":
+            residuals = P - Y
+            return residuals, 0.5 * residuals**2
+
+        z = Y * P
+        if self._loss == "hinge":
+            return np.where(z < 1.0, -Y, 0.0), np.maximum(0.0, 1.0 - z)
+
+        if self._loss == "log_loss":
+            return -Y * np.exp(-np.logaddexp(0.0, z)), np.logaddexp(0.0, -z)
+
+        dloss = np.where(z >= 1.0, 0.0, np.where(z >= -1.0, -2.0 * (1.0 - z), -4.0))
+        loss = np.where(z >= 1.0, 0.0, np.where(z >= -1.0, (1.0 - z) ** 2, -4.0 * z))
+        return dloss * Y, loss
+
+    def _penalty_gradient(self, W: np.ndarray) -> np.ndarray | float:
+        """Computes the (sub)gradient of the regularization term."""
+        if self._penalty == "l2":
+            return self._alpha * W
+        if self._penalty == "l1":
+            return self._alpha * np.sign(W)
+        if self._penalty == "elasticnet":
+            return self._alpha * (
+                self._l1_ratio * np.sign(W) + (1 - self._l1_ratio) * W
+            )
+        return 0.0
@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from ...api.configs import CHIMERA_WORKER_HEALTH_PATH
+from ...api.dto import HealthOutput
+from ...api.response import build_json_response
+
+
+def health_router() -> APIRouter:
+    """
+    Creates the FastAPI router for the /health endpoint, used as the readiness
+    probe of the worker's container.
+
+    Returns:
+        The FastAPI router for checking the worker's health.
+    """
+    router = APIRouter()
+
+    @router.get(CHIMERA_WORKER_HEALTH_PATH)
+    def health() -> JSONResponse:
+        """Returns an "ok" status once the worker is serving requests."""
+        return build_json_response(HealthOutput())
+
+    return router
@@ -1,26 +1,44 @@
+import math
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Any, List, Tuple
 
 import numpy as np
 import pandas as pd
 import uvicorn
-from fastapi import APIRouter, FastAPI
-from fastapi.responses import JSONResponse
-from sklearn.base import ClassifierMixin, RegressorMixin
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from sklearn.base import ClassifierMixin, RegressorMixin, clone, is_classifier
 
 from ...api.configs import (
+    CHIMERA_MODEL_WORKER_CHECKPOINT_PATH,
     CHIMERA_MODEL_WORKER_FIT_PATH,
     CHIMERA_MODEL_WORKER_PREDICT_PATH,
 )
-from ...api.dto import FitOutput, PredictInput, PredictOutput, load_fit_input
-from ...api.response import build_error_response, build_json_response
+from ...api.dto import (
+    CheckpointOutput,
+    FitOutput,
+    PredictInput,
+    PredictOutput,
+    load_fit_input,
+    load_fit_labels,
+)
+from ...api.response import (
+    build_error_response,
+    build_json_response,
+    build_tensor_response,
+)
+from ...api.tensors import accepts_tensors
 from ...containers.configs import (
+    CHIMERA_CHECKPOINTS_FOLDER,
     CHIMERA_TRAIN_DATA_FOLDER,
     CHIMERA_TRAIN_FEATURES_FILENAME,
     CHIMERA_TRAIN_LABELS_FILENAME,
     WorkersConfig,
 )
-from ...utils import status_logger
+from ...utils import Checkpointer, status_logger
+from .chunks import _ChunkReader
+from .health import health_router
+from .processes import _SharedModel, serve_processes
 
 
 class _Bootstrapper:
@@ -67,7 +85,11 @@ class _ModelWorker(ABC):
     """
 
     def __init__(
-        self, model: RegressorMixin | ClassifierMixin, bootstrap: bool = False
+        self,
+        model: RegressorMixin | ClassifierMixin,
+        bootstrap: bool = False,
+        chunk_size: int | None = None,
+        validation_fraction: float | None = None,
     ) -> None:
         """
         Initializes the _ModelWorker.
@@ -75,7 +97,30 @@ class _ModelWorker(ABC):
         Args:
             model: The scikit-learn predictor model (RegressorMixin or ClassifierMixin).
             bootstrap: Whether to use bootstrapping for model training (default: False).
+            chunk_size: If set, the local dataset isn't loaded in memory. Instead,
+                the model is trained chunk by chunk of `chunk_size` rows, with
+                `partial_fit` or, for ensembles, `warm_start`, adding an equal share
+                of the estimators at each chunk (default: None).
+            validation_fraction: If set, this fraction of the local dataset is held
+                out of training, and the model's score on it is reported by each
+                fit, to weight the worker's predictions (default: None).
+
+        Raises:
+            ValueError: If `chunk_size` is set and the model supports neither
+                `partial_fit` nor `warm_start` with `n_estimators`, if both
+                `chunk_size` and `validation_fraction` are set, or if
+                `validation_fraction` isn't in (0, 1).
         """
+        if validation_fraction is not None:
+            if chunk_size is not None:
+                raise ValueError(
+                    "Validation data can't be held out when training by chunks."
+                )
+            if not 0 < validation_fraction < 1:
+                raise ValueError(
+                    "Validation fraction must be in the (0, 1) interval."
+                )
+
         self._model = model
         self._bootstrap = bootstrap
 
@@ -83,23 +128,70 @@ class _ModelWorker(ABC):
         self._bootstrapper = _Bootstrapper()
 
         self._fit_columns: List[str] = []
-        self._X_train, self._y_train = load_fit_input(
+        self._X_train: pd.DataFrame
+        self._y_train: pd.DataFrame
+        self._X_val: pd.DataFrame | None = None
+        self._y_val: pd.DataFrame | None = None
+        self._chunk_reader: _ChunkReader | None = None
+        self._shared_model: _SharedModel | None = None
+        self._checkpointer: Checkpointer | None = None
+        if self._workers_config.CHIMERA_WORKERS_CHECKPOINTS:
+            self._checkpointer = Checkpointer(CHIMERA_CHECKPOINTS_FOLDER)
+            self._restore_checkpoint()
+
+        if chunk_size is None:
+            self._X_train, self._y_train = load_fit_input(
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
+            )
+            if validation_fraction is not None:
+                self._hold_out_validation(validation_fraction)
+            return
+
+        params = model.get_params()
+        if not hasattr(model, "partial_fit") and not (
+            "warm_start" in params and "n_estimators" in params
+        ):
+            raise ValueError(
+                f"{model.__class__.__name__} supports neither partial_fit nor warm_start, so it can't be trained by chunks."
+            )
+        self._chunk_size = chunk_size
+        self._chunk_reader = _ChunkReader(
             f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
             f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
+            chunk_size,
         )
 
     def serve(self) -> None:
         """
-        Starts the FastAPI server for the model worker.
+        Starts the FastAPI server for the model worker, with
+        CHIMERA_WORKERS_PROCESSES processes. With more than one process, the
+        fitted model is shared between them through a _SharedModel.
         """
         app = FastAPI()
         app.include_router(self._fit_router())
         app.include_router(self._predict_router())
+        app.include_router(self._checkpoint_router())
+        app.include_router(health_router())
         status_logger.info(f"Serving {self.__class__.__name__}...")
-        uvicorn.run(
+
+        n_processes = self._workers_config.CHIMERA_WORKERS_PROCESSES
+        if n_processes == 1:
+            uvicorn.run(
+                app,
+                host=self._workers_config.CHIMERA_WORKERS_HOST,
+                port=self._workers_config.CHIMERA_WORKERS_PORT,
+            )
+            return
+
+        self._shared_model = _SharedModel(
+            str(self._workers_config.CHIMERA_WORKERS_PORT)
+        )
+        serve_processes(
             app,
-            host=self._workers_config.CHIMERA_WORKERS_HOST,
-            port=self._workers_config.CHIMERA_WORKERS_PORT,
+            self._workers_config.CHIMERA_WORKERS_HOST,
+            self._workers_config.CHIMERA_WORKERS_PORT,
+            n_processes,
         )
 
     def _fit_router(self) -> APIRouter:
@@ -117,21 +209,201 @@ class _ModelWorker(ABC):
             Fits the model using training data loaded from CSV files.
             """
             try:
-                if self._bootstrap:
+                if self._chunk_reader is not None:
+                    n_samples = self._fit_chunks(self._chunk_reader)
+                elif self._bootstrap:
                     X_train, y_train = self._bootstrapper.run(
                         self._X_train, self._y_train
                     )
                     self._model.fit(X_train, np.array(y_train).ravel())
+                    n_samples = len(X_train)
                 else:
                     self._model.fit(self._X_train, np.array(self._y_train).ravel())
+                    n_samples = len(self._X_train)
+
+                score = None
+                if self._X_val is not None:
+                    score = float(
+                        self._model.score(self._X_val, np.array(self._y_val).ravel())
+                    )
+
+                if self._shared_model is not None:
+                    self._shared_model.publish(self._model)
+                if self._checkpointer is not None:
+                    self._save_checkpoint(self._checkpointer)
+
+                return build_json_response(
+                    FitOutput(fit="ok", n_samples=n_samples, score=score)
+                )
+            except Exception as e:
+                status_logger.error(f"Error at {self.__class__.__name__}: {e}")
+                return build_error_response(e)
+
+        return router
+
+    def _checkpoint_router(self) -> APIRouter:
+        """
+        Creates and returns the FastAPI router for the /checkpoint endpoint.
+
+        Returns:
+            The FastAPI router for checkpointing the model on demand.
+        """
+        router = APIRouter()
 
-                return build_json_response(FitOutput(fit="ok"))
+        @router.post(CHIMERA_MODEL_WORKER_CHECKPOINT_PATH)
+        def checkpoint() -> JSONResponse:
+            """
+            Saves a checkpoint of the model.
+            """
+            try:
+                if self._checkpointer is None:
+                    raise ValueError(
+                        "Checkpoints are disabled. Enable them with CHIMERA_WORKERS_CHECKPOINTS."
+                    )
+                self._serving_model()
+                step = self._save_checkpoint(self._checkpointer)
+                return build_json_response(CheckpointOutput(step=step))
             except Exception as e:
                 status_logger.error(f"Error at {self.__class__.__name__}: {e}")
                 return build_error_response(e)
 
         return router
 
+    def _save_checkpoint(self, checkpointer: Checkpointer) -> int:
+        """
+        Saves the model as the next checkpoint.
+
+        Returns:
+            The step of the checkpoint, counting the worker's checkpoints.
+        """
+        step = (checkpointer.latest_step() or 0) + 1
+        checkpointer.save(step, model=self._model)
+        status_logger.info(f"Saved checkpoint {step} at {self.__class__.__name__}")
+        return step
+
+    def _restore_checkpoint(self) -> None:
+        """Restores the model of the latest checkpoint, if any."""
+        assert self._checkpointer is not None
+        checkpoint = self._checkpointer.load()
+        if checkpoint is None or checkpoint.model is None:
+            return
+        self._model = checkpoint.model
+        status_logger.info(
+            f"Restored checkpoint {checkpoint.step} at {self.__class__.__name__}"
+        )
+
+    def _hold_out_validation(self, validation_fraction: float) -> None:
+        """
+        Splits a random fraction of the local dataset off the training data, as
+        validation data.
+
+        Args:
+            validation_fraction: The fraction of the rows held out.
+        """
+        n_rows = len(self._X_train)
+        permutation = np.random.RandomState(0).permutation(n_rows)
+        n_val = max(1, int(validation_fraction * n_rows))
+        val_rows, train_rows = permutation[:n_val], permutation[n_val:]
+
+        self._X_val = self._X_train.iloc[val_rows].reset_index(drop=True)
+        self._y_val = self._y_train.iloc[val_rows].reset_index(drop=True)
+        self._X_train = self._X_train.iloc[train_rows].reset_index(drop=True)
+        self._y_train = self._y_train.iloc[train_rows].reset_index(drop=True)
+
+    def _fit_chunks(self, chunk_reader: _ChunkReader) -> int:
+        """
+        Trains a fresh copy of the model over a single pass of the local dataset,
+        chunk by chunk. Each chunk is bootstrapped on its own, if bootstrapping is
+        enabled.
+
+        Warm-started ensembles spread their estimators over the chunks, so every
+        chunk adds at least one. With more chunks than estimators, consecutive
+        chunks are merged so that each merged group gets one.
+
+        Args:
+            chunk_reader: The reader of the local dataset's chunks.
+
+        Returns:
+            The number of rows the model was trained on.
+        """
+        model = clone(self._model)
+        y = load_fit_labels(
+            f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}"
+        )
+
+        kwargs = {}
+        if hasattr(model, "partial_fit"):
+            if is_classifier(model):
+                kwargs = {"classes": np.unique(y)}
+        else:
+            params = model.get_params()
+            n_estimators = params["n_estimators"]
+            n_chunks = math.ceil(len(y) / self._chunk_size)
+            chunks_per_fit = math.ceil(n_chunks / n_estimators)
+            n_fits = math.ceil(n_chunks / chunks_per_fit)
+            model.set_params(warm_start=True)
+
+        n_rows, n_fitted = 0, 0
+        X_group: List[pd.DataFrame] = []
+        y_group: List[pd.DataFrame] = []
+        for X_chunk, y_chunk in chunk_reader:
+            n_rows += len(y_chunk)
+            if self._bootstrap:
+                X_chunk, y_chunk = self._bootstrapper.run(X_chunk, y_chunk)
+
+            if hasattr(model, "partial_fit"):
+                model.partial_fit(X_chunk, np.array(y_chunk).ravel(), **kwargs)
+                continue
+
+            X_group.append(X_chunk)
+            y_group.append(y_chunk)
+            if len(X_group) == chunks_per_fit:
+                self._fit_estimators(
+                    model, X_group, y_group, n_estimators, n_fits, n_fitted
+                )
+                n_fitted += 1
+                X_group, y_group = [], []
+
+        if not hasattr(model, "partial_fit"):
+            if X_group:
+                self._fit_estimators(
+                    model, X_group, y_group, n_estimators, n_fits, n_fitted
+                )
+            model.set_params(warm_start=params["warm_start"])
+        self._model = model
+        return n_rows
+
+    @staticmethod
+    def _fit_estimators(
+        model: Any,
+        X_group: List[pd.DataFrame],
+        y_group: List[pd.DataFrame],
+        n_estimators: int,
+        n_fits: int,
+        fit_index: int,
+    ) -> None:
+        """
+        Adds the estimators of a group of chunks to a warm-started ensemble. The
+        `n_estimators` are split evenly across the `n_fits` groups, the first
+        groups getting one more each for the remainder.
+        """
+        base, remainder = divmod(n_estimators, n_fits)
+        model.set_params(
+            n_estimators=(fit_index + 1) * base + min(fit_index + 1, remainder)
+        )
+        model.fit(pd.concat(X_group), np.array(pd.concat(y_group)).ravel())
+
+    def _serving_model(self) -> Any:
+        """
+        Returns the model used for predictions, reloading it first if another
+        process of the worker fitted it.
+        """
+        if self._shared_model is not None:
+            model = self._shared_model.refresh()
+            if model is not None:
+                self._model = model
+        return self._model
+
     @abstractmethod
     def _predict_router(self) -> APIRouter:
         """
@@ -148,15 +420,26 @@ class RegressionWorker(_ModelWorker):
     Chimera worker for regression tasks.
     """
 
-    def __init__(self, regressor: RegressorMixin, bootstrap: bool = False) -> None:
+    def __init__(
+        self,
+        regressor: RegressorMixin,
+        bootstrap: bool = False,
+        chunk_size: int | None = None,
+        validation_fraction: float | None = None,
+    ) -> None:
         """
         Initializes the RegressionWorker.
 
         Args:
             regressor: The scikit-learn regressor model.
             bootstrap: Whether to use bootstrapping (default: False).
+            chunk_size: If set, the model is trained chunk by chunk of
+                `chunk_size` rows, without loading the local dataset in memory
+                (default: None).
+            validation_fraction: If set, this fraction of the local dataset is held
+                out of training to score the model at each fit (default: None).
         """
-        super().__init__(regressor, bootstrap)
+        super().__init__(regressor, bootstrap, chunk_size, validation_fraction)
 
     def _predict_router(self) -> APIRouter:
         """
@@ -176,7 +459,7 @@ class RegressionWorker(_ModelWorker):
                 X_pred_rows = predict_input.X_pred_rows
                 X_pred_columns = predict_input.X_pred_columns
 
-                y_pred: np.ndarray = self._model.predict(
+                y_pred: np.ndarray = self._serving_model().predict(
                     pd.DataFrame(X_pred_rows, columns=X_pred_columns)
                 )
 
@@ -197,15 +480,26 @@ class ClassificationWorker(_ModelWorker):
     Chimera worker for classification tasks.
     """
 
-    def __init__(self, classifier: ClassifierMixin, bootstrap: bool = False) -> None:
+    def __init__(
+        self,
+        classifier: ClassifierMixin,
+        bootstrap: bool = False,
+        chunk_size: int | None = None,
+        validation_fraction: float | None = None,
+    ) -> None:
         """
         Initializes the ClassificationWorker.
 
         Args:
             classifier: The scikit-learn classifier model.
             bootstrap: Whether to use bootstrapping (default: False).
+            chunk_size: If set, the model is trained chunk by chunk of
+                `chunk_size` rows, without loading the local dataset in memory
+                (default: None).
+            validation_fraction: If set, this fraction of the local dataset is held
+                out of training to score the model at each fit (default: None).
         """
-        super().__init__(classifier, bootstrap)
+        super().__init__(classifier, bootstrap, chunk_size, validation_fraction)
 
     def _predict_router(self) -> APIRouter:
         """
@@ -217,23 +511,36 @@ class ClassificationWorker(_ModelWorker):
         router = APIRouter()
 
         @router.post(CHIMERA_MODEL_WORKER_PREDICT_PATH)
-        def predict(predict_input: PredictInput) -> JSONResponse:
+        def predict(predict_input: PredictInput, request: Request) -> Response:
             """
-            Makes a classification prediction using the fitted model.  Returns prediction probabilities.
+            Makes a classification prediction using the fitted model. Returns the
+            probabilities of every class, along with the class labels, in the
+            binary tensor format whenever the master accepts it.
             """
             try:
-                X_pred_rows = predict_input.X_pred_rows
-                X_pred_columns = predict_input.X_pred_columns
-
-                y_pred: List = [
-                    probas[1]
-                    for probas in self._model.predict_proba(
-                        pd.DataFrame(X_pred_rows, columns=X_pred_columns)
+                model = self._serving_model()
+                y_pred_probas: np.ndarray = model.predict_proba(
+                    pd.DataFrame(
+                        predict_input.X_pred_rows,
+                        columns=predict_input.X_pred_columns,
                     )
-                ]
+                )
 
-                return build_json_response(
-                    PredictOutput(y_pred_rows=y_pred, y_pred_columns=X_pred_columns)
+                y_pred = (
+                    y_pred_probas[:, 1]
+                    if y_pred_probas.shape[1] == 2
+                    else model.classes_[y_pred_probas.argmax(axis=1)].tolist()
+                )
+
+                return build_tensor_response(
+                    PredictOutput.model_construct(
+                        y_pred_rows=y_pred,
+                        y_pred_probas=np.ascontiguousarray(
+                            y_pred_probas, dtype=np.float64
+                        ),
+                        classes=model.classes_.tolist(),
+                    ),
+                    accepts_tensors(request),
                 )
             except Exception as e:
                 status_logger.error(f"Error at {self.__class__.__name__}: {e}")
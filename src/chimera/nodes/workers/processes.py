@@ -0,0 +1,108 @@
+import os
+import signal
+import tempfile
+from typing import Any, List
+
+import joblib
+import numpy as np
+import uvicorn
+from fastapi import FastAPI
+
+from ...utils import status_logger
+
+
+class _SharedModel:
+    """
+    Helper class for sharing a worker's fitted model between its processes.
+
+    The process that fits the model publishes it to a file, in shared memory when
+    available, and the other processes reload it the next time they use the
+    model. The model's arrays are memory-mapped on load, so all the processes
+    read the same pages.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initializes the _SharedModel, discarding any model published before.
+
+        Args:
+            name: A name identifying the worker, unique on the host.
+        """
+        folder = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        self._path = os.path.join(folder, f"chimera_{name}_model.joblib")
+        self._version: int | None = None
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+    def publish(self, model: Any) -> None:
+        """
+        Publishes a fitted model to the other processes.
+
+        Args:
+            model: The fitted model.
+        """
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, self._path)
+        self._version = os.stat(self._path).st_mtime_ns
+
+    def refresh(self) -> Any | None:
+        """
+        Loads the last published model, if it changed since the last call.
+
+        Returns:
+            The last published model, or None if it didn't change.
+        """
+        try:
+            version = os.stat(self._path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if version == self._version:
+            return None
+
+        model = joblib.load(self._path, mmap_mode="r")
+        self._version = version
+        return model
+
+
+def serve_processes(app: FastAPI, host: str, port: int, n_processes: int) -> None:
+    """
+    Serves an application with several uvicorn processes accepting connections
+    on the same socket.
+
+    The processes are forked from the current one after it's fully initialized,
+    so they share its memory, including the loaded training data, copy-on-write.
+    The current process only supervises them: it forwards SIGINT and SIGTERM to
+    them and returns once they all stopped.
+
+    Args:
+        app: The FastAPI application.
+        host: The host to bind the socket to.
+        port: The port to bind the socket to.
+        n_processes: The number of processes serving the application.
+    """
+    config = uvicorn.Config(app, host=host, port=port)
+    sock = config.bind_socket()
+
+    children: List[int] = []
+    for _ in range(n_processes):
+        pid = os.fork()
+        if pid == 0:
+            # Unseeded estimators would otherwise draw the same numbers in every process
+            np.random.seed()
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+    status_logger.info(f"Serving with {n_processes} processes...")
+
+    def stop(signum: int, frame: Any) -> None:
+        for pid in children:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for pid in children:
+        os.waitpid(pid, 0)
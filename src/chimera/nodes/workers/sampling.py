@@ -0,0 +1,122 @@
+from typing import Literal, Tuple
+
+import numpy as np
+
+SAMPLING_STRATEGY = Literal["shuffle", "replacement", "stratified"]
+
+
+class _MiniBatchSampler:
+    """
+    Helper class for drawing mini-batches from a worker's local dataset.
+
+    The data is held in a contiguous, pre-shuffled NumPy buffer, so drawing a
+    batch without replacement is an O(batch) slice instead of a pandas copy.
+    """
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        batch_size: int | None = None,
+        strategy: SAMPLING_STRATEGY = "shuffle",
+        random_state: int = 0,
+    ) -> None:
+        """
+        Initializes the _MiniBatchSampler.
+
+        Args:
+            X: The feature data.
+            y: The target data, as a 1-D array.
+            batch_size: The number of rows per batch. If None, every batch is the
+                whole dataset (default: None).
+            strategy: How batches are drawn. "shuffle" runs shuffled epochs without
+                replacement, "replacement" samples rows with replacement and
+                "stratified" draws from every class in proportion to its frequency,
+                with at least one row per class (default: "shuffle").
+            random_state: The seed for the random number generator (default: 0).
+
+        Raises:
+            ValueError: If `batch_size` isn't positive.
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+
+        self._batch_size = batch_size
+        self._strategy = strategy
+        self._random_state = np.random.RandomState(random_state)
+
+        permutation = self._random_state.permutation(len(y))
+        if strategy == "stratified":
+            permutation = permutation[np.argsort(y[permutation], kind="stable")]
+
+        self._X = np.ascontiguousarray(X[permutation])
+        self._y = np.ascontiguousarray(y[permutation])
+        self._cursor = 0
+
+        if strategy == "stratified":
+            _, self._class_starts, self._class_counts = np.unique(
+                self._y, return_index=True, return_counts=True
+            )
+            self._class_cursors = self._class_starts.copy()
+
+    @property
+    def n_samples(self) -> int:
+        """The number of rows in the local dataset."""
+        return len(self._y)
+
+    def run(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draws the next mini-batch.
+
+        Returns:
+            A tuple containing the batch's feature data (X) and target data (y).
+        """
+        if self._batch_size is None or self._batch_size >= self.n_samples:
+            return self._X, self._y
+
+        if self._strategy == "replacement":
+            indices = self._random_state.randint(
+                0, self.n_samples, size=self._batch_size
+            )
+            return self._X[indices], self._y[indices]
+
+        if self._strategy == "stratified":
+            return self._run_stratified(self._batch_size)
+
+        if self._cursor + self._batch_size > self.n_samples:
+            self._reshuffle(0, self.n_samples)
+            self._cursor = 0
+
+        batch = slice(self._cursor, self._cursor + self._batch_size)
+        self._cursor += self._batch_size
+        return self._X[batch], self._y[batch]
+
+    def _run_stratified(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Draws a batch with a slice of each class' contiguous block."""
+        sizes = np.maximum(
+            np.round(batch_size * self._class_counts / self.n_samples), 1
+        ).astype(int)
+        sizes = np.minimum(sizes, self._class_counts)
+
+        slices = []
+        for k, size in enumerate(sizes):
+            start = self._class_starts[k]
+            end = start + self._class_counts[k]
+            if self._class_cursors[k] + size > end:
+                self._reshuffle(start, end)
+                self._class_cursors[k] = start
+            slices.append(
+                slice(self._class_cursors[k], self._class_cursors[k] + size)
+            )
+            self._class_cursors[k] += size
+
+        return (
+            np.concatenate([self._X[batch] for batch in slices]),
+            np.concatenate([self._y[batch] for batch in slices]),
+        )
+
+    def _reshuffle(self, start: int, end: int) -> None:
+        """Shuffles a block of the buffer in place, at the end of an epoch."""
+        permutation = start + self._random_state.permutation(end - start)
+        self._X[start:end] = self._X[permutation]
+        self._y[start:end] = self._y[permutation]
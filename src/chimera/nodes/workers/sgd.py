@@ -1,26 +1,46 @@
 from copy import deepcopy
-from typing import Any, Literal, Type
+from typing import Any, Iterator, Literal, Tuple, Type
 
 import numpy as np
-import pandas as pd
 import uvicorn
-from fastapi import APIRouter, FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from sklearn.linear_model import SGDClassifier, SGDRegressor
 
+from ...api.compression import _GradientCompressor
 from ...api.configs import (
+    CHIMERA_SGD_WORKER_CHECKPOINT_PATH,
     CHIMERA_SGD_WORKER_FIT_REQUEST_DATA_SAMPLE_PATH,
     CHIMERA_SGD_WORKER_FIT_STEP_PATH,
 )
-from ...api.dto import FitStepInput, FitStepOutput, load_fit_input, load_fit_samples
-from ...api.response import build_error_response, build_json_response
+from ...api.dto import (
+    CheckpointOutput,
+    FitRequestDataSampleOutput,
+    FitStepInput,
+    FitStepOutput,
+    load_fit_input,
+    load_fit_samples,
+    sample_fit_input,
+)
+from ...api.response import (
+    build_error_response,
+    build_json_response,
+    build_tensor_response,
+)
+from ...api.tensors import accepts_tensors, read_tensor_request
 from ...containers.configs import (
+    CHIMERA_CHECKPOINTS_FOLDER,
     CHIMERA_TRAIN_DATA_FOLDER,
     CHIMERA_TRAIN_FEATURES_FILENAME,
     CHIMERA_TRAIN_LABELS_FILENAME,
     WorkersConfig,
 )
-from ...utils import status_logger
+from ...utils import Checkpointer, status_logger
+from .chunks import _ChunkReader
+from .health import health_router
+from .gradients import _GradientEngine
+from .sampling import SAMPLING_STRATEGY, _MiniBatchSampler
 
 MODELS_MAP = {
     "regressor": SGDRegressor,
@@ -43,6 +63,9 @@ class SGDWorker:
         self,
         model_type: Literal["regressor", "classifier"],
         *args: Any,
+        batch_size: int | None = None,
+        sampling: SAMPLING_STRATEGY = "shuffle",
+        chunk_size: int | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -51,18 +74,70 @@ class SGDWorker:
         Args:
             model: The type of model to use ("regressor" or "classifier").
             *args: Additional positional arguments passed to the model constructor.
+            batch_size: The number of local rows used at each fit step. If None,
+                each fit step uses the whole local dataset (default: None).
+            sampling: How mini-batches are drawn from the in-memory dataset:
+                "shuffle" (shuffled epochs without replacement), "replacement" or
+                "stratified" (classifiers only) (default: "shuffle").
+            chunk_size: If set, the local dataset isn't loaded in memory. Instead,
+                it's read in chunks of `chunk_size` rows, with the next one
+                prefetched in the background. Each fit step then makes a full pass
+                over the chunks or, with `batch_size`, takes the next `batch_size`
+                rows of the chunks, in their order (default: None).
             **kwargs: Additional keyword arguments passed to the model constructor.
+
+        Raises:
+            ValueError: If stratified sampling is requested for a regressor, or
+                along with `chunk_size`.
         """
+        if sampling == "stratified" and model_type != "classifier":
+            raise ValueError(
+                "Stratified sampling is only available for classifiers."
+            )
+        if sampling == "stratified" and chunk_size is not None:
+            raise ValueError(
+                "Stratified sampling requires the dataset in memory: unset chunk_size."
+            )
+
         self._model_type = model_type
         self._model: MODEL_TYPE = MODELS_MAP[model_type](*args, **kwargs)
         self._weights: np.ndarray
         self._bias: float
         self._workers_config = WorkersConfig()
         self._partially_fitted = False
-        self._X_train, self._y_train = load_fit_input(
-            f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
-            f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
-        )
+        self._gradient_engine: _GradientEngine | None = None
+        self._gradient_compressor: _GradientCompressor | None = None
+        self._compressor_settings: Tuple[Any, ...] = ()
+        self._sampler: _MiniBatchSampler | None = None
+        self._chunk_reader: _ChunkReader | None = None
+        self._data_sample: FitRequestDataSampleOutput | None = None
+        self._local_parameters: Tuple[np.ndarray, np.ndarray] | None = None
+        self._batch_size = batch_size
+        self._chunk_leftover: Tuple[np.ndarray, np.ndarray] | None = None
+        self._n_steps = 0
+        self._checkpointer: Checkpointer | None = None
+        if self._workers_config.CHIMERA_WORKERS_CHECKPOINTS:
+            self._checkpointer = Checkpointer(CHIMERA_CHECKPOINTS_FOLDER)
+            self._restore_checkpoint()
+
+        if chunk_size is not None:
+            self._chunk_reader = _ChunkReader(
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
+                chunk_size,
+            )
+        else:
+            X_train, y_train = load_fit_input(
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
+            )
+            self._data_sample = sample_fit_input(X_train, y_train, model_type)
+            self._sampler = _MiniBatchSampler(
+                X_train.to_numpy(dtype=np.float64),
+                y_train.iloc[:, 0].to_numpy(),
+                batch_size,
+                sampling,
+            )
 
     def serve(self) -> None:
         """
@@ -70,6 +145,8 @@ class SGDWorker:
         """
         app = FastAPI()
         app.include_router(self._fit_router())
+        app.include_router(self._checkpoint_router())
+        app.include_router(health_router())
         status_logger.info(f"Serving {self.__class__.__name__}...")
         uvicorn.run(
             app,
@@ -92,64 +169,398 @@ class SGDWorker:
             Returns a sample of the training data.
             """
             try:
-                return build_json_response(
-                    load_fit_samples(
-                        f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
-                        f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
-                        self._model_type,
-                    )
-                )
+                return build_json_response(self._load_data_sample())
             except Exception as e:
                 status_logger.error(f"Error at {self.__class__.__name__}: {e}")
                 return build_error_response(e)
 
         @router.post(CHIMERA_SGD_WORKER_FIT_STEP_PATH)
-        def fit_step(fit_step_input: FitStepInput) -> JSONResponse:
+        async def fit_step(request: Request) -> Response:
             """
             Performs a single step of the SGD fitting process.
+
+            The weights may come either as JSON or in the binary tensor format, and
+            the gradients are returned in the binary tensor format whenever the
+            master accepts it.
             """
             try:
-                if not self._partially_fitted:
-                    samples = load_fit_samples(
-                        f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
-                        f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
-                        self._model_type,
-                    )
-                    y_train_samples = np.array(samples.y_train_sample_rows).ravel()
-
-                    kwargs = {}
-                    if self._model_type == "classifier":
-                        kwargs = {"classes": np.unique(y_train_samples)}
-
-                    self._model.partial_fit(
-                        pd.DataFrame(
-                            samples.X_train_sample_rows,
-                            columns=samples.X_train_sample_columns,
-                        ),
-                        y_train_samples,
-                        **kwargs,
+                fit_step_input = await read_tensor_request(request, FitStepInput)
+                fit_step_output = await run_in_threadpool(
+                    self._fit_step, fit_step_input
+                )
+                self._n_steps += 1
+                if (
+                    self._checkpointer is not None
+                    and self._n_steps
+                    % self._workers_config.CHIMERA_WORKERS_CHECKPOINT_INTERVAL
+                    == 0
+                ):
+                    await run_in_threadpool(
+                        self._save_checkpoint, self._checkpointer
                     )
-                    self._partially_fitted = True
-                else:
-                    self._model.coef_ = np.array(fit_step_input.weights)
-                    self._model.intercept_ = np.array(fit_step_input.bias)
+                return build_tensor_response(
+                    fit_step_output, accepts_tensors(request)
+                )
+            except Exception as e:
+                status_logger.error(f"Error at {self.__class__.__name__}: {e}")
+                return build_error_response(e)
 
-                weights: np.ndarray = deepcopy(self._model.coef_)
-                bias: np.ndarray = deepcopy(self._model.intercept_)
+        return router
 
-                self._model.partial_fit(self._X_train, self._y_train)
+    def _checkpoint_router(self) -> APIRouter:
+        """
+        Creates and returns the FastAPI router for the /checkpoint endpoint.
 
-                weights_gradients: np.ndarray = weights - self._model.coef_
-                bias_gradient: np.ndarray = bias - self._model.intercept_
+        Returns:
+            The FastAPI router for checkpointing the worker on demand.
+        """
+        router = APIRouter()
 
-                return build_json_response(
-                    FitStepOutput(
-                        weights_gradients=list(weights_gradients.flatten()),
-                        bias_gradient=list(bias_gradient),
+        @router.post(CHIMERA_SGD_WORKER_CHECKPOINT_PATH)
+        def checkpoint() -> JSONResponse:
+            """
+            Saves a checkpoint of the model and of the gradient compressor.
+            """
+            try:
+                if self._checkpointer is None:
+                    raise ValueError(
+                        "Checkpoints are disabled. Enable them with CHIMERA_WORKERS_CHECKPOINTS."
                     )
-                )
+                self._save_checkpoint(self._checkpointer)
+                return build_json_response(CheckpointOutput(step=self._n_steps))
             except Exception as e:
                 status_logger.error(f"Error at {self.__class__.__name__}: {e}")
                 return build_error_response(e)
 
         return router
+
+    def _save_checkpoint(self, checkpointer: Checkpointer) -> None:
+        """
+        Saves the model, the number of fit steps done, the gradient compressor's
+        settings and error feedback residual and the elastic averaging local
+        parameters, at the current step.
+        """
+        arrays = {}
+        if (
+            self._gradient_compressor is not None
+            and self._gradient_compressor.residual is not None
+        ):
+            arrays["residual"] = self._gradient_compressor.residual
+        if self._local_parameters is not None:
+            arrays["local_weights"], arrays["local_bias"] = self._local_parameters
+        checkpointer.save(
+            self._n_steps,
+            arrays=arrays,
+            model=self._model,
+            metadata={
+                "partially_fitted": self._partially_fitted,
+                "compressor_settings": list(self._compressor_settings),
+            },
+        )
+        status_logger.info(
+            f"Saved checkpoint {self._n_steps} at {self.__class__.__name__}"
+        )
+
+    def _restore_checkpoint(self) -> None:
+        """Restores the state of the latest checkpoint, if any."""
+        assert self._checkpointer is not None
+        checkpoint = self._checkpointer.load()
+        if checkpoint is None:
+            return
+
+        self._n_steps = checkpoint.step
+        if checkpoint.model is not None:
+            self._model = checkpoint.model
+        self._partially_fitted = checkpoint.metadata["partially_fitted"]
+        settings = tuple(checkpoint.metadata["compressor_settings"])
+        if settings:
+            self._gradient_compressor = _GradientCompressor(*settings)
+            self._gradient_compressor.residual = checkpoint.arrays.get("residual")
+            self._compressor_settings = settings
+        if "local_weights" in checkpoint.arrays:
+            self._local_parameters = (
+                checkpoint.arrays["local_weights"],
+                checkpoint.arrays["local_bias"],
+            )
+        status_logger.info(
+            f"Restored checkpoint {checkpoint.step} at {self.__class__.__name__}"
+        )
+
+    def _fit_step(self, fit_step_input: FitStepInput) -> FitStepOutput:
+        """
+        Computes the gradients of a single SGD step over a local mini-batch.
+
+        Args:
+            fit_step_input: The current weights and bias of the master's model.
+
+        Returns:
+            The weights and bias gradients: either raw loss gradients or, by
+            default, the updates made by the model's `partial_fit`.
+
+        Raises:
+            ValueError: If local steps or elastic averaging are requested along
+                with raw gradients.
+        """
+        local = fit_step_input.local_steps > 1 or fit_step_input.elastic_alpha
+        if fit_step_input.raw_gradients and local:
+            raise ValueError(
+                "Local steps and elastic averaging use partial_fit updates, not raw gradients."
+            )
+
+        if not self._partially_fitted:
+            samples = self._load_data_sample()
+            y_train_samples = np.array(samples.y_train_sample_rows).ravel()
+
+            kwargs = {}
+            if self._model_type == "classifier":
+                kwargs = {"classes": np.unique(y_train_samples)}
+
+            self._model.partial_fit(
+                np.array(samples.X_train_sample_rows, dtype=np.float64),
+                y_train_samples,
+                **kwargs,
+            )
+            self._partially_fitted = True
+        elif not fit_step_input.raw_gradients:
+            self._model.coef_ = np.array(fit_step_input.weights).reshape(
+                self._model.coef_.shape
+            )
+            self._model.intercept_ = np.array(fit_step_input.bias)
+
+        if fit_step_input.raw_gradients:
+            return self._raw_fit_step(fit_step_input)
+        if local:
+            return self._local_fit_step(fit_step_input)
+
+        weights: np.ndarray = deepcopy(self._model.coef_)
+        bias: np.ndarray = deepcopy(self._model.intercept_)
+        n_samples, loss_sum = self._partial_fit_batches()
+
+        weights_gradients: np.ndarray = weights - self._model.coef_
+        bias_gradient: np.ndarray = bias - self._model.intercept_
+
+        return self._build_fit_step_output(
+            fit_step_input, weights_gradients, bias_gradient, n_samples, loss_sum
+        )
+
+    def _partial_fit_batches(self) -> Tuple[int, float | None]:
+        """
+        Runs `partial_fit` over the batches of a fit step, summing the loss over
+        each batch before its step.
+
+        Returns:
+            The number of rows fitted and the sum of their loss, or None if the
+            gradient engine doesn't support the model's loss.
+        """
+        n_samples = 0
+        loss_sum: float | None = 0.0
+        for X_batch, y_batch in self._next_batches():
+            batch_loss_sum = self._loss_sum(
+                X_batch, y_batch, self._model.coef_, self._model.intercept_
+            )
+            if loss_sum is not None and batch_loss_sum is not None:
+                loss_sum += batch_loss_sum
+            else:
+                loss_sum = None
+            self._model.partial_fit(X_batch, y_batch)
+            n_samples += len(y_batch)
+        return n_samples, loss_sum
+
+    def _local_fit_step(self, fit_step_input: FitStepInput) -> FitStepOutput:
+        """
+        Runs `local_steps` `partial_fit` steps over consecutive batches and
+        returns the change of the parameters, so the master only averages them
+        once every `local_steps` steps.
+
+        With `elastic_alpha`, the steps start from the worker's own parameters
+        instead of the master's, and the worker returns their elastic difference
+        with the master's, `elastic_alpha * (master - local)`, moving its own
+        parameters towards the master's by the same amount (EASGD).
+        """
+        center_weights: np.ndarray = deepcopy(self._model.coef_)
+        center_bias: np.ndarray = deepcopy(self._model.intercept_)
+        if (
+            fit_step_input.elastic_alpha
+            and self._local_parameters is not None
+            and self._local_parameters[0].shape == center_weights.shape
+        ):
+            self._model.coef_ = self._local_parameters[0].copy()
+            self._model.intercept_ = self._local_parameters[1].copy()
+
+        n_samples = 0
+        loss_sum: float | None = 0.0
+        for _ in range(fit_step_input.local_steps):
+            step_n_samples, step_loss_sum = self._partial_fit_batches()
+            n_samples += step_n_samples
+            if loss_sum is not None and step_loss_sum is not None:
+                loss_sum += step_loss_sum
+            else:
+                loss_sum = None
+
+        weights_gradients: np.ndarray = center_weights - self._model.coef_
+        bias_gradient: np.ndarray = center_bias - self._model.intercept_
+        if fit_step_input.elastic_alpha:
+            weights_gradients *= fit_step_input.elastic_alpha
+            bias_gradient *= fit_step_input.elastic_alpha
+            self._local_parameters = (
+                self._model.coef_ + weights_gradients,
+                self._model.intercept_ + bias_gradient,
+            )
+
+        return self._build_fit_step_output(
+            fit_step_input, weights_gradients, bias_gradient, n_samples, loss_sum
+        )
+
+    def _load_data_sample(self) -> FitRequestDataSampleOutput:
+        """
+        Returns the sample of the local dataset with at least one row per class,
+        taken once and then cached.
+        """
+        if self._data_sample is None:
+            self._data_sample = load_fit_samples(
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_FEATURES_FILENAME}",
+                f"{CHIMERA_TRAIN_DATA_FOLDER}/{CHIMERA_TRAIN_LABELS_FILENAME}",
+                self._model_type,
+            )
+        return self._data_sample
+
+    def _next_batches(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yields the batches of a fit step: a mini-batch drawn by the in-memory
+        sampler or, from the chunks, either the next `batch_size` rows or every
+        chunk of a full pass over the local dataset, the next one being read
+        while the current one is used.
+        """
+        if self._chunk_reader is None:
+            assert self._sampler is not None
+            yield self._sampler.run()
+        elif self._batch_size is None:
+            for X_chunk, y_chunk in self._chunk_reader:
+                yield X_chunk.to_numpy(dtype=np.float64), y_chunk.to_numpy().ravel()
+        else:
+            yield self._next_chunked_batch(self._batch_size)
+
+    def _next_chunked_batch(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Takes the next `batch_size` rows of the chunks, cycling over the local
+        dataset. The rows of the last chunk read that aren't used are kept for the
+        next batch.
+        """
+        assert self._chunk_reader is not None
+        X_parts, y_parts = [], []
+        n_rows = 0
+        while n_rows < batch_size:
+            if self._chunk_leftover is not None:
+                X_chunk, y_chunk = self._chunk_leftover
+                self._chunk_leftover = None
+            else:
+                X_frame, y_frame = self._chunk_reader.run()
+                X_chunk = X_frame.to_numpy(dtype=np.float64)
+                y_chunk = y_frame.to_numpy().ravel()
+
+            n_taken = min(batch_size - n_rows, len(y_chunk))
+            X_parts.append(X_chunk[:n_taken])
+            y_parts.append(y_chunk[:n_taken])
+            if n_taken < len(y_chunk):
+                self._chunk_leftover = X_chunk[n_taken:], y_chunk[n_taken:]
+            n_rows += n_taken
+        return np.concatenate(X_parts), np.concatenate(y_parts)
+
+    def _raw_fit_step(self, fit_step_input: FitStepInput) -> FitStepOutput:
+        """
+        Computes the raw loss gradients at the master's weights with the NumPy
+        gradient engine, bypassing `partial_fit`. Over several batches, such as a
+        full pass over the chunks, the gradients are averaged weighted by the
+        number of rows of each batch.
+        """
+        gradient_engine = self._load_gradient_engine()
+        weights = np.asarray(fit_step_input.weights).reshape(self._model.coef_.shape)
+        bias = np.asarray(fit_step_input.bias)
+
+        weights_gradients = np.zeros(self._model.coef_.shape)
+        bias_gradient = np.zeros(np.shape(self._model.intercept_))
+        n_samples, loss_sum = 0, 0.0
+        for X_batch, y_batch in self._next_batches():
+            batch_weights_gradients, batch_bias_gradient, batch_loss_sum = (
+                gradient_engine.run(X_batch, y_batch, weights, bias)
+            )
+            weights_gradients += len(y_batch) * batch_weights_gradients
+            bias_gradient += len(y_batch) * batch_bias_gradient
+            n_samples += len(y_batch)
+            loss_sum += batch_loss_sum
+
+        return self._build_fit_step_output(
+            fit_step_input,
+            weights_gradients / n_samples,
+            bias_gradient / n_samples,
+            n_samples,
+            loss_sum,
+        )
+
+    def _load_gradient_engine(self) -> _GradientEngine:
+        """
+        Returns the NumPy gradient engine of the model's loss, created once.
+
+        Raises:
+            ValueError: If the gradient engine doesn't support the model's loss.
+        """
+        if self._gradient_engine is None:
+            self._gradient_engine = _GradientEngine.from_params(
+                self._model.get_params(), getattr(self._model, "classes_", None)
+            )
+        return self._gradient_engine
+
+    def _loss_sum(
+        self,
+        X_batch: np.ndarray,
+        y_batch: np.ndarray,
+        weights: np.ndarray,
+        bias: np.ndarray,
+    ) -> float | None:
+        """
+        Computes the sum of the loss over a batch before a `partial_fit` step,
+        or None if the gradient engine doesn't support the model's loss.
+        """
+        try:
+            gradient_engine = self._load_gradient_engine()
+        except ValueError:
+            return None
+        return gradient_engine.loss_sum(X_batch, y_batch, weights, bias)
+
+    def _build_fit_step_output(
+        self,
+        fit_step_input: FitStepInput,
+        weights_gradients: np.ndarray,
+        bias_gradient: np.ndarray,
+        n_samples: int,
+        loss_sum: float | None,
+    ) -> FitStepOutput:
+        """
+        Builds the output of a fit step, compressing the weights gradients with
+        the settings sent by the master. The compressor, and its error feedback
+        residual, is kept across steps while the settings don't change. The
+        number of rows of the batch and the sum of their loss are sent along, so
+        the master can weight the gradients and compute the global loss.
+        """
+        settings = _GradientCompressor.settings(fit_step_input)
+        if (
+            self._gradient_compressor is None
+            or self._compressor_settings != settings
+        ):
+            self._gradient_compressor = _GradientCompressor(*settings)
+            self._compressor_settings = settings
+
+        if not self._gradient_compressor.enabled:
+            return FitStepOutput.model_construct(
+                weights_gradients=weights_gradients.flatten(),
+                bias_gradient=bias_gradient.flatten(),
+                n_samples=n_samples,
+                loss_sum=loss_sum,
+            )
+
+        return FitStepOutput.model_construct(
+            bias_gradient=bias_gradient.flatten(),
+            n_samples=n_samples,
+            loss_sum=loss_sum,
+            **self._gradient_compressor.run(weights_gradients.flatten()),
+        )
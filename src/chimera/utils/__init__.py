@@ -1,3 +1,5 @@
 from .logger import status_logger as status_logger
 from .logger import time_logger as time_logger
 from .parse import parse_times_file as parse_times_file
+from .checkpoints import Checkpoint as Checkpoint
+from .checkpoints import Checkpointer as Checkpointer
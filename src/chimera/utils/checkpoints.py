@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+import joblib
+import numpy as np
+
+_MODEL_FILENAME = "model.joblib"
+_METADATA_FILENAME = "metadata.json"
+
+
+class Checkpoint(NamedTuple):
+    """State saved by a Checkpointer."""
+
+    step: int
+    """Step of the training at which the state was saved."""
+    arrays: Dict[str, np.ndarray]
+    """Arrays of the state, such as model parameters or optimizer state."""
+    model: Any | None
+    """Scikit-learn model of the state, if any."""
+    metadata: Dict[str, Any]
+    """JSON-serializable values of the state."""
+
+
+class Checkpointer:
+    """
+    Saves checkpoints of a node's fitted state to a folder, typically a mounted
+    volume, and loads the latest one back after a restart.
+
+    Each checkpoint is a subfolder named after its step, holding its arrays as raw
+    `.npy` files, its scikit-learn model with joblib and its metadata as JSON. It's
+    written to a temporary folder first and then renamed, so a crash while saving
+    never leaves a partial checkpoint behind. Only the `keep` latest checkpoints
+    are kept.
+    """
+
+    def __init__(self, folder: str, keep: int = 2) -> None:
+        """
+        Initializes the Checkpointer.
+
+        Args:
+            folder: The folder the checkpoints are saved to. It's created if it
+                doesn't exist.
+            keep: The number of latest checkpoints kept (default: 2).
+
+        Raises:
+            ValueError: If `keep` is lower than 1.
+        """
+        if keep < 1:
+            raise ValueError("At least 1 checkpoint must be kept.")
+        self._folder = Path(folder)
+        self._keep = keep
+        self._folder.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def save(
+        self,
+        step: int,
+        arrays: Dict[str, np.ndarray] | None = None,
+        model: Any | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Saves a checkpoint, replacing any checkpoint of the same step.
+
+        Args:
+            step: The step of the training at which the state is saved.
+            arrays: The arrays of the state (default: None).
+            model: The scikit-learn model of the state (default: None).
+            metadata: The JSON-serializable values of the state (default: None).
+        """
+        with self._lock:
+            # A restarted container may reuse the PID of a crashed save
+            tmp_path = self._folder / f".{step}.{os.getpid()}.tmp"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            tmp_path.mkdir()
+            for name, array in (arrays or {}).items():
+                np.save(
+                    tmp_path / f"{name}.npy", np.asarray(array), allow_pickle=False
+                )
+            if model is not None:
+                joblib.dump(model, tmp_path / _MODEL_FILENAME)
+            with open(tmp_path / _METADATA_FILENAME, "w") as file:
+                json.dump(metadata or {}, file)
+
+            path = self._folder / self._name(step)
+            if path.exists():
+                shutil.rmtree(path)
+            os.replace(tmp_path, path)
+
+            for stale_step in self._steps()[: -self._keep]:
+                shutil.rmtree(
+                    self._folder / self._name(stale_step), ignore_errors=True
+                )
+
+    def load(self) -> Checkpoint | None:
+        """
+        Loads the latest checkpoint.
+
+        Returns:
+            The latest checkpoint, or None if there isn't any.
+        """
+        steps = self._steps()
+        if not steps:
+            return None
+
+        path = self._folder / self._name(steps[-1])
+        arrays = {
+            array_path.stem: np.load(array_path, allow_pickle=False)
+            for array_path in path.glob("*.npy")
+        }
+        model = None
+        if (path / _MODEL_FILENAME).exists():
+            model = joblib.load(path / _MODEL_FILENAME)
+        with open(path / _METADATA_FILENAME) as file:
+            metadata = json.load(file)
+        return Checkpoint(steps[-1], arrays, model, metadata)
+
+    def latest_step(self) -> int | None:
+        """Returns the step of the latest checkpoint, or None if there isn't any."""
+        steps = self._steps()
+        return steps[-1] if steps else None
+
+    def _steps(self) -> List[int]:
+        """Returns the steps of the saved checkpoints, in increasing order."""
+        return sorted(
+            int(path.name)
+            for path in self._folder.iterdir()
+            if path.is_dir() and path.name.isdigit()
+        )
+
+    @staticmethod
+    def _name(step: int) -> str:
+        """Returns the name of a checkpoint's folder."""
+        return f"{step:012d}"
@@ -9,6 +9,8 @@ def parse_times_file(filepath: str) -> Dict:
         for line in f:
             line_split = line.split("=")
             name = line_split[0].strip()
+            if not name.endswith("latency"):
+                continue
             time = float(line_split[1].strip().removesuffix(" s"))
             endpoint = name.split(" ")[0]
             if "worker" in name: